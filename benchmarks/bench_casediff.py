@@ -0,0 +1,69 @@
+"""Compare the case-only diff with :mod:`difflib` on generated text.
+
+``python benchmarks/bench_casediff.py --size-kb 4096`` times the linear diff
+used by ``--diff`` over the whole input, and the difflib equivalent (a line
+diff, then a character-level ``SequenceMatcher`` per changed line pair to
+find the changed columns) over a slice of it (``--difflib-kb``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import difflib
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion.casediff import iter_line_changes  # noqa: E402
+from main import convert_text, stream_transformer  # noqa: E402
+
+SAMPLE = (
+    "The quick brown fox jumps over the lazy dog. Is it? I think so!\n"
+    "ANOTHER LINE THAT SHOUTS.\n"
+    "already sentence case here.\n"
+)
+
+
+def _text(size_kb: int) -> str:
+    return (SAMPLE * ((size_kb << 10) // len(SAMPLE) + 1))[: size_kb << 10]
+
+
+def _chunks(text: str, size: int = 1 << 20):
+    for start in range(0, len(text), size):
+        yield text[start : start + size]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=4096)
+    parser.add_argument("--difflib-kb", type=int, default=512)
+    parser.add_argument("--mode", default="sentence")
+    args = parser.parse_args(argv)
+
+    text = _text(args.size_kb)
+    started = time.perf_counter()
+    changes = sum(1 for _ in iter_line_changes(_chunks(text), stream_transformer(args.mode)))
+    elapsed = time.perf_counter() - started
+    print(f"case diff: {args.size_kb} KiB, {changes} changed lines in {elapsed:.3f}s")
+
+    sample = _text(args.difflib_kb)
+    converted = convert_text(sample, args.mode)
+    started = time.perf_counter()
+    before, after = sample.splitlines(), converted.splitlines()
+    spans = 0
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, before, after).get_opcodes():
+        if tag == "replace":
+            for old, new in zip(before[i1:i2], after[j1:j2]):
+                opcodes = difflib.SequenceMatcher(None, old, new).get_opcodes()
+                spans += sum(1 for op, *_ in opcodes if op != "equal")
+    elapsed = time.perf_counter() - started
+    print(f"difflib:   {args.difflib_kb} KiB, {spans} changed spans in {elapsed:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""Per-word cost of the user casing dictionary.
+
+``python benchmarks/bench_dictionary.py --entries 100000`` builds a dictionary
+of that many preserved spellings (plus a few stop words), then reports how
+long it takes to compile, what an unchanged-file check costs, and how much
+applying it adds per word to title and sentence conversion of generated prose.
+The per-word cost should not grow with the number of entries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import string
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import sentence_case, title_case  # noqa: E402
+from conversion.dictionary import DictionaryFile, parse_dictionary  # noqa: E402
+
+SAMPLE = "the crew of nasa tested the new iphone and the github app on the road to mars. "
+
+
+def _lines(entries: int) -> list[str]:
+    rng = random.Random(entries)
+    words = {"".join(rng.choices(string.ascii_letters, k=rng.randint(3, 12))) for _ in range(entries)}
+    return ["[preserve]", "NASA", "iPhone", "GitHub", *sorted(words), "[stopwords]", "of", "and", "the", "to"]
+
+
+def _best(work, repeat: int = 3) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000)
+    parser.add_argument("--size-kb", type=int, default=4096)
+    args = parser.parse_args(argv)
+
+    lines = _lines(args.entries)
+    elapsed = _best(lambda: parse_dictionary(lines))
+    dictionary = parse_dictionary(lines)
+    print(f"compile {len(dictionary.title_lookup)} entries: {elapsed * 1e3:.1f} ms")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "dictionary.txt"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        watched = DictionaryFile(path)
+        watched.current()
+        elapsed = _best(lambda: [watched.current() for _ in range(10_000)])
+        print(f"unchanged-file check: {elapsed / 10_000 * 1e6:.2f} us")
+
+    text = (SAMPLE * ((args.size_kb << 10) // len(SAMPLE) + 1))[: args.size_kb << 10]
+    words = len(text.split())
+    for mode, transform, title in [("title", title_case, True), ("sentence", sentence_case, False)]:
+        converted = transform(text)
+        baseline = _best(lambda: transform(text))
+        elapsed = _best(lambda: dictionary.apply(converted, title=title))
+        print(
+            f"{mode:>8}: {baseline / words * 1e9:6.1f} ns/word conversion, "
+            f"+{elapsed / words * 1e9:6.1f} ns/word dictionary ({elapsed / baseline:.0%})"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,43 @@
+"""Measure history refresh cost as clipboard entries grow.
+
+Run with ``python benchmarks/bench_history_labels.py``. A refresh re-reads the
+label of every entry, so its cost should stay flat regardless of entry size.
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ui.history import ClipboardHistory  # noqa: E402
+from ui.main_frame import DEFAULT_HISTORY_LIMIT  # noqa: E402
+
+REPEATS = 200
+
+
+def _bench(entry_size: int) -> float:
+    history = ClipboardHistory(DEFAULT_HISTORY_LIMIT)
+    line = "The quick brown fox jumps over the lazy dog.\n"
+    body = line * (entry_size // len(line) + 1)
+    for index in range(DEFAULT_HISTORY_LIMIT):
+        history.record(f"{index} {body[:entry_size]}")
+
+    def refresh() -> None:
+        ["Current selection"] + history.labels
+
+    refresh()  # first refresh pays for the one-off label computation
+    return timeit.timeit(refresh, number=REPEATS) / REPEATS
+
+
+def main() -> int:
+    print(f"{'entry size':>12}  {'refresh (µs)':>12}")
+    for size in (1_000, 100_000, 1_000_000, 8_000_000):
+        print(f"{size:>12,}  {_bench(size) * 1e6:>12.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
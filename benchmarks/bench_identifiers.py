@@ -0,0 +1,53 @@
+"""Time the programmer case modes on a file of identifiers.
+
+``python benchmarks/bench_identifiers.py --count 100000`` generates that many
+identifiers in mixed styles, one per line, and converts the whole text to
+every identifier mode. Each mode should take well under a second.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion.identifiers import IDENTIFIER_MODES, identifier_case  # noqa: E402
+
+WORDS = ["user", "name", "id", "http", "request", "parse", "xml", "count", "v2", "total"]
+STYLES = IDENTIFIER_MODES
+
+
+def _identifiers(count: int) -> str:
+    rng = random.Random(count)
+    names = []
+    for _ in range(count):
+        words = rng.sample(WORDS, rng.randint(1, 4))
+        names.append(identifier_case("_".join(words), rng.choice(STYLES)))
+    return "\n".join(names) + "\n"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    text = _identifiers(args.count)
+    print(f"{args.count} identifiers, {len(text) / 1e6:.1f} MB")
+    for mode in IDENTIFIER_MODES:
+        elapsed = float("inf")
+        for _ in range(3):
+            started = time.perf_counter()
+            identifier_case(text, mode)
+            elapsed = min(elapsed, time.perf_counter() - started)
+        print(f"{mode:>9}: {elapsed:.3f}s ({elapsed / args.count * 1e6:.2f} us/identifier)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
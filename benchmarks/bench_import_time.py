@@ -0,0 +1,73 @@
+"""Report import cost of the CLI entry points using ``-X importtime``.
+
+Run with ``python benchmarks/bench_import_time.py``. Pass ``--max-ms N`` to exit
+non-zero when importing ``main`` takes longer than *N* milliseconds, which is
+handy as a guard in CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+HEAVY_MODULES = ("pyautogui", "pyperclip", "kivy", "pystray", "PIL")
+
+
+def _measure(statement: str) -> tuple[int, dict[str, int]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    total = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        fields = line[len("import time:") :].split("|")
+        try:
+            value = int(fields[1])
+        except ValueError:  # header line
+            continue
+        raw_name = fields[2][1:]  # one separator space, then two per nesting level
+        cumulative[raw_name.strip()] = value
+        if not raw_name.startswith(" "):
+            total += value
+    return total, cumulative
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-ms", type=float, default=None)
+    args = parser.parse_args(argv)
+
+    status = 0
+    for statement in ("import main", "import window"):
+        totals = []
+        heavy: set[str] = set()
+        for _ in range(args.runs):
+            try:
+                total, modules = _measure(statement)
+            except subprocess.CalledProcessError:
+                print(f"{statement!r}: failed (missing GUI dependencies?)")
+                break
+            totals.append(total)
+            heavy |= {name for name in modules if name in HEAVY_MODULES}
+        if not totals:
+            continue
+        median_ms = statistics.median(totals) / 1000
+        print(f"{statement!r}: median {median_ms:.1f} ms; heavy imports: {sorted(heavy) or 'none'}")
+        if statement == "import main" and args.max_ms is not None and median_ms > args.max_ms:
+            status = 1
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,71 @@
+"""Cost of locale-aware casing against the plain ``str`` methods.
+
+``python benchmarks/bench_locale.py --size-kb 8192`` times ``upper``,
+``lower``, ``title`` and ``sentence`` on plain ASCII prose and on mixed
+Turkish/Greek/German text, once with ``str`` casing and once per locale, and
+the NFC pass on already-normalised text. On ASCII input the locales whose
+tables have no ASCII keys (``el``, ``de``) should match ``str`` within noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import sentence_case  # noqa: E402
+from conversion.locales import ROOT_CASING, get_casing  # noqa: E402
+
+ASCII_SAMPLE = "the quick brown fox jumps over the lazy dog. is it? i think so!\n"
+MIXED_SAMPLE = "istanbul ılık bir gün. μάιος και ήλιος στην οδό. große straße! ijsland.\n"
+
+
+def _text(sample: str, size_kb: int) -> str:
+    return (sample * ((size_kb << 10) // len(sample) + 1))[: size_kb << 10]
+
+
+def _time(label: str, size: int, work, repeat: int = 3) -> float:
+    elapsed = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        work()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    print(f"{label:>22}: {size / elapsed / 1e6:8.1f} MB/s ({elapsed:.3f}s)")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=8192)
+    args = parser.parse_args(argv)
+
+    for name, sample in [("ascii", ASCII_SAMPLE), ("mixed", MIXED_SAMPLE)]:
+        text = _text(sample, args.size_kb)
+        size = len(text.encode("utf-8"))
+        print(f"-- {name} text, {size / 1e6:.1f} MB")
+        for mode in ["upper", "lower", "title"]:
+            baseline = _time(f"str.{mode}", size, lambda: getattr(text, mode)())
+            for locale in ["root", "tr", "el", "de", "nl"]:
+                casing = ROOT_CASING if locale == "root" else get_casing(locale)
+                method = getattr(casing, mode)
+                elapsed = _time(f"{mode}@{locale}", size, lambda: method(text))
+                print(f"{'':>22}  {elapsed / baseline:.2f}x str.{mode}")
+        baseline = _time("sentence", size, lambda: sentence_case(text), repeat=1)
+        for locale in ["tr", "el"]:
+            casing = get_casing(locale)
+            elapsed = _time(
+                f"sentence@{locale}", size, lambda: sentence_case(text, casing=casing), repeat=1
+            )
+            print(f"{'':>22}  {elapsed / baseline:.2f}x sentence")
+        nfc = get_casing(None, "NFC")
+        _time("NFC check", size, lambda: nfc.normalized(text))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
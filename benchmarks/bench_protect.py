@@ -0,0 +1,70 @@
+"""Measure what protected spans cost on top of a plain conversion.
+
+``python benchmarks/bench_protect.py --size-mb 8`` converts prose without any
+span (only substring checks should be added), prose with a URL, an e-mail
+address, a path or inline code every few lines, and the same texts streamed
+through :class:`ProtectingTransformer` in 64 KB chunks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import iter_convert  # noqa: E402
+from main import convert_text, stream_transformer  # noqa: E402
+
+PLAIN = "The quick brown fox jumps over the lazy dog. Is it not so? yes it is!\n"
+SPANS = (
+    "Read https://example.com/Docs?id=4 first, then mail ops@example.org.\n"
+    "The config lives in ~/work/App_Config.yaml; run `make Build` to rebuild.\n"
+)
+
+
+def _best(callback) -> float:
+    elapsed = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        callback()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def _stream(text: str, mode: str, protect: bool) -> str:
+    chunks = (text[start:start + 65536] for start in range(0, len(text), 65536))
+    return "".join(iter_convert(chunks, stream_transformer(mode, protect=protect)))
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=8.0)
+    parser.add_argument("--mode", default="sentence")
+    args = parser.parse_args(argv)
+
+    size = int(args.size_mb * 1_000_000)
+    texts = {
+        "no spans": PLAIN * (size // len(PLAIN)),
+        "with spans": (PLAIN * 3 + SPANS) * (size // (3 * len(PLAIN) + len(SPANS))),
+    }
+    for label, text in texts.items():
+        for name, run in (
+            ("whole", lambda protect: convert_text(text, args.mode, protect=protect)),
+            ("stream", lambda protect: _stream(text, args.mode, protect)),
+        ):
+            plain = _best(lambda: run(False))
+            protected = _best(lambda: run(True))
+            print(
+                f"{label:>10} {name:>6}: {plain:.3f}s plain, {protected:.3f}s protected "
+                f"({protected / plain:.2f}x, {len(text) / protected / 1e6:.1f} MB/s)"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,77 @@
+"""Measure what installed transform plugins cost at startup.
+
+``python benchmarks/bench_registry.py --plugins 50`` installs that many fake
+plugin distributions into a temporary directory (each module sleeps a little
+on import, like a plugin with heavy dependencies) and times, in fresh
+interpreters:
+
+- ``import main``, which must not read plugin metadata at all;
+- listing every mode, which reads the entry points but imports no plugin;
+- the first conversion with one plugin mode, which imports that plugin only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PLUGIN = "import time\ntime.sleep({delay})\n\ndef convert(text):\n    return text[::-1]\n"
+PROBE = """
+import sys, time
+sys.path[:0] = [{plugins!r}, {root!r}]
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+modes = list(main.TRANSFORMS)
+listed = time.perf_counter()
+main.convert_text("abc", "plugin0")
+converted = time.perf_counter()
+loaded = sum(name.startswith("cm_bench_plugin") for name in sys.modules)
+print(imported - started, listed - imported, converted - listed, len(modes), loaded)
+"""
+
+
+def _install(directory: Path, count: int, delay: float) -> None:
+    for index in range(count):
+        module = f"cm_bench_plugin{index}"
+        (directory / f"{module}.py").write_text(PLUGIN.format(delay=delay), encoding="utf-8")
+        dist_info = directory / f"{module}-1.0.dist-info"
+        dist_info.mkdir()
+        (dist_info / "METADATA").write_text(f"Name: {module}\nVersion: 1.0\n", encoding="utf-8")
+        (dist_info / "entry_points.txt").write_text(
+            f"[casemonster.transforms]\nplugin{index} = {module}:convert\n", encoding="utf-8"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--plugins", type=int, default=50)
+    parser.add_argument("--import-delay", type=float, default=0.02, help="seconds per plugin import")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as directory:
+        _install(Path(directory), args.plugins, args.import_delay)
+        probe = PROBE.format(plugins=directory, root=str(ROOT))
+        runs = []
+        for _ in range(3):
+            completed = subprocess.run(
+                [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+            )
+            runs.append(completed.stdout.split())
+    best = [min(float(run[index]) for run in runs) for index in range(3)]
+    modes, loaded = runs[0][3], runs[0][4]
+    print(f"{args.plugins} plugins, {args.import_delay * 1000:.0f} ms import each")
+    print(f"{'import main:':<22}{best[0] * 1000:7.1f} ms")
+    print(f"{f'list {modes} modes:':<22}{best[1] * 1000:7.1f} ms (entry points read, nothing imported)")
+    print(f"{'first plugin convert:':<22}{best[2] * 1000:7.1f} ms ({loaded} plugin module(s) imported)")
+    print(f"importing every plugin eagerly would add ~{args.plugins * args.import_delay * 1000:.0f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,73 @@
+"""Check that rich-text conversion scales linearly with the document.
+
+``python benchmarks/bench_richtext.py --size-mb 4 --mode sentence`` converts
+HTML and RTF documents of a quarter, half and the full size, streamed in
+64 KiB chunks, and prints the throughput of each next to converting the
+same document's plain text; the rates should stay flat as the size grows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import iter_convert  # noqa: E402
+from conversion.richtext import HTML, RTF, RichTextTransformer  # noqa: E402
+from main import convert_text, stream_transformer  # noqa: E402
+
+BLOCKS = {
+    HTML: (
+        '<p class="body">the <b>quick</b> brown fox &amp; the <a href="https://example.com/?q=1">'
+        "lazy dog</a>. it jumps over <i>every</i> fence.</p>\n"
+    ),
+    RTF: r"{\pard\f0 the {\b quick} brown fox & the lazy dog. it jumps over {\i every} fence.\par}" "\n",
+}
+PLAIN = "the quick brown fox & the lazy dog. it jumps over every fence.\n"
+CHUNK = 1 << 16
+
+
+def _best(callback) -> float:
+    elapsed = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        callback()
+        elapsed = min(elapsed, time.perf_counter() - started)
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=float, default=4.0)
+    parser.add_argument("--mode", default="sentence")
+    args = parser.parse_args(argv)
+
+    for flavour, block in BLOCKS.items():
+        for fraction in (0.25, 0.5, 1.0):
+            count = max(1, int(args.size_mb * fraction * 1_000_000) // len(block))
+            document = block * count
+            chunks = [document[start:start + CHUNK] for start in range(0, len(document), CHUNK)]
+            plain = PLAIN * count
+
+            def rich() -> None:
+                inner = stream_transformer(args.mode, keep_trailing_newlines=True)
+                for _ in iter_convert(chunks, RichTextTransformer(inner, flavour)):
+                    pass
+
+            rich_seconds = _best(rich)
+            plain_seconds = _best(lambda: convert_text(plain, args.mode))
+            print(
+                f"{flavour:9} {len(document) / 1e6:5.2f} MB: {rich_seconds:.3f}s "
+                f"({len(document) / 1e6 / rich_seconds:5.2f} MB/s)  "
+                f"plain text {plain_seconds:.3f}s"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
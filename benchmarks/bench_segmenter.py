@@ -0,0 +1,60 @@
+"""Cost of abbreviation-aware sentence boundaries against ``str.split('.')``.
+
+``python benchmarks/bench_segmenter.py --size-kb 8192`` times three passes
+over generated prose: splitting on ``"."`` (what sentence mode used to do),
+finding boundaries with :func:`conversion.segmenter.sentence_boundaries`, and
+the full sentence-case conversion built on it, both before and after the
+text is upper-cased (the ``sentence`` mode upper-cases first).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import sentence_case  # noqa: E402
+from conversion.segmenter import sentence_boundaries  # noqa: E402
+
+SAMPLE = (
+    "the quick brown fox jumps over the lazy dog. is it? i think so! "
+    "dr. smith, e.g. the one from room no. 5, paid 3.14 for v1.2.3 at example.com... "
+    "\"really?\" she asked. (yes.) 日本語の文。次の文！\n"
+)
+
+
+def _text(size_kb: int) -> str:
+    return (SAMPLE * ((size_kb << 10) // len(SAMPLE) + 1))[: size_kb << 10]
+
+
+def _time(label: str, size: int, work) -> float:
+    started = time.perf_counter()
+    result = work()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>22}: {size / elapsed / 1e6:8.1f} MB/s ({elapsed:.3f}s, {result})")
+    return elapsed
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-kb", type=int, default=8192)
+    args = parser.parse_args(argv)
+
+    text = _text(args.size_kb)
+    upper = text.upper()
+    size = len(text.encode("utf-8"))
+    baseline = _time("str.split('.')", size, lambda: len(text.split(".")))
+    segmented = _time("sentence_boundaries", size, lambda: sum(1 for _ in sentence_boundaries(text)))
+    _time("sentence_boundaries/UC", size, lambda: sum(1 for _ in sentence_boundaries(upper)))
+    _time("sentence_case", size, lambda: len(sentence_case(text)))
+    print(f"boundaries cost {segmented / baseline:.1f}x str.split('.')")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""Throughput of the stdin filter when piping large inputs through ``cat``.
+
+Run with ``python benchmarks/bench_stream.py --size-mb 1024`` to push a
+gigabyte through ``cat input | python main.py --convert MODE --stdin``. The
+input file is generated once in a temporary directory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SAMPLE = (
+    "the quick brown fox jumps over the lazy dog. is it? i think so! "
+    "e-mail me at noon.\r\nanother line with i and I'm here.\n"
+)
+
+
+def _write_input(path: Path, size_mb: int) -> int:
+    block = (SAMPLE * ((1 << 20) // len(SAMPLE) + 1)).encode("utf-8")[: 1 << 20]
+    with path.open("wb") as handle:
+        for _ in range(size_mb):
+            handle.write(block)
+    return size_mb << 20
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--modes", default="upper,lower,title,sentence")
+    args = parser.parse_args(argv)
+
+    if shutil.which("cat") is None:
+        print("cat is not available on this system", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "input.txt"
+        size = _write_input(source, args.size_mb)
+        for mode in args.modes.split(","):
+            started = time.perf_counter()
+            cat = subprocess.Popen(["cat", str(source)], stdout=subprocess.PIPE)
+            convert = subprocess.run(
+                [sys.executable, str(ROOT / "main.py"), "--convert", mode, "--stdin"],
+                stdin=cat.stdout,
+                stdout=subprocess.DEVNULL,
+                check=True,
+            )
+            cat.stdout.close()
+            cat.wait()
+            elapsed = time.perf_counter() - started
+            print(f"{mode:>9}: {size / elapsed / 1e6:8.1f} MB/s ({elapsed:.2f}s, exit {convert.returncode})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
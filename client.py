@@ -0,0 +1,63 @@
+"""Thin command-line client for the resident conversion service.
+
+Accepts the same ``--convert``/``--target``/``--in-place`` options as
+``main.py``. When ``service.py`` is running the request is forwarded to it;
+otherwise the conversion runs in-process through :func:`main.main`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from service import send_request
+
+
+def _parse(argv: List[str]) -> Optional[argparse.Namespace]:
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--convert")
+    parser.add_argument("--target", action="append")
+    parser.add_argument("--in-place", action="store_true")
+    args, unknown = parser.parse_known_args(argv)
+    if unknown or not args.convert or not args.target:
+        return None
+    return args
+
+
+def main(argv: Optional[List[str]] = None, *, address: Optional[str] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    args = _parse(argv)
+    response = None
+    if args is not None:
+        # The service has its own working directory, so send absolute paths.
+        paths = [str(Path(path).resolve()) for path in args.target]
+        response = send_request(
+            {"mode": args.convert, "paths": paths, "in_place": args.in_place},
+            address=address,
+        )
+    if response is None:
+        # No service (or an option only main.py understands): convert here.
+        import main as cli
+
+        if args is not None and len(args.target) > 1:
+            status = 0
+            for target in args.target:
+                single = ["--convert", args.convert, "--target", target]
+                status |= cli.main(single + (["--in-place"] if args.in_place else []))
+            return status
+        return cli.main(argv)
+
+    for output in response.get("outputs") or []:
+        if output is not None:
+            sys.stdout.write(output)
+    for path, message in (response.get("errors") or {}).items():
+        print(f"caseMonster: {path}: {message}", file=sys.stderr)
+    if "error" in response:
+        print(f"caseMonster: {response['error']}", file=sys.stderr)
+    return 0 if response.get("ok") else 1
+
+
+if __name__ == "__main__":  # pragma: no cover - CLI entry point
+    raise SystemExit(main())
@@ -1,23 +1,218 @@
-"""Clipboard utility functions with graceful fallbacks."""
+"""Clipboard utility functions with graceful fallbacks.
+
+Backends are imported on first use so that importing this module stays cheap
+for command-line conversions that never touch the clipboard.
+
+Besides plain text, :func:`paste_flavours` and :func:`copy_flavours` read and
+write every flavour a rich-text backend offers: HTML and RTF through pywin32
+on Windows and through PyObjC's AppKit on macOS. Elsewhere, or without those
+packages, they fall back to plain text.
+"""
 
 from __future__ import annotations
 
-from typing import Optional
+import re
+import sys
+from typing import Any, Dict, Mapping, Optional
+
+PLAIN_TEXT = "text/plain"
+HTML = "text/html"
+RTF = "text/rtf"
 
 
 class ClipboardUnavailable(RuntimeError):
     """Raised when no clipboard backend is available."""
 
 
-try:  # pragma: no cover - import guard
-    import pyperclip as _pyperclip  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    _pyperclip = None  # type: ignore[assignment]
+_UNRESOLVED: Any = object()
+_pyperclip: Any = _UNRESOLVED
+_KivyClipboard: Any = _UNRESOLVED
+_rich_backend: Any = _UNRESOLVED
+_override: Any = None
+
+
+class FakeClipboard:
+    """An in-memory clipboard holding several flavours, for tests.
+
+    Install it with :func:`use_backend`; ``flavours`` maps MIME types such as
+    :data:`HTML` to their contents.
+    """
+
+    def __init__(self, flavours: Optional[Mapping[str, str]] = None) -> None:
+        self.flavours: Dict[str, str] = dict(flavours or {})
+
+    def copy(self, text: str) -> None:
+        self.flavours = {PLAIN_TEXT: text}
+
+    def paste(self) -> str:
+        return self.flavours.get(PLAIN_TEXT, "")
+
+    def read(self) -> Dict[str, str]:
+        return dict(self.flavours)
+
+    def write(self, flavours: Mapping[str, str]) -> None:
+        self.flavours = dict(flavours)
+
+
+def use_backend(backend: Any) -> None:
+    """Send every clipboard call to *backend*, or back to the real ones for ``None``.
+
+    *backend* needs ``copy`` and ``paste`` and, for rich text, ``read`` and
+    ``write`` (see :class:`FakeClipboard`).
+    """
+
+    global _override, _rich_backend
+    _override = backend
+    _rich_backend = _UNRESOLVED
+
+
+def _load_pyperclip() -> Any:
+    global _pyperclip
+    if _pyperclip is _UNRESOLVED:
+        try:  # pragma: no cover - import guard
+            import pyperclip as backend  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            backend = None
+        _pyperclip = backend
+    return _pyperclip
+
+
+def _load_kivy_clipboard() -> Any:
+    global _KivyClipboard
+    if _KivyClipboard is _UNRESOLVED:
+        try:  # pragma: no cover - import guard
+            from kivy.core.clipboard import Clipboard as backend  # type: ignore
+        except Exception:  # pragma: no cover - optional dependency
+            backend = None
+        _KivyClipboard = backend
+    return _KivyClipboard
+
+
+def _load_rich_backend() -> Any:
+    global _rich_backend
+    if _rich_backend is _UNRESOLVED:
+        backend = None
+        if _override is not None:
+            backend = _override if hasattr(_override, "read") else None
+        else:
+            try:  # pragma: no cover - platform specific backends
+                if sys.platform == "win32":
+                    backend = _WindowsClipboard()
+                elif sys.platform == "darwin":
+                    backend = _MacClipboard()
+            except Exception:  # pragma: no cover - optional dependency
+                backend = None
+        _rich_backend = backend
+    return _rich_backend
+
+
+_CF_HTML_HEADER = (
+    "Version:0.9\r\nStartHTML:{0:010d}\r\nEndHTML:{1:010d}\r\n"
+    "StartFragment:{2:010d}\r\nEndFragment:{3:010d}\r\n"
+)
+_CF_HTML_OFFSET = re.compile(rb"(StartHTML|StartFragment):(-?\d+)")
+_START_FRAGMENT = b"<!--StartFragment-->"
+_END_FRAGMENT = b"<!--EndFragment-->"
+
+
+def _cf_html_unwrap(data: bytes) -> str:
+    """The HTML document inside a Windows "HTML Format" payload."""
+
+    data = data.rstrip(b"\0")
+    offsets = {name: int(value) for name, value in _CF_HTML_OFFSET.findall(data[:512])}
+    start = offsets.get(b"StartHTML", -1)
+    if start < 0:
+        start = max(offsets.get(b"StartFragment", 0), 0)
+    return data[start:].decode("utf-8", "replace")
+
+
+def _cf_html_wrap(document: str) -> bytes:
+    """*document* with the header Windows expects of "HTML Format" data."""
+
+    body = document.encode("utf-8")
+    if _START_FRAGMENT not in body or _END_FRAGMENT not in body:
+        body = b"<html><body>" + _START_FRAGMENT + body + _END_FRAGMENT + b"</body></html>"
+    offset = len(_CF_HTML_HEADER.format(0, 0, 0, 0))
+    header = _CF_HTML_HEADER.format(
+        offset,
+        offset + len(body),
+        offset + body.index(_START_FRAGMENT) + len(_START_FRAGMENT),
+        offset + body.rindex(_END_FRAGMENT),
+    )
+    return header.encode("ascii") + body
+
+
+class _WindowsClipboard:  # pragma: no cover - Windows only
+    """HTML, RTF and Unicode text through pywin32's ``win32clipboard``."""
+
+    def __init__(self) -> None:
+        import win32clipboard  # type: ignore
+
+        self._api = win32clipboard
+        self._formats = {
+            HTML: win32clipboard.RegisterClipboardFormat("HTML Format"),
+            RTF: win32clipboard.RegisterClipboardFormat("Rich Text Format"),
+        }
+
+    def read(self) -> Dict[str, str]:
+        api = self._api
+        flavours: Dict[str, str] = {}
+        api.OpenClipboard()
+        try:
+            if api.IsClipboardFormatAvailable(api.CF_UNICODETEXT):
+                flavours[PLAIN_TEXT] = api.GetClipboardData(api.CF_UNICODETEXT)
+            for flavour, clipboard_format in self._formats.items():
+                if api.IsClipboardFormatAvailable(clipboard_format):
+                    data = api.GetClipboardData(clipboard_format)
+                    if flavour == HTML:
+                        flavours[flavour] = _cf_html_unwrap(data)
+                    else:
+                        flavours[flavour] = data.rstrip(b"\0").decode("latin-1")
+        finally:
+            api.CloseClipboard()
+        return flavours
+
+    def write(self, flavours: Mapping[str, str]) -> None:
+        api = self._api
+        api.OpenClipboard()
+        try:
+            api.EmptyClipboard()
+            api.SetClipboardData(api.CF_UNICODETEXT, flavours.get(PLAIN_TEXT, ""))
+            if HTML in flavours:
+                api.SetClipboardData(self._formats[HTML], _cf_html_wrap(flavours[HTML]))
+            if RTF in flavours:
+                api.SetClipboardData(self._formats[RTF], flavours[RTF].encode("latin-1", "replace"))
+        finally:
+            api.CloseClipboard()
+
+
+class _MacClipboard:  # pragma: no cover - macOS only
+    """The general pasteboard through PyObjC's AppKit."""
+
+    _TYPES = {PLAIN_TEXT: "public.utf8-plain-text", HTML: "public.html", RTF: "public.rtf"}
+
+    def __init__(self) -> None:
+        from AppKit import NSPasteboard  # type: ignore
+        from Foundation import NSData  # type: ignore
+
+        self._board = NSPasteboard.generalPasteboard()
+        self._data = NSData
+
+    def read(self) -> Dict[str, str]:
+        flavours: Dict[str, str] = {}
+        for flavour, pasteboard_type in self._TYPES.items():
+            data = self._board.dataForType_(pasteboard_type)
+            if data is not None:
+                flavours[flavour] = bytes(data).decode("latin-1" if flavour == RTF else "utf-8", "replace")
+        return flavours
 
-try:  # pragma: no cover - import guard
-    from kivy.core.clipboard import Clipboard as _KivyClipboard  # type: ignore
-except Exception:  # pragma: no cover - optional dependency
-    _KivyClipboard = None  # type: ignore[assignment]
+    def write(self, flavours: Mapping[str, str]) -> None:
+        self._board.clearContents()
+        for flavour, text in flavours.items():
+            if flavour in self._TYPES:
+                encoded = text.encode("latin-1" if flavour == RTF else "utf-8", "replace")
+                data = self._data.dataWithBytes_length_(encoded, len(encoded))
+                self._board.setData_forType_(data, self._TYPES[flavour])
 
 
 def _normalize_text(text: Optional[str]) -> str:
@@ -29,12 +224,18 @@ def copy(text: Optional[str]) -> None:
 
     value = _normalize_text(text)
 
-    if _pyperclip is not None:
-        _pyperclip.copy(value)
+    if _override is not None:
+        _override.copy(value)
         return
 
-    if _KivyClipboard is not None:
-        _KivyClipboard.copy(value)
+    pyperclip = _load_pyperclip()
+    if pyperclip is not None:
+        pyperclip.copy(value)
+        return
+
+    kivy_clipboard = _load_kivy_clipboard()
+    if kivy_clipboard is not None:
+        kivy_clipboard.copy(value)
         return
 
     raise ClipboardUnavailable(
@@ -45,18 +246,23 @@ def copy(text: Optional[str]) -> None:
 def paste() -> str:
     """Return the current clipboard contents."""
 
-    if _pyperclip is not None:
+    if _override is not None:
+        return _normalize_text(_override.paste())
+
+    pyperclip = _load_pyperclip()
+    if pyperclip is not None:
         try:
-            value = _pyperclip.paste()
+            value = pyperclip.paste()
         except AttributeError:
             return ""
         except Exception as exc:  # pragma: no cover - defensive guard
             raise ClipboardUnavailable(str(exc)) from exc
         return _normalize_text(value)
 
-    if _KivyClipboard is not None:
+    kivy_clipboard = _load_kivy_clipboard()
+    if kivy_clipboard is not None:
         try:
-            value = _KivyClipboard.paste()
+            value = kivy_clipboard.paste()
         except Exception as exc:  # pragma: no cover - backend specific errors
             raise ClipboardUnavailable(str(exc)) from exc
         return _normalize_text(value)
@@ -66,10 +272,62 @@ def paste() -> str:
     )
 
 
+def paste_flavours() -> Dict[str, str]:
+    """Every flavour on the clipboard by MIME type; just plain text without rich-text support."""
+
+    backend = _load_rich_backend()
+    if backend is None:
+        return {PLAIN_TEXT: paste()}
+    try:
+        flavours = dict(backend.read())
+    except Exception as exc:  # pragma: no cover - backend specific errors
+        raise ClipboardUnavailable(str(exc)) from exc
+    flavours.setdefault(PLAIN_TEXT, "")
+    return flavours
+
+
+def copy_flavours(flavours: Mapping[str, str]) -> None:
+    """Replace the clipboard with *flavours*; only plain text without rich-text support."""
+
+    backend = _load_rich_backend()
+    if backend is None:
+        copy(flavours.get(PLAIN_TEXT, ""))
+        return
+    try:
+        backend.write(flavours)
+    except Exception as exc:  # pragma: no cover - backend specific errors
+        raise ClipboardUnavailable(str(exc)) from exc
+
+
 def is_available() -> bool:
     """Return True if at least one clipboard backend is usable."""
 
-    return _pyperclip is not None or _KivyClipboard is not None
+    if _override is not None:
+        return True
+    return _load_pyperclip() is not None or _load_kivy_clipboard() is not None
+
+
+def prewarm() -> None:
+    """Import the preferred backend ahead of first use.
+
+    Only pyperclip is warmed: the Kivy provider is left to the first call on
+    the UI thread.
+    """
+
+    _load_pyperclip()
 
 
-__all__ = ["ClipboardUnavailable", "copy", "paste", "is_available"]
+__all__ = [
+    "ClipboardUnavailable",
+    "FakeClipboard",
+    "HTML",
+    "PLAIN_TEXT",
+    "RTF",
+    "copy",
+    "copy_flavours",
+    "is_available",
+    "paste",
+    "paste_flavours",
+    "prewarm",
+    "use_backend",
+]
@@ -0,0 +1,72 @@
+"""Text conversion engines shared by the CLI, the GUI and the service."""
+
+from .dictionary import CasingDictionary, DictionaryFile
+from .identifiers import IDENTIFIER_MODES, identifier_case
+from .locales import LocaleCasing, get_casing
+from .manifest import MANIFEST_NAME, BatchReport, Manifest, convert_tree
+from .protect import PROTECTED_KINDS, ProtectingTransformer, convert_protected
+from .registry import ENTRY_POINT_GROUP, TransformRegistry, TransformSpec
+from .richtext import RICH_FLAVOURS, RichTextTransformer, convert_rich
+from .rules import RuleError, RulesFile, parse_rules
+from .segmenter import DEFAULT_SENTENCE_RULES, SentenceRules, sentence_boundaries
+from .sentences import SentenceCaser, sentence_case
+from .titlecase import title_case
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    ChunkTransformer,
+    WordBufferedTransformer,
+    convert_stream,
+    iter_convert,
+    read_chunks,
+)
+from .textio import (
+    TextEncoding,
+    atomic_write,
+    convert_in_place,
+    iter_decoded,
+    sniff_encoding,
+    sniff_file,
+)
+
+__all__ = [
+    "BatchReport",
+    "CasingDictionary",
+    "DEFAULT_CHUNK_SIZE",
+    "DEFAULT_SENTENCE_RULES",
+    "IDENTIFIER_MODES",
+    "ChunkTransformer",
+    "DictionaryFile",
+    "ENTRY_POINT_GROUP",
+    "LocaleCasing",
+    "MANIFEST_NAME",
+    "Manifest",
+    "PROTECTED_KINDS",
+    "RICH_FLAVOURS",
+    "ProtectingTransformer",
+    "RichTextTransformer",
+    "RuleError",
+    "RulesFile",
+    "SentenceCaser",
+    "SentenceRules",
+    "TextEncoding",
+    "TransformRegistry",
+    "TransformSpec",
+    "WordBufferedTransformer",
+    "atomic_write",
+    "convert_in_place",
+    "convert_protected",
+    "convert_rich",
+    "convert_stream",
+    "convert_tree",
+    "get_casing",
+    "identifier_case",
+    "iter_convert",
+    "iter_decoded",
+    "parse_rules",
+    "read_chunks",
+    "sentence_boundaries",
+    "sentence_case",
+    "sniff_encoding",
+    "sniff_file",
+    "title_case",
+]
@@ -0,0 +1,34 @@
+"""Length of the common prefix and suffix of two strings.
+
+Both are found by binary search over slice comparisons, so the characters
+are compared in C rather than one at a time in Python.
+"""
+
+from __future__ import annotations
+
+
+def common_prefix_length(left: str, right: str) -> int:
+    low, high = 0, min(len(left), len(right))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if left[:middle] == right[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def common_suffix_length(left: str, right: str, limit: int) -> int:
+    """Return the common suffix length, at most *limit* (to keep it clear of the prefix)."""
+
+    low, high = 0, limit
+    while low < high:
+        middle = (low + high + 1) // 2
+        if left[len(left) - middle :] == right[len(right) - middle :]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+__all__ = ["common_prefix_length", "common_suffix_length"]
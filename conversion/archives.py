@@ -0,0 +1,235 @@
+"""Convert the text members of zip and tar archives without extracting them.
+
+Archives are processed member by member: each member is read from the
+source archive, text members are converted as they stream through, and the
+result is appended to a new archive that replaces the destination
+atomically. Binary members, directories and links are copied through with
+their metadata. Plain ``.gz``, ``.bz2`` and ``.xz`` files are treated as a
+single compressed text stream.
+
+Tar headers carry the member size, so a converted tar member is spooled to a
+temporary file (in memory up to :data:`TAR_SPOOL_BYTES`) before it is added;
+only one member is held at a time.
+"""
+
+from __future__ import annotations
+
+import bz2
+import codecs
+import gzip
+import lzma
+import shutil
+import stat
+import tarfile
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import IO, Callable, List, NamedTuple, Optional, Tuple
+
+from .streaming import DEFAULT_CHUNK_SIZE, ChunkTransformer
+from .textio import ENCODING_SNIFF_BYTES, TextEncoding, atomic_write, sniff_encoding
+
+TAR_SPOOL_BYTES = 16 << 20
+
+_TAR_SUFFIXES = {
+    ".tar": "",
+    ".tgz": "gz",
+    ".tbz": "bz2",
+    ".tbz2": "bz2",
+    ".txz": "xz",
+}
+_COMPRESSED_SUFFIXES = {".gz": "gz", ".bz2": "bz2", ".xz": "xz"}
+_OPENERS = {"gz": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+
+
+class ArchiveReport(NamedTuple):
+    converted: List[str]
+    copied: List[str]
+
+    def summary(self) -> str:
+        return f"{len(self.converted)} text member(s) converted, {len(self.copied)} copied"
+
+
+def archive_kind(path: Path) -> Optional[str]:
+    """Return ``"zip"``, ``"tar"``, ``"compressed"`` or None for *path*."""
+
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes[-2:]]
+    if not suffixes:
+        return None
+    last = suffixes[-1]
+    if last == ".zip":
+        return "zip"
+    if last in _TAR_SUFFIXES or (len(suffixes) == 2 and suffixes[0] == ".tar" and last in _COMPRESSED_SUFFIXES):
+        return "tar"
+    if last in _COMPRESSED_SUFFIXES:
+        return "compressed"
+    return None
+
+
+def _tar_compression(path: Path) -> str:
+    last = Path(path).suffix.lower()
+    return _TAR_SUFFIXES.get(last, _COMPRESSED_SUFFIXES.get(last, ""))
+
+
+def _convert_stream(
+    head: bytes,
+    source: IO[bytes],
+    sink: IO[bytes],
+    encoding: TextEncoding,
+    transformer: ChunkTransformer,
+    chunk_size: int,
+) -> None:
+    """Convert *head* plus the rest of *source* into *sink*, keeping the encoding."""
+
+    decoder = codecs.getincrementaldecoder(encoding.codec)(encoding.errors)
+    encoder = codecs.getincrementalencoder(encoding.codec)(encoding.errors)
+    sink.write(encoding.bom)
+    data = head[len(encoding.bom) :]
+    while True:
+        text = decoder.decode(data, final=not data)
+        if text:
+            sink.write(encoder.encode(transformer.feed(text)))
+        if not data:
+            break
+        data = source.read(chunk_size)
+    sink.write(encoder.encode(transformer.finish(), final=True))
+
+
+def _sniff_member(source: IO[bytes]) -> Tuple[bytes, Optional[TextEncoding]]:
+    head = source.read(ENCODING_SNIFF_BYTES)
+    return head, sniff_encoding(head, complete=len(head) < ENCODING_SNIFF_BYTES)
+
+
+class _Prefixed:
+    """Readable stream yielding *head* and then the rest of *stream*."""
+
+    def __init__(self, head: bytes, stream: IO[bytes]) -> None:
+        self._head = head
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            data, self._head = self._head + self._stream.read(), b""
+            return data
+        data, self._head = self._head[:size], self._head[size:]
+        # tarfile treats a short read as a truncated member, so fill the request.
+        while len(data) < size:
+            more = self._stream.read(size - len(data))
+            if not more:
+                break
+            data += more
+        return data
+
+
+def _zip_copy_info(info: zipfile.ZipInfo) -> zipfile.ZipInfo:
+    copy = zipfile.ZipInfo(info.filename, info.date_time)
+    copy.compress_type = info.compress_type
+    copy.comment = info.comment
+    copy.extra = info.extra
+    copy.create_system = info.create_system
+    copy.external_attr = info.external_attr
+    copy.internal_attr = info.internal_attr
+    return copy
+
+
+def _convert_zip(
+    source: Path, sink: IO[bytes], make_transformer: Callable[[], ChunkTransformer], chunk_size: int
+) -> ArchiveReport:
+    report = ArchiveReport([], [])
+    with zipfile.ZipFile(source) as archive_in, zipfile.ZipFile(sink, "w") as archive_out:
+        archive_out.comment = archive_in.comment
+        for info in archive_in.infolist():
+            target = _zip_copy_info(info)
+            if info.is_dir() or stat.S_ISLNK(info.external_attr >> 16):
+                # A symlink's data is its target path, which must not be converted.
+                archive_out.writestr(target, archive_in.read(info))
+                continue
+            # Case conversion can grow a member (e.g. "ß" -> "SS"), so leave
+            # room for zip64 sizes well before the limit.
+            large = info.file_size >= zipfile.ZIP64_LIMIT // 4
+            with archive_in.open(info) as member, archive_out.open(target, "w", force_zip64=large) as out:
+                head, encoding = _sniff_member(member)
+                if encoding is None:
+                    out.write(head)
+                    shutil.copyfileobj(member, out, chunk_size)
+                    report.copied.append(info.filename)
+                else:
+                    _convert_stream(head, member, out, encoding, make_transformer(), chunk_size)
+                    report.converted.append(info.filename)
+    return report
+
+
+def _convert_tar(
+    source: Path, sink: IO[bytes], make_transformer: Callable[[], ChunkTransformer], chunk_size: int
+) -> ArchiveReport:
+    report = ArchiveReport([], [])
+    compression = _tar_compression(source)
+    with tarfile.open(source, "r|*") as archive_in, tarfile.open(
+        fileobj=sink, mode=f"w|{compression}", format=tarfile.PAX_FORMAT
+    ) as archive_out:
+        for info in archive_in:
+            if not info.isfile():
+                archive_out.addfile(info)
+                continue
+            member = archive_in.extractfile(info)
+            head, encoding = _sniff_member(member)
+            if encoding is None:
+                # Size is unchanged, so binary members stream straight through.
+                archive_out.addfile(info, _Prefixed(head, member))
+                report.copied.append(info.name)
+                continue
+            with tempfile.SpooledTemporaryFile(TAR_SPOOL_BYTES) as spool:
+                _convert_stream(head, member, spool, encoding, make_transformer(), chunk_size)
+                info.size = spool.tell()
+                info.pax_headers.pop("size", None)
+                spool.seek(0)
+                archive_out.addfile(info, spool)
+            report.converted.append(info.name)
+    return report
+
+
+def _convert_compressed(
+    source: Path, sink: IO[bytes], make_transformer: Callable[[], ChunkTransformer], chunk_size: int
+) -> ArchiveReport:
+    compression = _COMPRESSED_SUFFIXES[Path(source).suffix.lower()]
+    inner = Path(source).stem
+    with _OPENERS[compression](source, "rb") as stream:
+        head, encoding = _sniff_member(stream)
+        if compression == "gz":
+            # Keep the original name and timestamp in the gzip header.
+            out = gzip.GzipFile(filename=inner, mode="wb", fileobj=sink, mtime=stream.mtime)
+        else:
+            out = _OPENERS[compression](sink, "wb")
+        with out:
+            if encoding is None:
+                out.write(head)
+                shutil.copyfileobj(stream, out, chunk_size)
+                return ArchiveReport([], [inner])
+            _convert_stream(head, stream, out, encoding, make_transformer(), chunk_size)
+    return ArchiveReport([inner], [])
+
+
+_CONVERTERS = {"zip": _convert_zip, "tar": _convert_tar, "compressed": _convert_compressed}
+
+
+def convert_archive(
+    source: Path,
+    destination: Path,
+    make_transformer: Callable[[], ChunkTransformer],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> ArchiveReport:
+    """Write a copy of archive *source* with its text members converted.
+
+    *destination* may equal *source*: the new archive is written to a
+    temporary file and only replaces the destination once complete.
+    """
+
+    kind = archive_kind(source)
+    if kind is None:
+        raise ValueError(f"{source} is not a zip, tar, gz, bz2 or xz file")
+    with atomic_write(destination) as sink:
+        return _CONVERTERS[kind](Path(source), sink, make_transformer, chunk_size)
+
+
+__all__ = ["ArchiveReport", "TAR_SPOOL_BYTES", "archive_kind", "convert_archive"]
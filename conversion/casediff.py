@@ -0,0 +1,178 @@
+"""Linear-time diff between a text and its case conversion.
+
+A case conversion keeps the line structure of its input, so the input and
+output lines can be paired one to one instead of searching for an alignment
+like :mod:`difflib` does. Identical lines are skipped with a single string
+comparison; for the rest, the changed columns of equal-length lines are found
+by XOR-ing the two encodings. Lines whose length changed (``ß`` to ``SS``, a
+dropped trailing newline) are reported as one span.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from itertools import zip_longest
+from typing import Deque, Iterable, Iterator, List, NamedTuple, Tuple
+
+from .affixes import common_prefix_length, common_suffix_length
+from .streaming import ChunkTransformer
+
+Span = Tuple[int, int]
+
+# Lines longer than this are shown as a window around the first change.
+DIFF_DISPLAY_WIDTH = 160
+_CHANGED_BYTE = bytes.maketrans(bytes(range(256)), b"0" + b"1" * 255)
+_CHANGED_RUN = re.compile(b"1+")
+
+
+class LineChange(NamedTuple):
+    """A changed line: 1-based number, both versions, 0-based ``[start, end)`` spans."""
+
+    number: int
+    before: str
+    after: str
+    spans: List[Span]
+    changed: int
+
+
+class DiffStats(NamedTuple):
+    lines: int
+    characters: int
+
+
+def changed_spans(before: str, after: str) -> Tuple[List[Span], int]:
+    """Return the changed column spans of *before* and the changed character count.
+
+    Line endings are compared separately so a dropped trailing newline does
+    not shift the comparison of the line's text.
+    """
+
+    body = before.rstrip("\r\n")
+    target = after.rstrip("\r\n")
+    spans, changed = _body_spans(body, target)
+    ending, new_ending = before[len(body) :], after[len(target) :]
+    if ending != new_ending:
+        spans.append((len(body), len(body) + max(1, len(ending))))
+        changed += max(len(ending), len(new_ending))
+    return spans, changed
+
+
+def _body_spans(before: str, after: str) -> Tuple[List[Span], int]:
+    if len(before) != len(after):
+        prefix = common_prefix_length(before, after)
+        suffix = common_suffix_length(before, after, min(len(before), len(after)) - prefix)
+        changed = max(len(before), len(after)) - prefix - suffix
+        return [(prefix, max(prefix + 1, len(before) - suffix))], changed
+    if before.isascii() and after.isascii():
+        length = len(before)
+        diff = (
+            int.from_bytes(before.encode("ascii"), "big") ^ int.from_bytes(after.encode("ascii"), "big")
+        ).to_bytes(length, "big")
+        flags = diff.translate(_CHANGED_BYTE)
+        return [match.span() for match in _CHANGED_RUN.finditer(flags)], flags.count(b"1")
+
+    spans: List[Span] = []
+    changed = 0
+    for index, (left, right) in enumerate(zip(before, after)):
+        if left != right:
+            changed += 1
+            if spans and spans[-1][1] == index:
+                spans[-1] = (spans[-1][0], index + 1)
+            else:
+                spans.append((index, index + 1))
+    return spans, changed
+
+
+class _LineSplitter:
+    """Collect streamed text as complete ``\\n``-terminated lines."""
+
+    def __init__(self) -> None:
+        self.lines: Deque[str] = deque()
+        self.partial = ""
+
+    def add(self, text: str) -> None:
+        if not text:
+            return
+        parts = (self.partial + text).split("\n")
+        self.partial = parts.pop()
+        self.lines.extend(parts)
+
+    def rest(self) -> List[str]:
+        lines = [line + "\n" for line in self.lines]
+        if self.partial:
+            lines.append(self.partial)
+        return lines
+
+
+def iter_line_changes(chunks: Iterable[str], transformer: ChunkTransformer) -> Iterator[LineChange]:
+    """Run *chunks* through *transformer* and yield the lines it would change.
+
+    Memory use is bounded by the longest line, not the size of the input.
+    """
+
+    source = _LineSplitter()
+    target = _LineSplitter()
+    number = 0
+
+    def paired() -> Iterator[LineChange]:
+        nonlocal number
+        while source.lines and target.lines:
+            before = source.lines.popleft()
+            after = target.lines.popleft()
+            number += 1
+            if before != after:
+                spans, changed = changed_spans(before, after)
+                yield LineChange(number, before, after, spans, changed)
+
+    for chunk in chunks:
+        source.add(chunk)
+        target.add(transformer.feed(chunk))
+        yield from paired()
+    target.add(transformer.finish())
+    yield from paired()
+    for before, after in zip_longest(source.rest(), target.rest(), fillvalue=""):
+        number += 1
+        if before != after:
+            spans, changed = changed_spans(before, after)
+            yield LineChange(number, before, after, spans, changed)
+
+
+def _visible(line: str, focus: int) -> str:
+    line = line.rstrip("\r\n")
+    if len(line) <= DIFF_DISPLAY_WIDTH:
+        return line
+    start = max(0, min(focus - DIFF_DISPLAY_WIDTH // 4, len(line) - DIFF_DISPLAY_WIDTH))
+    window = line[start : start + DIFF_DISPLAY_WIDTH]
+    return ("…" if start else "") + window + ("…" if start + DIFF_DISPLAY_WIDTH < len(line) else "")
+
+
+def format_change(change: LineChange) -> str:
+    """Render *change* as a hunk header plus the old and new line."""
+
+    columns = ", ".join(
+        str(start + 1) if end - start == 1 else f"{start + 1}-{end}" for start, end in change.spans
+    )
+    focus = change.spans[0][0] if change.spans else 0
+    return (
+        f"@@ line {change.number}, columns {columns} @@\n"
+        f"-{_visible(change.before, focus)}\n"
+        f"+{_visible(change.after, focus)}\n"
+    )
+
+
+def describe_stats(stats: DiffStats) -> str:
+    lines = "line" if stats.lines == 1 else "lines"
+    characters = "character" if stats.characters == 1 else "characters"
+    return f"{stats.characters} {characters} on {stats.lines} {lines} would change"
+
+
+__all__ = [
+    "DIFF_DISPLAY_WIDTH",
+    "DiffStats",
+    "LineChange",
+    "changed_spans",
+    "describe_stats",
+    "format_change",
+    "iter_line_changes",
+]
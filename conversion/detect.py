@@ -0,0 +1,133 @@
+"""Guess which case style a text is already in.
+
+:func:`detect_style` looks at no more than ``sample`` characters, taken as a
+few windows spread over the text and trimmed to whole words, so it costs the
+same on a sentence and on a 100 MB selection. The windows are classified by
+counting word shapes:
+
+- mostly identifiers of one programmer style -> ``snake``, ``constant``,
+  ``kebab``, ``camel`` or ``pascal``;
+- no lower-case letters -> ``upper``; no upper-case letters -> ``lower``;
+- long words nearly all capitalised -> ``title``;
+- capitals almost only at the start of sentences -> ``sentence``;
+- anything else (or no letters at all) -> ``mixed``.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Dict, List, Optional, Sequence
+
+DETECTED_STYLES = (
+    "upper",
+    "lower",
+    "title",
+    "sentence",
+    "snake",
+    "constant",
+    "kebab",
+    "camel",
+    "pascal",
+    "mixed",
+)
+DETECT_SAMPLE_CHARS = 4096
+_WINDOWS = 4
+
+_IDENTIFIER_SHAPES = {
+    "snake": re.compile(r"[a-z][a-z0-9]*(?:_[a-z0-9]+)+"),
+    "constant": re.compile(r"[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+"),
+    "kebab": re.compile(r"[a-z][a-z0-9]*(?:-[a-z0-9]+)+"),
+    "camel": re.compile(r"[a-z][a-z0-9]*(?:[A-Z][a-z0-9]*)+"),
+    "pascal": re.compile(r"[A-Z][a-z0-9]+(?:[A-Z][a-z0-9]*)+"),
+}
+# A word and whether a sentence ended right before it.
+_WORD = re.compile(r"(?:(?<=[.!?])\s+|^\s*)?([^\W\d_][^\W_]*)")
+_LONG_WORD = 4
+
+
+def _sample(text: str, size: int = DETECT_SAMPLE_CHARS) -> List[str]:
+    """Up to *size* characters of *text*, as evenly spread whole-word windows."""
+
+    if len(text) <= size:
+        return [text]
+    width = size // _WINDOWS
+    step = (len(text) - width) // (_WINDOWS - 1)
+    windows = []
+    for index in range(_WINDOWS):
+        start = index * step
+        window = text[start:start + width]
+        if start:
+            # Drop the partial first word (unless the window is one long word).
+            cut = min((window.find(space) for space in " \n\t" if space in window), default=-1)
+            window = window[cut + 1:] if cut >= 0 else window
+        if start + width < len(text):
+            cut = max(window.rfind(space) for space in " \n\t")
+            window = window[:cut] if cut > 0 else window
+        windows.append(window)
+    return windows
+
+
+def _identifier_style(windows: Sequence[str]) -> Optional[str]:
+    counts: Dict[str, int] = dict.fromkeys(_IDENTIFIER_SHAPES, 0)
+    tokens = 0
+    for window in windows:
+        for token in window.split():
+            token = token.strip(".,;:()[]{}\"'`")
+            tokens += 1
+            for style, shape in _IDENTIFIER_SHAPES.items():
+                if shape.fullmatch(token):
+                    counts[style] += 1
+                    break
+    style = max(counts, key=counts.__getitem__)
+    return style if tokens and counts[style] * 2 > tokens else None
+
+
+def detect_style(text: str, *, sample: int = DETECT_SAMPLE_CHARS) -> str:
+    """Return the style of *text*, one of :data:`DETECTED_STYLES`."""
+
+    windows = _sample(text, sample)
+    style = _identifier_style(windows)
+    if style is not None:
+        return style
+    joined = "\n".join(windows)
+    if not any(character.isalpha() for character in joined):
+        return "mixed"
+    if joined == joined.upper():
+        return "upper"
+    if joined == joined.lower():
+        return "lower"
+    words = capitals = long_words = long_capitals = 0
+    starts = capital_starts = stray_capitals = 0
+    for match in _WORD.finditer(joined):
+        word = match.group(1)
+        capital = word[0].isupper()
+        words += 1
+        capitals += capital
+        if len(word) >= _LONG_WORD:
+            long_words += 1
+            long_capitals += capital
+        if match.group(0) != word or not match.start():
+            starts += 1
+            capital_starts += capital
+        elif capital and word != "I":
+            stray_capitals += 1  # names, acronyms, or not sentence case at all
+    if long_words and long_capitals >= 0.9 * long_words and capitals * 2 > words:
+        return "title"
+    if capital_starts >= 0.9 * starts and stray_capitals <= 0.2 * words:
+        return "sentence"
+    return "mixed"
+
+
+def next_style(current: str, rotation: Sequence[str]) -> str:
+    """The mode after *current* in *rotation*, or the first one if it is not there."""
+
+    if not rotation:
+        raise ValueError("the case rotation is empty")
+    try:
+        index = list(rotation).index(current)
+    except ValueError:
+        return rotation[0]
+    return rotation[(index + 1) % len(rotation)]
+
+
+__all__ = ["DETECTED_STYLES", "DETECT_SAMPLE_CHARS", "detect_style", "next_style"]
@@ -0,0 +1,275 @@
+"""User dictionary of preserved spellings, stop words and abbreviations.
+
+The dictionary is a small text file with up to four sections::
+
+    # Spellings kept exactly as written, whatever the mode does to them.
+    [preserve]
+    NASA
+    iPhone
+    GitHub
+
+    # Words title mode leaves in lower case, except at the start of a line
+    # or sentence.
+    [stopwords]
+    of
+    and
+    the
+
+    # Abbreviations whose "." does not end a sentence ("Corp. profits"),
+    # and ones that are only abbreviations before a number ("Sch. 4").
+    [abbreviations]
+    Corp
+    [numeric-abbreviations]
+    Sch
+
+The abbreviations extend the built-in lists of :mod:`conversion.segmenter`
+for sentence mode. The other two sections are compiled into one hash table
+keyed by the lower-cased word, so a converted text is split into words once
+and every word costs a single ``dict.get``, however many entries the file
+has. :class:`DictionaryFile`
+re-reads the file when its size or modification time changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, NamedTuple, Optional, Set, Tuple
+
+from .segmenter import (
+    DEFAULT_ABBREVIATIONS,
+    DEFAULT_NUMERIC_ABBREVIATIONS,
+    DEFAULT_SENTENCE_RULES,
+    SentenceRules,
+)
+from .streaming import ChunkTransformer, WordBufferedTransformer
+
+DICTIONARY_NAME = "casemonster-dictionary.txt"
+DICTIONARY_SECTIONS = ("preserve", "stopwords", "abbreviations", "numeric-abbreviations")
+
+# Words, including inner apostrophes and hyphens ("O'Neill", "Wi-Fi"). The
+# group makes ``split`` return the words at the odd indices.
+_WORD = re.compile(r"([^\W_]+(?:['’-][^\W_]+)*)")
+# A separator containing one of these starts a new phrase, whose first word
+# keeps its capital in title mode.
+_PHRASE_BREAK = re.compile(r"[\n.:;!?]")
+# The first word after a phrase break.
+_PHRASE_START = re.compile(r"[\n.:;!?][\W_]*([^\W_]+(?:['’-][^\W_]+)*)")
+# An abbreviation, with inner dots ("e.g") and optionally the final one.
+_ABBREVIATION = re.compile(r"[^\W_]+(?:\.[^\W_]+)*\.?")
+
+
+class DictionaryError(ValueError):
+    """The dictionary file could not be parsed."""
+
+
+class CasingDictionary(NamedTuple):
+    preserve: Dict[str, str]
+    stopwords: FrozenSet[str]
+    # ``preserve`` plus every stop word mapped to itself.
+    title_lookup: Dict[str, str]
+    fingerprint: str
+    # The segmenter's abbreviations plus those of the file.
+    sentence_rules: SentenceRules = DEFAULT_SENTENCE_RULES
+
+    @property
+    def empty(self) -> bool:
+        return not self.title_lookup
+
+    def apply(self, text: str, *, title: bool = False) -> str:
+        """Restore preserved spellings in converted *text*.
+
+        With ``title`` stop words are lower-cased too, except for the first
+        word of the text, of a line and of a sentence.
+        """
+
+        return self._apply(text, title, None)[0]
+
+    def _apply(self, text: str, title: bool, lead: Optional[str]) -> Tuple[str, Optional[str]]:
+        # *lead* is the separator before the first word of *text* (None at the
+        # very start); the one for whatever follows *text* is returned with it.
+        lookup = self.title_lookup if title else self.preserve
+        if not lookup:
+            return text, lead
+        # Most space-separated pieces are a single bare word and cost one
+        # lookup; only the rest ("mars.", "it's", "end\nof") go through the
+        # regular expression, which is several times slower per word.
+        pieces = text.split(" ")
+        get = lookup.get
+        output = [get(piece.lower(), piece) for piece in pieces]
+        for index in [index for index, piece in enumerate(pieces) if not piece.isalpha()]:
+            parts = _WORD.split(pieces[index])
+            parts[1::2] = [get(word.lower(), word) for word in parts[1::2]]
+            output[index] = "".join(parts)
+        converted = " ".join(output)
+        if title and self.stopwords:
+            converted = self._capitalize_phrase_starts(converted, lead)
+        return converted, _lead_after(converted, lead)
+
+    def _capitalize_phrase_starts(self, text: str, lead: Optional[str]) -> str:
+        spans = [match.span(1) for match in _PHRASE_START.finditer(text)]
+        if lead is None or _PHRASE_BREAK.search(lead):
+            first = _WORD.search(text)
+            # Text that opens with a phrase break already has this span.
+            if first is not None and (not spans or spans[0][0] != first.start()):
+                spans.insert(0, first.span())
+        pieces = []
+        last = 0
+        for start, end in spans:
+            word = text[start:end]
+            if word in self.stopwords:
+                pieces += [text[last:start], word[:1].upper(), word[1:]]
+                last = end
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+
+def _lead_after(text: str, lead: Optional[str]) -> Optional[str]:
+    """The separator after the last word of *text*, reduced to whether it breaks a phrase."""
+
+    end = len(text)
+    while end and not text[end - 1].isalnum():
+        end -= 1
+    if end:
+        separator = text[end:]
+    elif lead is None:
+        return None
+    else:
+        separator = lead + text
+    return "\n" if _PHRASE_BREAK.search(separator) else " "
+
+
+EMPTY_DICTIONARY = CasingDictionary({}, frozenset(), {}, "")
+
+
+def parse_dictionary(lines: Iterable[str]) -> CasingDictionary:
+    """Compile dictionary file *lines*; blank lines and ``#`` comments are skipped."""
+
+    preserve: Dict[str, str] = {}
+    stopwords = set()
+    abbreviations: Dict[str, Set[str]] = {"abbreviations": set(), "numeric-abbreviations": set()}
+    section: Optional[str] = None
+    digest = hashlib.blake2b(digest_size=8)
+    for number, raw in enumerate(lines, 1):
+        line = raw.strip()
+        if not line or line.startswith("#"):
+            continue
+        digest.update(line.encode("utf-8", "surrogatepass") + b"\n")
+        if line.startswith("[") and line.endswith("]"):
+            section = line[1:-1].strip().lower()
+            if section not in DICTIONARY_SECTIONS:
+                raise DictionaryError(f"line {number}: unknown section [{section}]")
+            continue
+        if section is None:
+            raise DictionaryError(f"line {number}: {line!r} is outside a section")
+        if section in abbreviations:
+            if not _ABBREVIATION.fullmatch(line):
+                raise DictionaryError(f"line {number}: {line!r} is not an abbreviation")
+            abbreviations[section].add(line)
+            continue
+        if not _WORD.fullmatch(line):
+            raise DictionaryError(f"line {number}: {line!r} is not a single word")
+        if section == "preserve":
+            preserve[line.lower()] = line
+        else:
+            stopwords.add(line.lower())
+    if not (preserve or stopwords or any(abbreviations.values())):
+        return EMPTY_DICTIONARY
+    title_lookup = {word: word for word in stopwords}
+    title_lookup.update(preserve)
+    rules = DEFAULT_SENTENCE_RULES
+    if any(abbreviations.values()):
+        rules = SentenceRules.create(
+            DEFAULT_ABBREVIATIONS | abbreviations["abbreviations"],
+            DEFAULT_NUMERIC_ABBREVIATIONS | abbreviations["numeric-abbreviations"],
+        )
+    return CasingDictionary(
+        preserve, frozenset(stopwords), title_lookup, digest.hexdigest(), rules
+    )
+
+
+def load_dictionary(path: Path) -> CasingDictionary:
+    """Read the dictionary at *path*; a missing file is an empty dictionary."""
+
+    try:
+        with open(path, encoding="utf-8-sig") as handle:
+            return parse_dictionary(handle)
+    except FileNotFoundError:
+        return EMPTY_DICTIONARY
+
+
+class DictionaryFile:
+    """The dictionary at *path*, re-read whenever the file changes.
+
+    :meth:`current` costs one ``stat`` when nothing changed. If an edited file
+    does not parse, the previous dictionary stays in use and the error is kept
+    in :attr:`error`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.error: Optional[DictionaryError] = None
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._dictionary = EMPTY_DICTIONARY
+
+    def current(self) -> CasingDictionary:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            signature = None
+        else:
+            signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return self._dictionary
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    self._dictionary = load_dictionary(self.path)
+                except DictionaryError as exc:
+                    self.error = exc
+                else:
+                    self.error = None
+                self._signature = signature
+        return self._dictionary
+
+
+class DictionaryTransformer:
+    """Apply a dictionary to the output of *inner*, one whole word at a time."""
+
+    def __init__(
+        self, inner: ChunkTransformer, dictionary: CasingDictionary, *, title: bool = False
+    ) -> None:
+        self._inner = inner
+        self._dictionary = dictionary
+        self._title = title
+        self._lead: Optional[str] = None
+        self._words = WordBufferedTransformer(self._apply)
+
+    def _apply(self, text: str) -> str:
+        output, self._lead = self._dictionary._apply(text, self._title, self._lead)
+        return output
+
+    def feed(self, chunk: str) -> str:
+        return self._words.feed(self._inner.feed(chunk))
+
+    def finish(self) -> str:
+        output = self._words.feed(self._inner.finish())
+        return output + self._words.finish()
+
+
+__all__ = [
+    "CasingDictionary",
+    "DICTIONARY_NAME",
+    "DictionaryError",
+    "DictionaryFile",
+    "DictionaryTransformer",
+    "EMPTY_DICTIONARY",
+    "load_dictionary",
+    "parse_dictionary",
+]
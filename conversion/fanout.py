@@ -0,0 +1,167 @@
+"""Write several case variants of one file from a single read.
+
+The source is read and decoded once. Each decoded chunk is handed to one
+writer thread per variant through a small bounded queue, so all variants are
+produced concurrently in one streaming pass and memory stays bounded by a few
+chunks per variant. Outputs keep the source's encoding and BOM. Each writer
+fills and syncs a temporary file next to its output, and the outputs are only
+moved into place once every writer has finished, so if any variant fails no
+output is replaced.
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+import queue
+import threading
+from contextlib import suppress
+from pathlib import Path
+from typing import Callable, Dict, List, Mapping, Optional
+
+from .streaming import DEFAULT_CHUNK_SIZE, ChunkTransformer
+from .textio import TextEncoding, iter_decoded, replace_with, sniff_file, temp_sibling
+
+# Chunks buffered per variant before the reader waits for the slowest writer.
+FANOUT_QUEUE_CHUNKS = 4
+
+
+class _VariantWriter(threading.Thread):
+    def __init__(
+        self,
+        target: Path,
+        transformer: ChunkTransformer,
+        encoding: TextEncoding,
+        failed: threading.Event,
+    ) -> None:
+        super().__init__(name=f"caseMonster-fanout-{target.name}", daemon=True)
+        self.target = target
+        self.chunks: "queue.Queue[Optional[str]]" = queue.Queue(FANOUT_QUEUE_CHUNKS)
+        self.error: Optional[BaseException] = None
+        self.temp: Optional[Path] = None
+        self._transformer = transformer
+        self._encoding = encoding
+        self._failed = failed
+
+    def run(self) -> None:
+        done = False
+        try:
+            encoder = codecs.getincrementalencoder(self._encoding.codec)(self._encoding.errors)
+            sink, self.temp = temp_sibling(self.target)
+            with sink:
+                sink.write(self._encoding.bom)
+                while True:
+                    chunk = self.chunks.get()
+                    if chunk is None:
+                        done = True
+                        break
+                    sink.write(encoder.encode(self._transformer.feed(chunk)))
+                sink.write(encoder.encode(self._transformer.finish(), final=True))
+                sink.flush()
+                os.fsync(sink.fileno())
+        except BaseException as exc:
+            self.error = exc
+            self._failed.set()
+            # Keep consuming so the reader never blocks on a full queue.
+            while not done:
+                done = self.chunks.get() is None
+
+    def discard(self) -> None:
+        if self.temp is not None:
+            with suppress(FileNotFoundError):
+                os.unlink(self.temp)
+            self.temp = None
+
+
+def fanout_file(
+    source: Path,
+    targets: Mapping[str, Path],
+    make_transformer: Callable[[str], ChunkTransformer],
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Path]:
+    """Convert *source* into every ``mode -> path`` pair of *targets* at once.
+
+    Raises ValueError for binary input or when an output would overwrite the
+    source; any exception from a writer is re-raised after all have stopped.
+    """
+
+    source = Path(source)
+    resolved = {mode: Path(path) for mode, path in targets.items()}
+    if source.resolve() in {path.resolve() for path in resolved.values()}:
+        raise ValueError(f"an output path equals the source {source}; use --in-place instead")
+    if len({path.resolve() for path in resolved.values()}) != len(resolved):
+        raise ValueError("every variant needs its own output path")
+    encoding = sniff_file(source)
+    if encoding is None:
+        raise ValueError(f"{source} does not look like a text file")
+
+    failed = threading.Event()
+    writers: List[_VariantWriter] = []
+    for mode, path in resolved.items():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        writers.append(_VariantWriter(path, make_transformer(mode), encoding, failed))
+    for writer in writers:
+        writer.start()
+
+    try:
+        with source.open("rb") as handle:
+            handle.seek(len(encoding.bom))
+            for text in iter_decoded(handle, encoding, chunk_size):
+                if failed.is_set():
+                    break
+                for writer in writers:
+                    writer.chunks.put(text)
+    except BaseException:
+        failed.set()
+        raise
+    finally:
+        for writer in writers:
+            writer.chunks.put(None)
+        for writer in writers:
+            writer.join()
+        if failed.is_set():
+            for writer in writers:
+                writer.discard()
+
+    for writer in writers:
+        if writer.error is not None:
+            raise writer.error
+    # Every output is complete and synced; only now replace the targets.
+    try:
+        for writer in writers:
+            replace_with(writer.target, writer.temp)
+            writer.temp = None
+    finally:
+        for writer in writers:
+            writer.discard()
+    return resolved
+
+
+_TEMPLATE_FIELDS = "{parent}, {name}, {stem}, {suffix} and {mode}"
+
+
+def expand_output_template(template: str, source: Path, mode: str) -> Path:
+    """Fill ``{parent}``, ``{name}``, ``{stem}``, ``{suffix}`` and ``{mode}``.
+
+    Raises ValueError for any other field or a malformed template.
+    """
+
+    source = Path(source)
+    try:
+        expanded = template.format(
+            parent=str(source.parent),
+            name=source.name,
+            stem=source.stem,
+            suffix=source.suffix,
+            mode=mode,
+        )
+    except (KeyError, IndexError, AttributeError, ValueError) as exc:
+        raise ValueError(
+            f"bad output template {template!r} ({type(exc).__name__}: {exc}); "
+            f"it may only use {_TEMPLATE_FIELDS}"
+        ) from None
+    return Path(expanded)
+
+
+__all__ = ["FANOUT_QUEUE_CHUNKS", "expand_output_template", "fanout_file"]
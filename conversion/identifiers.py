@@ -0,0 +1,80 @@
+"""Programmer case modes: camelCase, PascalCase, snake_case, kebab-case, CONSTANT_CASE.
+
+Every mode is built on :func:`split_identifier`, one regular expression that
+splits an identifier into words at separators (``_``, ``-``), at case
+transitions ("parseHTTPResponse" -> parse, HTTP, Response) and around digit
+runs ("sha256sum" -> sha, 256, sum), so converting between any two styles
+round-trips.
+
+Text is converted identifier by identifier: an identifier is a run of
+letters and digits joined by ``_`` or ``-``. Whitespace, other punctuation
+and leading or trailing underscores ("_private", "__init__") are kept.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, Dict, List
+
+# Upper-case letters are told apart for Latin-1; any other letter counts as
+# lower case (including uncased scripts).
+_UPPER = "A-ZÀ-ÖØ-Þ"
+_U = f"[{_UPPER}]"
+_L = rf"[^\W\d_{_UPPER}]"
+_PART = re.compile(
+    rf"{_U}+(?={_U}{_L})"  # an acronym before a capitalised word: "HTTP" in "HTTPResponse"
+    rf"|{_U}?{_L}+"  # a word: "parse", "Response"
+    rf"|{_U}+"  # a trailing acronym: "ID"
+    r"|\d+"
+)
+_IDENTIFIER = re.compile(r"[^\W_]+(?:[_-]+[^\W_]+)*")
+
+
+def split_identifier(name: str) -> List[str]:
+    """Return the words of identifier *name*, as written."""
+
+    return _PART.findall(name)
+
+
+def _camel(parts: List[str]) -> str:
+    return parts[0].lower() + "".join(map(str.capitalize, parts[1:]))
+
+
+def _pascal(parts: List[str]) -> str:
+    return "".join(map(str.capitalize, parts))
+
+
+def _snake(parts: List[str]) -> str:
+    return "_".join(parts).lower()
+
+
+def _kebab(parts: List[str]) -> str:
+    return "-".join(parts).lower()
+
+
+def _constant(parts: List[str]) -> str:
+    return "_".join(parts).upper()
+
+
+_JOINERS: Dict[str, Callable[[List[str]], str]] = {
+    "camel": _camel,
+    "pascal": _pascal,
+    "snake": _snake,
+    "kebab": _kebab,
+    "constant": _constant,
+}
+IDENTIFIER_MODES = tuple(_JOINERS)
+
+
+def identifier_case(text: str, mode: str) -> str:
+    """Rewrite every identifier in *text* in *mode* (one of :data:`IDENTIFIER_MODES`)."""
+
+    try:
+        join = _JOINERS[mode]
+    except KeyError:
+        raise ValueError(f"unknown identifier style: {mode!r}") from None
+    findall = _PART.findall
+    return _IDENTIFIER.sub(lambda match: join(findall(match.group())), text)
+
+
+__all__ = ["IDENTIFIER_MODES", "identifier_case", "split_identifier"]
@@ -0,0 +1,359 @@
+"""Convert a range of lines of a large file using a sparse line-offset index.
+
+The index stores the byte offset of every :data:`LINE_INDEX_STRIDE`-th line.
+It is built in one pass (newlines are counted in bulk and only the stride
+boundaries are located) and cached next to the file as
+``.NAME.casemonster-lines.json``, keyed by the file's size and mtime. A range
+request then seeks to the nearest indexed line before the range and scans at
+most one stride of lines to find its start.
+
+Converted ranges are spliced back in place when their encoded length is
+unchanged; otherwise the file is rewritten atomically around the range and
+the cached offsets after it are shifted rather than rebuilt.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import shutil
+import tempfile
+from contextlib import suppress
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+
+from .streaming import DEFAULT_CHUNK_SIZE, ChunkTransformer
+from .textio import TextEncoding, atomic_write
+
+LINE_INDEX_STRIDE = 1024
+LINE_INDEX_VERSION = 1
+LINE_INDEX_SUFFIX = ".casemonster-lines.json"
+# Converted ranges up to this size are held in memory before being written.
+RANGE_SPOOL_BYTES = 16 << 20
+
+
+class LineRange(NamedTuple):
+    """1-based inclusive line range; ``end`` None means "to the end of the file"."""
+
+    start: int
+    end: Optional[int]
+
+
+class RangeResult(NamedTuple):
+    start_byte: int
+    end_byte: int
+    spliced: bool
+
+
+def parse_line_range(value: str) -> LineRange:
+    """Parse ``START:END``, ``START:`` or ``:END`` (1-based, inclusive)."""
+
+    start_text, separator, end_text = value.partition(":")
+    try:
+        start = int(start_text) if start_text.strip() else 1
+        end = int(end_text) if separator and end_text.strip() else (None if separator else start)
+    except ValueError as exc:
+        raise ValueError(f"invalid line range {value!r}; expected START:END") from exc
+    if start < 1 or (end is not None and end < start):
+        raise ValueError(f"invalid line range {value!r}; lines are numbered from 1")
+    return LineRange(start, end)
+
+
+class LineIndex:
+    """Byte offsets of every ``stride``-th line start of one file version."""
+
+    def __init__(
+        self,
+        size: int,
+        mtime_ns: int,
+        codec: str,
+        stride: int,
+        offsets: List[int],
+        lines: int,
+    ) -> None:
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.codec = codec
+        self.stride = stride
+        self.offsets = offsets
+        self.lines = lines
+
+    def to_json(self) -> dict:
+        return {
+            "version": LINE_INDEX_VERSION,
+            "size": self.size,
+            "mtime_ns": self.mtime_ns,
+            "codec": self.codec,
+            "stride": self.stride,
+            "offsets": self.offsets,
+            "lines": self.lines,
+        }
+
+
+def index_path(path: Path) -> Path:
+    path = Path(path)
+    return path.with_name(f".{path.name}{LINE_INDEX_SUFFIX}")
+
+
+def _newline(encoding: TextEncoding) -> bytes:
+    return "\n".encode(encoding.codec)
+
+
+def _nth_newline(chunk: bytes, start: int, count: int) -> int:
+    """Position of the *count*-th ``\\n`` in ``chunk[start:]`` (single-byte codecs)."""
+
+    # Guess a window from the average line length so each boundary costs a
+    # few C-level scans of roughly one stride, not of the whole chunk.
+    average = min(len(chunk), 1 << 16) / max(chunk.count(b"\n", 0, 1 << 16), 1)
+    low, high = start, min(len(chunk), start + int(count * average * 1.25) + 256)
+    if chunk.count(b"\n", low, high) < count:
+        high = len(chunk)
+    while high - low > 512:
+        middle = (low + high) // 2
+        found = chunk.count(b"\n", low, middle)
+        if found >= count:
+            high = middle
+        else:
+            count -= found
+            low = middle
+    position = low - 1
+    for _ in range(count):
+        position = chunk.find(b"\n", position + 1)
+    return position
+
+
+def _iter_aligned(chunk: bytes, newline: bytes, start: int = 0):
+    unit = len(newline)
+    position = chunk.find(newline, start)
+    while position >= 0:
+        if position % unit == 0:
+            yield position
+            position = chunk.find(newline, position + unit)
+        else:
+            position = chunk.find(newline, position + 1)
+
+
+def build_line_index(
+    path: Path, encoding: TextEncoding, *, stride: int = LINE_INDEX_STRIDE, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> LineIndex:
+    """Scan *path* once and return its sparse line index."""
+
+    newline = _newline(encoding)
+    unit = len(newline)
+    chunk_size -= chunk_size % unit  # keep multi-byte newlines inside one chunk
+    stat = os.stat(path)
+    offsets = [len(encoding.bom)]
+    line = 1  # number of the line that starts at the current position
+    base = len(encoding.bom)
+    last_byte = b""
+    with open(path, "rb") as handle:
+        handle.seek(base)
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            if unit == 1:
+                total = chunk.count(b"\n")
+                position = 0
+                while line + total >= len(offsets) * stride + 1:
+                    needed = len(offsets) * stride + 1 - line
+                    found = _nth_newline(chunk, position, needed)
+                    offsets.append(base + found + 1)
+                    line += needed
+                    total -= needed
+                    position = found + 1
+                line += total
+            else:
+                for found in _iter_aligned(chunk, newline):
+                    line += 1
+                    if line == len(offsets) * stride + 1:
+                        offsets.append(base + found + unit)
+            base += len(chunk)
+            last_byte = chunk[-unit:]
+    lines = line if last_byte and last_byte != newline else line - 1
+    if offsets[-1] >= stat.st_size and len(offsets) > 1:
+        offsets.pop()  # an index entry for the empty line after the final newline
+    return LineIndex(stat.st_size, stat.st_mtime_ns, encoding.codec, stride, offsets, max(lines, 0))
+
+
+def load_line_index(
+    path: Path, encoding: TextEncoding, *, stride: int = LINE_INDEX_STRIDE
+) -> LineIndex:
+    """Return the cached index of *path*, rebuilding it if the file changed."""
+
+    stat = os.stat(path)
+    cache = index_path(path)
+    try:
+        raw = json.loads(cache.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        raw = None
+    if (
+        isinstance(raw, dict)
+        and raw.get("version") == LINE_INDEX_VERSION
+        and raw.get("size") == stat.st_size
+        and raw.get("mtime_ns") == stat.st_mtime_ns
+        and raw.get("codec") == encoding.codec
+        and raw.get("stride") == stride
+    ):
+        return LineIndex(
+            raw["size"], raw["mtime_ns"], raw["codec"], raw["stride"], raw["offsets"], raw["lines"]
+        )
+    index = build_line_index(path, encoding, stride=stride)
+    save_line_index(path, index)
+    return index
+
+
+def save_line_index(path: Path, index: LineIndex) -> None:
+    with suppress(OSError):  # read-only directory: the index is only a cache
+        with atomic_write(index_path(path)) as handle:
+            handle.write(json.dumps(index.to_json(), separators=(",", ":")).encode("utf-8"))
+
+
+def _line_offset(handle: BinaryIO, index: LineIndex, encoding: TextEncoding, number: int) -> int:
+    """Byte offset where line *number* starts (the file size past the last line)."""
+
+    if number > index.lines:
+        return index.size
+    slot = min((number - 1) // index.stride, len(index.offsets) - 1)
+    position = index.offsets[slot]
+    remaining = number - 1 - slot * index.stride
+    newline = _newline(encoding)
+    unit = len(newline)
+    handle.seek(position)
+    while remaining:
+        chunk = handle.read(DEFAULT_CHUNK_SIZE - DEFAULT_CHUNK_SIZE % unit)
+        if not chunk:
+            return index.size
+        if unit == 1:
+            total = chunk.count(b"\n")
+            if total < remaining:
+                remaining -= total
+                position += len(chunk)
+                continue
+            return position + _nth_newline(chunk, 0, remaining) + 1
+        for found in _iter_aligned(chunk, newline):
+            remaining -= 1
+            if not remaining:
+                return position + found + unit
+        position += len(chunk)
+    return position
+
+
+def line_span(path: Path, index: LineIndex, encoding: TextEncoding, lines: LineRange) -> Tuple[int, int]:
+    """Return the ``[start, end)`` byte span covering *lines*."""
+
+    with open(path, "rb") as handle:
+        start = _line_offset(handle, index, encoding, lines.start)
+        end = index.size if lines.end is None else _line_offset(handle, index, encoding, lines.end + 1)
+    return start, end
+
+
+def _iter_span_text(
+    handle: BinaryIO,
+    start: int,
+    end: int,
+    encoding: TextEncoding,
+    transformer: ChunkTransformer,
+    chunk_size: int,
+) -> Iterator[str]:
+    decoder = codecs.getincrementaldecoder(encoding.codec)(encoding.errors)
+    handle.seek(start)
+    remaining = end - start
+    while True:
+        data = handle.read(min(chunk_size, remaining)) if remaining else b""
+        remaining -= len(data)
+        text = decoder.decode(data, final=not data)
+        if text:
+            yield transformer.feed(text)
+        if not data:
+            break
+    yield transformer.finish()
+
+
+def convert_line_range(
+    path: Path,
+    encoding: TextEncoding,
+    lines: LineRange,
+    transformer: ChunkTransformer,
+    *,
+    in_place: bool,
+    stdout: Optional[TextIO] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> RangeResult:
+    """Convert *lines* of *path*; splice them back in place or print them.
+
+    *transformer* must keep trailing newlines, since the converted span is
+    put back between other lines.
+    """
+
+    path = Path(path)
+    index = load_line_index(path, encoding)
+    start, end = line_span(path, index, encoding, lines)
+
+    if not in_place:
+        with open(path, "rb") as handle:
+            for piece in _iter_span_text(handle, start, end, encoding, transformer, chunk_size):
+                stdout.write(piece)
+        return RangeResult(start, end, False)
+
+    encoder = codecs.getincrementalencoder(encoding.codec)(encoding.errors)
+    with tempfile.SpooledTemporaryFile(RANGE_SPOOL_BYTES) as spool:
+        with open(path, "rb") as handle:
+            for piece in _iter_span_text(handle, start, end, encoding, transformer, chunk_size):
+                spool.write(encoder.encode(piece))
+        spool.write(encoder.encode("", final=True))
+        length = spool.tell()
+        spool.seek(0)
+        spliced = length == end - start
+        if spliced:
+            # Same byte length: overwrite just the span; nothing else moves.
+            with open(path, "r+b") as target:
+                target.seek(start)
+                shutil.copyfileobj(spool, target, chunk_size)
+        else:
+            # The replace must happen after the source is closed (Windows).
+            with atomic_write(path) as sink:
+                with open(path, "rb") as handle:
+                    _copy_bytes(handle, sink, 0, start)
+                    shutil.copyfileobj(spool, sink, chunk_size)
+                    _copy_bytes(handle, sink, end, index.size - end)
+    _refresh_index(path, index, start, end, length - (end - start))
+    return RangeResult(start, end, spliced)
+
+
+def _copy_bytes(handle: BinaryIO, sink: BinaryIO, start: int, length: int) -> None:
+    handle.seek(start)
+    remaining = length
+    while remaining > 0:
+        data = handle.read(min(DEFAULT_CHUNK_SIZE, remaining))
+        if not data:
+            break
+        sink.write(data)
+        remaining -= len(data)
+
+
+def _refresh_index(path: Path, index: LineIndex, start: int, end: int, delta: int) -> None:
+    """Re-key *index* to the rewritten file, shifting offsets after the range."""
+
+    if delta and any(start < offset < end for offset in index.offsets):
+        # Line starts inside the range moved by unknown amounts: rebuild later.
+        with suppress(OSError):
+            index_path(path).unlink()
+        return
+    stat = os.stat(path)
+    index.offsets = [offset + delta if offset >= end else offset for offset in index.offsets]
+    index.size = stat.st_size
+    index.mtime_ns = stat.st_mtime_ns
+    save_line_index(path, index)
+
+
+__all__ = [
+    "LINE_INDEX_STRIDE",
+    "LineIndex",
+    "LineRange",
+    "RangeResult",
+    "build_line_index",
+    "convert_line_range",
+    "index_path",
+    "line_span",
+    "load_line_index",
+    "parse_line_range",
+]
@@ -0,0 +1,259 @@
+"""Language-specific casing on top of Python's locale-independent ``str`` methods.
+
+``str.upper``/``lower``/``title`` implement the Unicode default case mappings,
+which are wrong for a few languages:
+
+- ``tr``/``az``: dotted and dotless i pair up as ``i``/``İ`` and ``ı``/``I``;
+- ``el``: capitals drop the tonos (``ά`` -> ``Α``, a dialytika is added where
+  the accent marked a hiatus) and a lower-case sentence keeps its final ``ς``;
+- ``nl``: ``ij`` is one letter, so a capitalised word starts with ``IJ``;
+- ``de``: ``ß`` upper-cases to ``ẞ``, so the spelling survives a round trip.
+
+Each locale is a set of character tables built once at import and applied
+right before the ``str`` method. Text that none of the tables touch (for
+most locales, any ASCII text) goes straight to the ``str`` method.
+
+Optional NFC/NFKC normalisation runs in the same streaming pass through
+:class:`NormalizingTransformer`, which holds back a trailing combining
+sequence so a chunk boundary never separates a base letter from its marks.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from .streaming import ChunkTransformer
+
+SUPPORTED_LOCALES = ("az", "de", "el", "nl", "tr")
+NORMALIZATION_FORMS = ("NFC", "NFKC")
+
+_LETTER = r"[^\W\d_]"
+_FINAL_SIGMA = re.compile(rf"(?<={_LETTER})σ(?!{_LETTER})")
+# Accent-stripping capitals keep the hiatus an accent marked: "μάιος" -> "ΜΑΪΟΣ".
+_GREEK_HIATUS = [
+    (accented + vowel, accented + marked)
+    for accented in "ΆάΈέΌόΎύ"
+    for vowel, marked in {"ι": "ϊ", "υ": "ϋ", "Ι": "Ϊ", "Υ": "Ϋ"}.items()
+]
+# The conjunction "ή" keeps its accent in capitals to stay distinct from "η".
+# The literal comes first so the regex engine can skip ahead to it.
+_GREEK_OR = re.compile(rf"ή(?<!{_LETTER}ή)(?!{_LETTER})")
+_GREEK_OR_MARK = "\ue000"  # private use: passes through the tables and upper()
+_GREEK_KEPT_MARKS = {"̈"}  # dialytika
+
+
+def _mapper(table: Dict[int, str]) -> Callable[[str], str]:
+    """A fast ``str.translate(table)``.
+
+    ``str.translate`` looks every character up in the dict. Common characters
+    (below U+1F00) are replaced with ``str.replace`` instead, which only
+    touches the characters that change; the rest share one regex.
+    """
+
+    pairs = [(chr(code), value) for code, value in sorted(table.items()) if code < 0x1F00]
+    rare = {chr(code): value for code, value in table.items() if code >= 0x1F00}
+    pattern = re.compile("[" + re.escape("".join(rare)) + "]") if rare else None
+
+    def translate(text: str) -> str:
+        for char, value in pairs:
+            if char in text:
+                text = text.replace(char, value)
+        if pattern is not None:
+            text = pattern.sub(lambda match: rare[match.group()], text)
+        return text
+
+    return translate
+
+
+def _greek_upper_table() -> Dict[int, str]:
+    table: Dict[int, str] = {}
+    for code in list(range(0x0370, 0x0400)) + list(range(0x1F00, 0x2000)):
+        char = chr(code)
+        if unicodedata.category(char)[0] != "L":
+            continue
+        upper = char.upper()
+        marks = unicodedata.normalize("NFD", upper)
+        stripped = "".join(
+            mark for mark in marks if not unicodedata.combining(mark) or mark in _GREEK_KEPT_MARKS
+        )
+        stripped = unicodedata.normalize("NFC", stripped)
+        if stripped != upper:
+            table[code] = stripped
+    return table
+
+
+class LocaleCasing:
+    """Upper, lower and title casing for one language (or the default rules)."""
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        upper_map: Optional[Dict[int, str]] = None,
+        lower_map: Optional[Dict[int, str]] = None,
+        title_map: Optional[Dict[int, str]] = None,
+        capital_map: Optional[Dict[int, str]] = None,
+        digraphs: Tuple[str, ...] = (),
+        final_sigma: bool = False,
+        english_pronoun: bool = False,
+        normalize: Optional[str] = None,
+    ) -> None:
+        self.name = name
+        self.digraphs = digraphs
+        self.final_sigma = final_sigma
+        self.english_pronoun = english_pronoun
+        self.normalize = normalize
+        upper_map = upper_map or {}
+        capital_map = upper_map if capital_map is None else capital_map
+        tables = [upper_map, lower_map or {}, title_map or {}, capital_map]
+        self._upper, self._lower, self._title, self._capital = [
+            _mapper(table) if table else None for table in tables
+        ]
+        # True when ASCII text is cased exactly like str does it.
+        self.ascii_plain = not digraphs and not any(code < 128 for table in tables for code in table)
+        # ASCII letters that capitalise differently (Turkish "i", Dutch "ij").
+        self.ascii_special = "".join(
+            sorted({chr(code) for code in capital_map if code < 128} | {d[0] for d in digraphs})
+        )
+
+    def with_normalization(self, form: Optional[str]) -> "LocaleCasing":
+        if form == self.normalize:
+            return self
+        copy = LocaleCasing.__new__(LocaleCasing)
+        copy.__dict__.update(self.__dict__, normalize=form)
+        return copy
+
+    def normalized(self, text: str) -> str:
+        if self.normalize is None or text.isascii() or unicodedata.is_normalized(self.normalize, text):
+            return text
+        return unicodedata.normalize(self.normalize, text)
+
+    def upper(self, text: str) -> str:
+        if self._upper and not (self.ascii_plain and text.isascii()):
+            if self.name == "el":
+                for pair, marked in _GREEK_HIATUS:
+                    if pair in text:
+                        text = text.replace(pair, marked)
+                if "ή" in text and _GREEK_OR_MARK not in text:
+                    text = self._upper(_GREEK_OR.sub(_GREEK_OR_MARK, text))
+                    return text.upper().replace(_GREEK_OR_MARK, "Ή")
+            text = self._upper(text)
+        return text.upper()
+
+    def capital(self, text: str) -> str:
+        """Upper-case *text* as a capital inside mixed-case text (Greek keeps its accents)."""
+
+        if self._capital and not (self.ascii_plain and text.isascii()):
+            text = self._capital(text)
+        return text.upper()
+
+    def lower(self, text: str) -> str:
+        if self._lower and not (self.ascii_plain and text.isascii()):
+            text = self._lower(text)
+        return text.lower()
+
+    def lower_chars(self, text: str) -> str:
+        """Lower-case *text* character by character (no final-sigma context)."""
+
+        if "Σ" in text:
+            text = text.replace("Σ", "σ")
+        return self.lower(text)
+
+    def title(self, text: str) -> str:
+        if self._title and not (self.ascii_plain and text.isascii()):
+            # tr/az: every i becomes İ first; title() keeps it at word starts
+            # and lower-cases the rest to "i̇", which is folded back to "i".
+            return self._title(text).title().replace("i̇", "i")
+        titled = text.title()
+        for digraph in self.digraphs:
+            titled = titled.replace(digraph.title(), digraph.upper())
+        return titled
+
+    def fix_final_sigma(self, text: str, before: str, after: str) -> str:
+        """Turn word-final ``σ`` into ``ς``; *before*/*after* give one character of context."""
+
+        if not self.final_sigma or "σ" not in text:
+            return text
+        window = before[-1:] + text + after[:1]
+        fixed = _FINAL_SIGMA.sub("ς", window)
+        return fixed[len(before[-1:]) : len(fixed) - len(after[:1])]
+
+    def __repr__(self) -> str:
+        return f"LocaleCasing({self.name!r}, normalize={self.normalize!r})"
+
+
+_TURKIC = {
+    "upper_map": {ord("i"): "İ"},
+    "lower_map": {ord("I"): "ı", ord("İ"): "i"},
+    "title_map": {ord("I"): "ı", ord("i"): "İ"},
+}
+
+_LOCALES: Dict[str, LocaleCasing] = {
+    "az": LocaleCasing("az", **_TURKIC),
+    "de": LocaleCasing("de", upper_map={ord("ß"): "ẞ"}),
+    "el": LocaleCasing("el", upper_map=_greek_upper_table(), capital_map={}, final_sigma=True),
+    "nl": LocaleCasing("nl", digraphs=("ij",)),
+    "tr": LocaleCasing("tr", **_TURKIC),
+}
+ROOT_CASING = LocaleCasing("root", english_pronoun=True)
+
+
+@lru_cache(maxsize=None)
+def get_casing(locale: Optional[str] = None, normalize: Optional[str] = None) -> LocaleCasing:
+    """Return the casing rules for *locale* (``None`` for the default rules)."""
+
+    if normalize is not None and normalize not in NORMALIZATION_FORMS:
+        raise ValueError(f"unsupported normalization form {normalize!r}")
+    if locale is None:
+        casing = ROOT_CASING
+    else:
+        language = locale.replace("_", "-").split("-")[0].lower()
+        try:
+            casing = _LOCALES[language]
+        except KeyError as exc:
+            raise ValueError(
+                f"no casing rules for locale {locale!r} (supported: {', '.join(SUPPORTED_LOCALES)})"
+            ) from exc
+    return casing.with_normalization(normalize)
+
+
+def _combines_backwards(char: str) -> bool:
+    # Combining marks and Hangul medial/final jamo attach to the preceding character.
+    return bool(unicodedata.combining(char)) or "ᅠ" <= char <= "ᇿ"
+
+
+class NormalizingTransformer:
+    """Normalise chunks before handing them to *inner*."""
+
+    def __init__(self, inner: ChunkTransformer, casing: LocaleCasing) -> None:
+        self._inner = inner
+        self._casing = casing
+        self._hold = ""
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        buffer = self._hold + chunk
+        cut = len(buffer) - 1
+        while cut > 0 and _combines_backwards(buffer[cut]):
+            cut -= 1
+        text, self._hold = buffer[:cut], buffer[cut:]
+        return self._inner.feed(self._casing.normalized(text)) if text else ""
+
+    def finish(self) -> str:
+        hold, self._hold = self._hold, ""
+        output = self._inner.feed(self._casing.normalized(hold)) if hold else ""
+        return output + self._inner.finish()
+
+
+__all__ = [
+    "LocaleCasing",
+    "NORMALIZATION_FORMS",
+    "NormalizingTransformer",
+    "ROOT_CASING",
+    "SUPPORTED_LOCALES",
+    "get_casing",
+]
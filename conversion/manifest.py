@@ -0,0 +1,234 @@
+"""Incremental directory conversion backed by a change manifest.
+
+The manifest is a small JSON file recording, for every converted file, its
+size, ``st_mtime_ns``, a content hash and the mode that was applied. A repeat
+run over the same tree only needs a ``stat`` per file: if size and mtime still
+match the entry and the mode is the same, the file is skipped unread. When the
+metadata changed the file is hashed, and only rewritten if the content
+differs from what the manifest recorded (or the mode changed).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from .lineindex import LINE_INDEX_SUFFIX
+from .streaming import DEFAULT_CHUNK_SIZE, ChunkTransformer
+from .textio import atomic_write, convert_in_place, sniff_file
+
+MANIFEST_NAME = ".casemonster-manifest.json"
+MANIFEST_VERSION = 1
+
+
+class ManifestEntry(NamedTuple):
+    size: int
+    mtime_ns: int
+    digest: str
+    mode: str
+
+
+class BatchReport(NamedTuple):
+    """Outcome of :func:`convert_tree`, as lists of paths relative to the root."""
+
+    converted: List[str]
+    unchanged: List[str]
+    skipped: List[str]
+    failed: Dict[str, str]
+    pruned: List[str]
+
+    def summary(self) -> str:
+        parts = [
+            f"{len(self.converted)} converted",
+            f"{len(self.unchanged)} unchanged",
+        ]
+        if self.skipped:
+            parts.append(f"{len(self.skipped)} skipped")
+        if self.failed:
+            parts.append(f"{len(self.failed)} failed")
+        if self.pruned:
+            parts.append(f"{len(self.pruned)} pruned")
+        return ", ".join(parts)
+
+
+def file_digest(path: Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """Return the content hash of *path*, read in bounded chunks."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """Mapping of relative POSIX paths to :class:`ManifestEntry` records."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path: Path) -> "Manifest":
+        manifest = cls(path)
+        try:
+            raw = json.loads(manifest.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return manifest
+        except (OSError, ValueError):
+            # A damaged manifest only costs one full run; start afresh.
+            manifest.dirty = True
+            return manifest
+        if raw.get("version") != MANIFEST_VERSION:
+            manifest.dirty = True
+            return manifest
+        for name, fields in (raw.get("files") or {}).items():
+            try:
+                manifest.entries[name] = ManifestEntry(*fields)
+            except TypeError:
+                manifest.dirty = True
+        return manifest
+
+    def get(self, name: str) -> Optional[ManifestEntry]:
+        return self.entries.get(name)
+
+    def set(self, name: str, entry: ManifestEntry) -> None:
+        if self.entries.get(name) != entry:
+            self.entries[name] = entry
+            self.dirty = True
+
+    def discard(self, name: str) -> None:
+        if self.entries.pop(name, None) is not None:
+            self.dirty = True
+
+    def save(self) -> None:
+        """Write the manifest atomically if anything changed."""
+
+        if not self.dirty:
+            return
+        payload = {
+            "version": MANIFEST_VERSION,
+            "files": {name: list(entry) for name, entry in sorted(self.entries.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with atomic_write(self.path) as handle:
+            handle.write(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        self.dirty = False
+
+
+def is_artifact(name: str) -> bool:
+    """Whether *name* is one of caseMonster's own manifests or line indexes."""
+
+    return name == MANIFEST_NAME or name.endswith(LINE_INDEX_SUFFIX)
+
+
+def is_hidden_name(name: str) -> bool:
+    """Whether a file or directory called *name* is hidden (``.git``, ``.env``).
+
+    Directory conversion and watch mode both leave hidden entries alone.
+    """
+
+    return name.startswith(".") and name not in (".", "..")
+
+
+def iter_tree(root: Path, *, exclude: Optional[Path] = None) -> Iterator[Path]:
+    """Yield regular files below *root* in a stable order, skipping *exclude*.
+
+    Hidden files and directories (``.gitignore``, ``.git``, ``.venv``, ...)
+    are left out, as are caseMonster's own manifests and line indexes.
+    """
+
+    excluded = os.path.abspath(exclude) if exclude is not None else None
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = sorted(name for name in subdirs if not is_hidden_name(name))
+        for name in sorted(files):
+            if is_hidden_name(name) or is_artifact(name):
+                continue
+            path = os.path.join(directory, name)
+            if excluded is None or os.path.abspath(path) != excluded:
+                yield Path(path)
+
+
+def convert_tree(
+    root: Path,
+    mode: str,
+    make_transformer: Callable[[str], ChunkTransformer],
+    *,
+    manifest_path: Optional[Path] = None,
+    prune: bool = False,
+) -> BatchReport:
+    """Convert every text file below *root* in place, skipping unchanged ones.
+
+    ``make_transformer(mode)`` supplies a fresh streaming transformer per
+    file; files keep their encoding (see :mod:`conversion.textio`). Binary
+    files are left alone and reported as skipped. With *prune*, entries for files that no longer exist
+    are dropped from the manifest.
+    """
+
+    root = Path(root)
+    manifest = Manifest.load(Path(manifest_path) if manifest_path else root / MANIFEST_NAME)
+    report = BatchReport([], [], [], {}, [])
+    seen = set()
+
+    for path in iter_tree(root, exclude=manifest.path):
+        name = path.relative_to(root).as_posix()
+        seen.add(name)
+        try:
+            stat = path.stat()
+            entry = manifest.get(name)
+            if (
+                entry is not None
+                and entry.mode == mode
+                and entry.size == stat.st_size
+                and entry.mtime_ns == stat.st_mtime_ns
+            ):
+                report.unchanged.append(name)
+                continue
+
+            digest = file_digest(path)
+            if entry is not None and entry.mode == mode and entry.digest == digest:
+                # Touched but identical: refresh the metadata, keep the file.
+                manifest.set(name, ManifestEntry(stat.st_size, stat.st_mtime_ns, digest, mode))
+                report.unchanged.append(name)
+                continue
+            encoding = sniff_file(path)
+            if encoding is None:
+                # Remembered like a converted file so later runs skip it unread.
+                manifest.set(name, ManifestEntry(stat.st_size, stat.st_mtime_ns, digest, mode))
+                report.skipped.append(name)
+                continue
+
+            if convert_in_place(path, make_transformer(mode), encoding=encoding):
+                stat = path.stat()
+                digest = file_digest(path)
+                report.converted.append(name)
+            else:
+                report.unchanged.append(name)
+            manifest.set(name, ManifestEntry(stat.st_size, stat.st_mtime_ns, digest, mode))
+        except (OSError, UnicodeDecodeError) as exc:
+            # UTF-16/32 is decoded strictly, so a truncated file fails here.
+            report.failed[name] = f"{type(exc).__name__}: {exc}"
+
+    if prune:
+        for name in [name for name in manifest.entries if name not in seen]:
+            manifest.discard(name)
+            report.pruned.append(name)
+    manifest.save()
+    return report
+
+
+__all__ = [
+    "BatchReport",
+    "MANIFEST_NAME",
+    "Manifest",
+    "ManifestEntry",
+    "file_digest",
+    "convert_tree",
+    "is_artifact",
+    "is_hidden_name",
+    "iter_tree",
+]
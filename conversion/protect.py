@@ -0,0 +1,196 @@
+"""Keep URLs, e-mail addresses, file paths and code out of a conversion.
+
+Protected spans are found with one compiled alternation. Each span is
+replaced by a single marker character, the whole masked text is converted
+in one call, and the original spans are put back where the markers come out.
+Converting the masked text (rather than each gap on its own) keeps sentence
+state across a span: in "see http://example.com. next step" the "n" still
+starts a sentence. Sentence mode also treats a span at the start of a
+sentence as the sentence's first word and leaves what follows it alone.
+
+The marker, U+A66E CYRILLIC LETTER MULTIOCULAR O, is a letter without case,
+so every transform passes it through unchanged. A marker already in the
+input is protected like any other span.
+
+Only kinds whose trigger characters occur ("://", "@", "/", a backtick, ...)
+are looked for, and only in the white-space delimited token around each
+trigger. Text with none of them costs a few substring searches and no
+regular expression at all.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Deque, List, Optional, Pattern, Tuple
+
+from .streaming import MAX_WORD_CARRY, ChunkTransformer
+
+PROTECTED_KINDS = ("code", "url", "email", "path")
+MARK = "ꙮ"
+
+_TAIL = r"[^\s<>\"'`.,;:!?)\]}]"  # a span does not end in sentence punctuation
+# (trigger substrings, pattern); code is found first, so a URL inside code
+# stays part of the code span, and the others are tried in this order.
+_KINDS = {
+    "code": (("`",), r"```[\s\S]*?```|`[^`\n]+`"),
+    "url": (
+        ("://", "www."),
+        rf"(?<![\w.+-])(?:[A-Za-z][\w+.-]*://|www\.)[^\s<>\"'`]*{_TAIL}",
+    ),
+    "email": (("@",), r"(?<![\w.+-])[\w.+-]+@[\w-]+(?:\.[\w-]+)+"),
+    "path": (
+        ("/", "\\"),
+        rf"(?<![\w/\\])(?:[A-Za-z]:\\|\\\\)[^\s<>\"'`|]*{_TAIL}"
+        r"|(?<![\w/.~])(?:(?:~|\.\.?)(?:/[\w.-]+)+|(?:/[\w.-]+){2,})/?"
+        # a relative path needs a file extension: "docs/setup.md", not "and/or"
+        r"|(?<![\w/.~-])[\w.-]*\w(?:/[\w.-]+)*/[\w-]+\.[A-Za-z]\w*",
+    ),
+}
+
+
+_CODE = re.compile(_KINDS["code"][1])
+_WHITESPACE = re.compile(r"\s")
+_SPACES = " \t\n\r\f\v"
+
+
+@lru_cache(maxsize=32)
+def _compile(kinds: Tuple[str, ...]) -> Tuple[Pattern[str], Pattern[str]]:
+    """(trigger finder, span pattern) for the token kinds in *kinds*."""
+
+    triggers = sorted({trigger for kind in kinds for trigger in _KINDS[kind][0]} | {MARK})
+    alternatives = [_KINDS[kind][1] for kind in kinds] + [re.escape(MARK)]
+    return (
+        re.compile("|".join(map(re.escape, triggers))),
+        re.compile("|".join(f"(?:{pattern})" for pattern in alternatives)),
+    )
+
+
+def protected_spans(text: str) -> List[Tuple[int, int]]:
+    """Return the ``(start, end)`` offsets of the protected spans in *text*."""
+
+    kinds = tuple(
+        kind for kind in PROTECTED_KINDS[1:] if any(trigger in text for trigger in _KINDS[kind][0])
+    )
+    code = [match.span() for match in _CODE.finditer(text)] if "`" in text else []
+    if not kinds and MARK not in text:
+        return code
+    # Apart from code, a span never contains white space: each trigger only
+    # needs its own token searched, not every position of the text.
+    finder, pattern = _compile(kinds)
+    spans: List[Tuple[int, int]] = []
+    blocks = iter(code + [(len(text) + 1, len(text) + 1)])
+    block = next(blocks)
+    done = 0
+    for hit in finder.finditer(text):
+        position = hit.start()
+        if position < done:
+            continue
+        while block[1] <= position:
+            spans.append(block)
+            block = next(blocks)
+        if block[0] <= position:
+            done = block[1]
+            continue
+        start = max(text.rfind(space, done, position) for space in _SPACES) + 1
+        start = max(start, done)
+        boundary = _WHITESPACE.search(text, hit.end())
+        end = min(boundary.start() if boundary else len(text), block[0])
+        spans.extend(match.span() for match in pattern.finditer(text, start, end))
+        done = end
+    spans.append(block)
+    spans.extend(blocks)
+    return spans[:-1]
+
+
+def _mask(text: str) -> Tuple[str, List[str]]:
+    spans = protected_spans(text)
+    if not spans:
+        return text, []
+    pieces = []
+    previous = 0
+    for start, end in spans:
+        pieces.append(text[previous:start])
+        previous = end
+    pieces.append(text[previous:])
+    return MARK.join(pieces), [text[start:end] for start, end in spans]
+
+
+def _unmask(text: str, spans: List[str]) -> str:
+    pieces = text.split(MARK)
+    if len(pieces) != len(spans) + 1:
+        raise ValueError("the transform did not keep the protected-span markers")
+    merged = [""] * (2 * len(spans) + 1)
+    merged[0::2] = pieces
+    merged[1::2] = spans
+    return "".join(merged)
+
+
+def convert_protected(text: str, transform: Callable[[str], str]) -> str:
+    """Apply *transform* to *text* except for its protected spans."""
+
+    masked, spans = _mask(text)
+    if not spans:
+        return transform(text)
+    return _unmask(transform(masked), spans)
+
+
+def _safe_cut(buffer: str) -> int:
+    """Where *buffer* can be cut without splitting a span that may continue."""
+
+    cut = buffer.rfind("\n") + 1
+    fence = buffer.rfind("```", 0, cut)
+    if fence >= 0 and buffer.count("```", 0, fence) % 2 == 0:
+        cut = fence  # an unclosed code block: wait for the rest of it
+    if cut <= 0 and len(buffer) > MAX_WORD_CARRY:
+        cut = len(buffer)
+    return max(cut, 0)
+
+
+class ProtectingTransformer:
+    """Mask protected spans before *inner* and restore them in its output.
+
+    Input is masked up to the last line break (spans never cross one, except
+    code blocks, which are held back until they close); the original spans
+    wait in a queue until their markers come out of *inner*.
+    """
+
+    def __init__(self, inner: ChunkTransformer) -> None:
+        self._inner = inner
+        self._carry = ""
+        self._spans: Deque[str] = deque()
+
+    def feed(self, chunk: str) -> str:
+        buffer = self._carry + chunk
+        cut = _safe_cut(buffer)
+        self._carry = buffer[cut:]
+        return self._restore(self._inner.feed(self._masked(buffer[:cut])))
+
+    def finish(self) -> str:
+        carry, self._carry = self._carry, ""
+        output = self._inner.feed(self._masked(carry)) + self._inner.finish()
+        return self._restore(output)
+
+    def _masked(self, text: str) -> str:
+        masked, spans = _mask(text)
+        self._spans.extend(spans)
+        return masked
+
+    def _restore(self, output: str) -> str:
+        if MARK not in output:
+            return output
+        pieces = output.split(MARK)
+        merged = [pieces[0]]
+        for piece in pieces[1:]:
+            merged += [self._spans.popleft(), piece]
+        return "".join(merged)
+
+
+__all__ = [
+    "MARK",
+    "PROTECTED_KINDS",
+    "ProtectingTransformer",
+    "convert_protected",
+    "protected_spans",
+]
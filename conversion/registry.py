@@ -0,0 +1,239 @@
+"""Registry of conversion modes, including plugins found through entry points.
+
+Every mode is described by a :class:`TransformSpec`: its name, the labels the
+GUI, tray and Explorer menu show, and the transform itself, either as a
+callable or as a ``"module:attribute"`` reference that is imported the
+first time the mode is used. Third-party packages add modes by declaring
+entry points in the ``casemonster.transforms`` group::
+
+    [project.entry-points."casemonster.transforms"]
+    rot13 = "casemonster_rot13:rot13"
+
+Plugins are registered from the installed metadata alone; their modules are
+imported only when a plugin mode is first converted with. The entry points
+themselves are read once, the first time the full list of modes is needed,
+so importing :mod:`main` does not scan the installed packages at all.
+
+A plugin may also point at an object with a ``stream_transformer``
+attribute, a factory of incremental transformers; otherwise its output is
+streamed word by word. Built-in names take precedence over plugins.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    MutableMapping,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+ENTRY_POINT_GROUP = "casemonster.transforms"
+# Where a mode's button goes in the GUI; see :meth:`TransformRegistry.categories`.
+CATEGORIES = ("case", "identifier", "plugin", "rule")
+
+Transform = Callable[[str], str]
+Target = Union[Transform, str]
+
+
+class TransformSpec(NamedTuple):
+    name: str
+    target: Target
+    label: str
+    title: str
+    description: str
+    category: str = "plugin"
+    stream: Optional[Callable[..., Any]] = None
+
+
+def _resolve(reference: str) -> Any:
+    """Import ``"package.module:attribute.path"`` like ``EntryPoint.load``."""
+
+    module_name, _, attributes = reference.partition(":")
+    target: Any = importlib.import_module(module_name.strip())
+    for attribute in filter(None, attributes.strip().split(".")):
+        target = getattr(target, attribute)
+    return target
+
+
+def _entry_points(group: str) -> Iterable[Any]:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:  # pragma: no cover - Python < 3.8
+        return ()
+    found = entry_points()
+    if hasattr(found, "select"):
+        return found.select(group=group)
+    return found.get(group, ())  # pragma: no cover - Python < 3.10
+
+
+class TransformRegistry(MutableMapping[str, Transform]):
+    """Conversion modes by name; looking one up imports it if needed.
+
+    Iteration, ``len`` and ``in`` see plugins too (reading the entry points
+    on first use), but only item access imports anything.
+    """
+
+    def __init__(self, group: Optional[str] = ENTRY_POINT_GROUP) -> None:
+        self._group = group
+        self._specs: Dict[str, TransformSpec] = {}
+        self._loaded: Dict[str, Tuple[Transform, Optional[Callable[..., Any]]]] = {}
+        self._discovered = group is None
+        self.errors: Dict[str, str] = {}
+
+    def register(
+        self,
+        name: str,
+        target: Target,
+        *,
+        label: Optional[str] = None,
+        title: Optional[str] = None,
+        description: Optional[str] = None,
+        category: str = "plugin",
+        stream: Optional[Callable[..., Any]] = None,
+    ) -> TransformSpec:
+        """Add (or replace) mode *name*; a string *target* is imported lazily."""
+
+        if category not in CATEGORIES:
+            raise ValueError(f"unknown category {category!r}")
+        spec = TransformSpec(
+            name,
+            target,
+            label or name,
+            title or label or name,
+            description or f"Convert with {title or label or name}",
+            category,
+            stream,
+        )
+        self._specs[name] = spec
+        self._loaded.pop(name, None)
+        return spec
+
+    def unregister(self, name: str) -> None:
+        self._specs.pop(name, None)
+        self._loaded.pop(name, None)
+
+    def discover(self) -> List[str]:
+        """Register the entry points of the plugin group; return the new modes."""
+
+        self._discovered = True
+        added = []
+        for entry_point in _entry_points(self._group or ""):
+            if entry_point.name in self._specs:
+                continue  # a built-in or an earlier plugin wins
+            self.register(entry_point.name, entry_point.value)
+            added.append(entry_point.name)
+        return added
+
+    def spec(self, name: str) -> TransformSpec:
+        self._ensure_discovered()
+        return self._specs[name]
+
+    def specs(self, category: Optional[str] = None) -> List[TransformSpec]:
+        """Every registered mode (or those of one *category*), in registration order."""
+
+        self._ensure_discovered()
+        return [spec for spec in self._specs.values() if category in (None, spec.category)]
+
+    def categories(self) -> List[Tuple[str, List[TransformSpec]]]:
+        """The non-empty categories and their modes, in :data:`CATEGORIES` order."""
+
+        specs = self.specs()
+        grouped = [(category, [s for s in specs if s.category == category]) for category in CATEGORIES]
+        return [(category, members) for category, members in grouped if members]
+
+    def without(self, category: str) -> Mapping[str, Transform]:
+        """A live view of the modes outside *category*."""
+
+        return _RegistryView(self, category)
+
+    def stream_factory(self, name: str) -> Optional[Callable[..., Any]]:
+        """The incremental transformer factory of *name*, if it has one."""
+
+        self[name]
+        return self._loaded[name][1]
+
+    def _ensure_discovered(self) -> None:
+        if not self._discovered:
+            self.discover()
+
+    def _load(self, spec: TransformSpec) -> Tuple[Transform, Optional[Callable[..., Any]]]:
+        target = spec.target
+        stream = spec.stream
+        if isinstance(target, str):
+            try:
+                target = _resolve(target)
+            except Exception as exc:
+                self.errors[spec.name] = f"{type(exc).__name__}: {exc}"
+                raise ValueError(f"mode {spec.name!r} could not be loaded: {exc}") from exc
+            stream = stream or getattr(target, "stream_transformer", None)
+        if not callable(target):
+            raise ValueError(f"mode {spec.name!r} is not callable: {spec.target!r}")
+        return target, stream
+
+    def __getitem__(self, name: str) -> Transform:
+        loaded = self._loaded.get(name)
+        if loaded is None:
+            if name not in self._specs:
+                self._ensure_discovered()
+            loaded = self._loaded[name] = self._load(self._specs[name])
+        return loaded[0]
+
+    def __setitem__(self, name: str, transform: Transform) -> None:
+        self.register(name, transform)
+
+    def __delitem__(self, name: str) -> None:
+        if name not in self._specs:
+            raise KeyError(name)
+        self.unregister(name)
+
+    def __contains__(self, name: object) -> bool:
+        if name in self._specs:
+            return True
+        self._ensure_discovered()
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_discovered()
+        return iter(list(self._specs))
+
+    def __len__(self) -> int:
+        self._ensure_discovered()
+        return len(self._specs)
+
+
+class _RegistryView(Mapping[str, Transform]):
+    def __init__(self, registry: TransformRegistry, excluded: str) -> None:
+        self._registry = registry
+        self._excluded = excluded
+
+    def __getitem__(self, name: str) -> Transform:
+        if name not in self:
+            raise KeyError(name)
+        return self._registry[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._registry and self._registry.spec(name).category != self._excluded  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return (spec.name for spec in self._registry.specs() if spec.category != self._excluded)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+__all__ = [
+    "CATEGORIES",
+    "ENTRY_POINT_GROUP",
+    "TransformRegistry",
+    "TransformSpec",
+]
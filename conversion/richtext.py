@@ -0,0 +1,495 @@
+"""Convert the text of HTML and RTF documents, leaving the markup alone.
+
+A tokenizer splits the document into text, markup (tags, comments, script
+and style bodies, RTF control words and non-text groups) and characters
+written as markup (entities, ``\\'e9``, ``<br>``, ``\\par``). Only the text
+is fed to an ordinary incremental transformer, as one continuous stream,
+so sentence and word state carries across tags: in ``<b>hello</b> world.
+<i>next</i>`` the "n" still starts a sentence. Block-level tags and
+paragraph breaks reach the transformer as line breaks, and line breaks in
+HTML source as spaces, because that is how they read.
+
+Markup waits in a queue keyed by its offset in that plain text and is put
+back once the transformer's output has reached it. Output is matched with
+input one white-space separated word at a time; in a word whose length
+changes (``ß`` → ``SS``), markup keeps its place relative to the word's
+unchanged start and end.
+Every character is tokenized, transformed and matched once, so documents
+of any size convert in linear time.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Pattern, Tuple
+
+from .streaming import ChunkTransformer
+
+HTML = "text/html"
+RTF = "text/rtf"
+RICH_FLAVOURS = (HTML, RTF)
+
+# Token kinds: text is converted as is, a character written as markup is
+# converted as its decoded value, and markup is not converted at all.
+_TEXT, _CHAR, _MARKUP = range(3)
+Token = Tuple[int, str, str]  # (kind, raw, decoded)
+
+_WHITESPACE = re.compile(r"\s")
+_WORDS = re.compile(r"(\s)")
+
+
+class _HtmlTokenizer:
+    """Incremental HTML tokenizer; an unfinished tag or entity waits for more input."""
+
+    special = re.compile(r"[&<>]")
+    _next = re.compile(r"[<&]|\r\n?|\n")
+    _tag = re.compile(r"</?([A-Za-z][^\s/>]*)(?:\"[^\"]*\"|'[^']*'|[^>])*>")
+    _declaration = re.compile(r"<[!?][^>]*>")
+    _tag_start = re.compile(r"<(?:[A-Za-z/!?]|\Z)")
+    _entity = re.compile(r"&(?:#[0-9]{1,7}|#[xX][0-9a-fA-F]{1,6}|[A-Za-z][A-Za-z0-9]{0,31});?")
+    _blocks = frozenset(
+        "address article aside blockquote br dd div dl dt figcaption figure footer"
+        " h1 h2 h3 h4 h5 h6 header hr li main nav ol p pre section table td th tr ul".split()
+    )
+    _raw_text = frozenset({"script", "style"})
+    _preformatted = frozenset({"pre", "textarea"})
+    _max_markup = 1 << 16  # a "<" this far from any ">" is text
+
+    def __init__(self) -> None:
+        self._carry = ""
+        self._raw_end: Optional[Pattern[str]] = None
+        self._raw_hold = 0
+        self._pre = 0
+
+    def feed(self, chunk: str) -> List[Token]:
+        buffer = self._carry + chunk
+        tokens, cut = self._scan(buffer, final=False)
+        self._carry = buffer[cut:]
+        return tokens
+
+    def finish(self) -> List[Token]:
+        tokens, _cut = self._scan(self._carry, final=True)
+        self._carry = ""
+        return tokens
+
+    def escape(self, char: str) -> str:
+        return html.escape(char, quote=False)
+
+    def _scan(self, text: str, final: bool) -> Tuple[List[Token], int]:
+        tokens: List[Token] = []
+        append = tokens.append
+        end = len(text)
+        last_close = text.rfind(">")
+        pos = 0
+        while pos < end:
+            if self._raw_end is not None:
+                match = self._raw_end.search(text, pos)
+                stop = match.start() if match else end if final else max(pos, end - self._raw_hold)
+                if stop > pos:
+                    append((_MARKUP, text[pos:stop], ""))
+                if match is None:
+                    return tokens, stop
+                self._raw_end = None
+                pos = stop
+            match = self._next.search(text, pos)
+            if match is None:
+                append((_TEXT, text[pos:], text[pos:]))
+                return tokens, end
+            start = match.start()
+            if start > pos:
+                append((_TEXT, text[pos:start], text[pos:start]))
+            found = match.group()
+            if found == "&":
+                entity = self._entity.match(text, start)
+                stop = entity.end() if entity else start + 1
+                if not final and stop >= end - 1 and not (entity and entity.group().endswith(";")):
+                    return tokens, start  # "&am" may go on in the next chunk
+                if entity is None:
+                    append((_TEXT, "&", "&"))
+                    pos = start + 1
+                    continue
+                raw = entity.group()
+                decoded = html.unescape(raw)
+                if decoded == raw:
+                    append((_TEXT, raw, raw))
+                elif len(decoded) == 1:
+                    append((_CHAR, raw, decoded))
+                else:
+                    append((_MARKUP, raw, ""))
+                pos = entity.end()
+            elif found == "<":
+                if text.startswith("<!--", start):
+                    close = text.find("-->", start + 4)
+                    if close < 0 and not final:
+                        return tokens, start
+                    pos = end if close < 0 else close + 3
+                    append((_MARKUP, text[start:pos], ""))
+                    continue
+                tag = None
+                if start < last_close:  # without a ">" ahead the pattern can only fail, slowly
+                    tag = self._tag.match(text, start) or self._declaration.match(text, start)
+                if tag is None:
+                    if not final and end - start < self._max_markup and self._tag_start.match(text, start):
+                        return tokens, start
+                    append((_TEXT, "<", "<"))
+                    pos = start + 1
+                    continue
+                append(self._markup(tag.group(), (tag.group(1) or "").lower() if tag.re is self._tag else ""))
+                pos = tag.end()
+            else:
+                # A line break in HTML source reads as a space, except in <pre>.
+                append((_TEXT, found, found) if self._pre else (_CHAR, found, " "))
+                pos = match.end()
+        return tokens, end
+
+    def _markup(self, raw: str, name: str) -> Token:
+        closing = raw.startswith("</")
+        if name in self._raw_text and not closing and not raw.endswith("/>"):
+            self._raw_end = re.compile(rf"</{name}[\s/>]", re.IGNORECASE)
+            self._raw_hold = len(name) + 3
+        elif name in self._preformatted:
+            self._pre = max(0, self._pre + (-1 if closing else 1))
+        if name in self._blocks:
+            return (_CHAR, raw, "\n")
+        return (_MARKUP, raw, "")
+
+
+class _RtfTokenizer:
+    """Incremental RTF tokenizer; groups that hold no document text are markup."""
+
+    special = re.compile(r"[\\{}]|[^\x00-\x7f]")
+    _next = re.compile(r"[\\{}\r\n]")
+    _control = re.compile(r"\\(?:([a-zA-Z]{1,32})(-?\d{1,10})? ?|'([0-9a-fA-F]{2})|([^a-zA-Z']))")
+    _fallback = re.compile(r"\\'[0-9a-fA-F]{2}|[^\\{}]")
+    _skipped = re.compile(
+        r"\{\\(?:\*|(?:fonttbl|colortbl|stylesheet|info|pict|object|listtable|listoverridetable"
+        r"|rsidtbl|generator|fldinst|filetbl|revtbl|listtext|pntext|themedata"
+        r"|colorschememapping|latentstyles|datastore|xmlnstbl)(?![a-zA-Z]))"
+    )
+    _group_edges = re.compile(r"\\.|[{}]", re.DOTALL)
+    _breaks = {"par": "\n", "line": "\n", "sect": "\n", "page": "\n", "row": "\n", "cell": "\n", "tab": "\t"}
+    _symbols = {
+        "emdash": "\u2014",
+        "endash": "\u2013",
+        "lquote": "\u2018",
+        "rquote": "\u2019",
+        "ldblquote": "\u201c",
+        "rdblquote": "\u201d",
+        "bullet": "\u2022",
+        "\\": "\\",
+        "{": "{",
+        "}": "}",
+        "~": "\u00a0",
+        "_": "\u2011",
+        "\n": "\n",
+        "\r": "\n",
+    }
+    _lookahead = 48  # enough to tell whether a "{" opens a skipped group
+
+    def __init__(self) -> None:
+        self._carry = ""
+        self._skip = 0  # depth inside a group that is passed through untouched
+        self._fallback_length = 1  # \ucN
+        self._codepage = "cp1252"
+
+    def feed(self, chunk: str) -> List[Token]:
+        buffer = self._carry + chunk
+        tokens, cut = self._scan(buffer, final=False)
+        self._carry = buffer[cut:]
+        return tokens
+
+    def finish(self) -> List[Token]:
+        tokens, _cut = self._scan(self._carry, final=True)
+        self._carry = ""
+        return tokens
+
+    def escape(self, char: str) -> str:
+        if char in "\\{}":
+            return "\\" + char
+        if char < "\x80":
+            return char
+        try:
+            encoded = char.encode(self._codepage)
+        except (UnicodeEncodeError, LookupError):
+            encoded = b""
+        if len(encoded) == 1:
+            return f"\\'{encoded[0]:02x}"
+        units = char.encode("utf-16-le")
+        fallback = "?" * self._fallback_length or " "
+        return "".join(
+            f"\\u{code - 65536 if code > 32767 else code}{fallback}"
+            for code in (int.from_bytes(units[index:index + 2], "little") for index in range(0, len(units), 2))
+        )
+
+    def _scan(self, text: str, final: bool) -> Tuple[List[Token], int]:
+        tokens: List[Token] = []
+        append = tokens.append
+        end = len(text)
+        pos = 0
+        while pos < end:
+            if self._skip:
+                pos = self._skip_group(text, pos, final, append)
+                if self._skip:
+                    return tokens, pos
+                continue
+            match = self._next.search(text, pos)
+            if match is None:
+                append((_TEXT, text[pos:], text[pos:]))
+                return tokens, end
+            start = match.start()
+            if start > pos:
+                append((_TEXT, text[pos:start], text[pos:start]))
+            found = match.group()
+            if found == "{":
+                if not final and end - start < self._lookahead:
+                    return tokens, start
+                if self._skipped.match(text, start):
+                    self._skip = 1
+                    append((_MARKUP, "{", ""))
+                    pos = start + 1
+                    continue
+                append((_MARKUP, "{", ""))
+                pos = start + 1
+            elif found == "\\":
+                control = self._control.match(text, start)
+                if not final and (control is None or control.end() >= end) and end - start < self._lookahead:
+                    return tokens, start  # "\pa" may go on in the next chunk
+                if control is None:
+                    append((_MARKUP, "\\", ""))
+                    pos = start + 1
+                    continue
+                token, pos = self._control_token(text, control, final)
+                if token is None:
+                    return tokens, start
+                append(token)
+            else:
+                append((_MARKUP, found, ""))  # "}" and raw line breaks, which RTF ignores
+                pos = start + 1
+        return tokens, end
+
+    def _control_token(self, text: str, control: "re.Match[str]", final: bool) -> Tuple[Optional[Token], int]:
+        raw = control.group()
+        word, number, hex_code, symbol = control.groups()
+        if hex_code is not None:
+            return (_CHAR, raw, bytes.fromhex(hex_code).decode(self._codepage, "replace")), control.end()
+        if symbol is not None:
+            if symbol in self._symbols:
+                return (_CHAR, raw, self._symbols[symbol]), control.end()
+            return (_MARKUP, raw, ""), control.end()
+        if word == "u" and number is not None:
+            pos = control.end()
+            for _ in range(self._fallback_length):
+                fallback = self._fallback.match(text, pos)
+                if fallback is None:
+                    break
+                if not final and fallback.end() >= len(text):
+                    return None, pos
+                pos = fallback.end()
+            return (_CHAR, text[control.start():pos], chr(int(number) % 65536)), pos
+        if word == "uc" and number is not None:
+            self._fallback_length = int(number)
+        elif word == "ansicpg" and number is not None:
+            self._codepage = f"cp{number}"
+        if word in self._breaks:
+            return (_CHAR, raw, self._breaks[word]), control.end()
+        if word in self._symbols:
+            return (_CHAR, raw, self._symbols[word]), control.end()
+        return (_MARKUP, raw, ""), control.end()
+
+    def _skip_group(self, text: str, pos: int, final: bool, append: Callable[[Token], None]) -> int:
+        start = pos
+        for edge in self._group_edges.finditer(text, pos):
+            found = edge.group()
+            if found == "{":
+                self._skip += 1
+            elif found == "}":
+                self._skip -= 1
+                if not self._skip:
+                    append((_MARKUP, text[start:edge.end()], ""))
+                    return edge.end()
+            pos = edge.end()
+        stop = len(text) if final or not text.endswith("\\") else len(text) - 1
+        if final:
+            self._skip = 0
+        if stop > start:
+            append((_MARKUP, text[start:stop], ""))
+        return stop
+
+
+_TOKENIZERS: Dict[str, Callable[[], Any]] = {
+    HTML: _HtmlTokenizer,
+    RTF: _RtfTokenizer,
+}
+
+
+def _common_length(source: str, output: str) -> int:
+    """Length of the start that *source* and *output* share, ignoring case."""
+
+    for index, (old, new) in enumerate(zip(source, output)):
+        if old.casefold() != new.casefold():
+            return index
+    return min(len(source), len(output))
+
+
+def _last_space(text: str) -> int:
+    for index in range(len(text) - 1, -1, -1):
+        if text[index].isspace():
+            return index
+    return -1
+
+
+class RichTextTransformer:
+    """Convert the text of an HTML or RTF document fed chunk by chunk.
+
+    *inner* receives the document's text and should not strip trailing
+    line breaks (``keep_trailing_newlines``); *flavour* is :data:`HTML` or
+    :data:`RTF`.
+    """
+
+    def __init__(self, inner: ChunkTransformer, flavour: str = HTML) -> None:
+        if flavour not in _TOKENIZERS:
+            raise ValueError(f"unsupported rich text flavour {flavour!r}")
+        self._inner = inner
+        self._tokenizer = _TOKENIZERS[flavour]()
+        self._source = ""  # text given to inner whose output has not been placed yet
+        self._output = ""  # output of inner not placed yet
+        self._start = 0  # offset of self._source in the whole text
+        self._length = 0
+        # (text offset, raw markup, whether it stands for the character at that offset)
+        self._events: Deque[Tuple[int, str, bool]] = deque()
+
+    def feed(self, chunk: str) -> str:
+        return self._convert(self._tokenizer.feed(chunk), final=False)
+
+    def finish(self) -> str:
+        return self._convert(self._tokenizer.finish(), final=True)
+
+    def _convert(self, tokens: List[Token], final: bool) -> str:
+        text: List[str] = []
+        events = self._events
+        for kind, raw, decoded in tokens:
+            if kind == _MARKUP:
+                events.append((self._length, raw, False))
+                continue
+            if kind == _CHAR:
+                events.append((self._length, raw, True))
+            text.append(decoded)
+            self._length += len(decoded)
+        plain = "".join(text)
+        self._source += plain
+        self._output += self._inner.feed(plain)
+        if final:
+            self._output += self._inner.finish()
+        return self._place(final)
+
+    def _place(self, final: bool) -> str:
+        source, output = self._source, self._output
+        if final:
+            source_cut, output_cut = len(source), len(output)
+        else:
+            # Place whole words only: up to the output's last white space and
+            # the same white-space character of the input.
+            output_cut = _last_space(output) + 1
+            spaces = len(_WHITESPACE.findall(output, 0, output_cut))
+            source_cut = 0
+            if spaces:
+                for count, space in enumerate(_WHITESPACE.finditer(source), 1):
+                    if count == spaces:
+                        source_cut = space.end()
+                        break
+                else:
+                    output_cut = 0  # inner added white space; wait for the end
+        pieces = [self._splice(source[:source_cut], output[:output_cut])] if output_cut else []
+        self._source, self._output = source[source_cut:], output[output_cut:]
+        self._start += source_cut
+        events = self._events
+        # Markup up to the next unplaced character can go out already.
+        while events and (final or (events[0][0] <= self._start and not events[0][2])):
+            pieces.append(events.popleft()[1])
+        return "".join(pieces)
+
+    def _splice(self, source: str, output: str) -> str:
+        start = self._start
+        if len(source) == len(output):
+            return self._mapped(source, output, start)
+        sources, outputs = _WORDS.split(source), _WORDS.split(output)
+        if len(sources) != len(outputs):
+            return self._clamped(source, output, start)
+        pieces = []
+        for source_word, output_word in zip(sources, outputs):
+            if len(source_word) == len(output_word):
+                pieces.append(self._mapped(source_word, output_word, start))
+            else:
+                pieces.append(self._clamped(source_word, output_word, start))
+            start += len(source_word)
+        return "".join(pieces)
+
+    def _mapped(self, source: str, output: str, start: int) -> str:
+        """Output of the same length as its input: markup goes back at its own offset."""
+
+        events = self._events
+        end = start + len(source)
+        pieces = []
+        cursor = 0
+        while events and events[0][0] < end:
+            offset, raw, is_char = events.popleft()
+            index = offset - start
+            if index > cursor:
+                pieces.append(self._text(source[cursor:index], output[cursor:index]))
+                cursor = index
+            if is_char:
+                pieces.append(raw if output[index] == source[index] else self._tokenizer.escape(output[index]))
+                cursor = index + 1
+            else:
+                pieces.append(raw)
+        pieces.append(self._text(source[cursor:], output[cursor:]))
+        return "".join(pieces)
+
+    def _clamped(self, source: str, output: str, start: int) -> str:
+        """A word whose length changed: markup stays put relative to its unchanged ends."""
+
+        events = self._events
+        end = start + len(source)
+        escape = self._tokenizer.escape
+        shift = len(output) - len(source)
+        prefix = _common_length(source, output)
+        suffix = len(source) - _common_length(source[::-1], output[::-1])
+        pieces = []
+        cursor = 0
+        while events and events[0][0] < end:
+            offset, raw, is_char = events.popleft()
+            index = offset - start
+            if index > prefix:
+                index = index + shift if index >= suffix else index
+            index = max(cursor, min(index, len(output)))
+            if index > cursor:
+                pieces.append("".join(map(escape, output[cursor:index])))
+                cursor = index
+            if not is_char or source[offset - start].isspace():
+                pieces.append(raw)  # a character that is really structure: <br>, \par
+        pieces.append("".join(map(escape, output[cursor:])))
+        return "".join(pieces)
+
+    def _text(self, source: str, output: str) -> str:
+        if source == output or not self._tokenizer.special.search(output):
+            return output
+        escape = self._tokenizer.escape
+        return "".join(new if new == old else escape(new) for new, old in zip(output, source))
+
+
+def convert_rich(document: str, inner: ChunkTransformer, flavour: str = HTML) -> str:
+    """Convert the text of a whole HTML or RTF *document* with *inner*."""
+
+    transformer = RichTextTransformer(inner, flavour)
+    return transformer.feed(document) + transformer.finish()
+
+
+__all__ = [
+    "HTML",
+    "RICH_FLAVOURS",
+    "RTF",
+    "RichTextTransformer",
+    "convert_rich",
+]
@@ -0,0 +1,309 @@
+"""User-defined regular-expression rules, applied as extra conversion modes.
+
+Rules live in ``[rule:NAME]`` sections of an ini file (the GUI's
+``casemonster.ini``)::
+
+    [rule:ticket-keys]
+    pattern = \\b[a-z]+-\\d+\\b
+    case = upper
+
+    [rule:hashes]
+    pattern = \\b(?:commit|sha) ([0-9A-F]{7,40})\\b
+    case = lower
+    group = 1
+    order = 20
+    mode = tidy
+
+``case`` is a built-in mode applied to the match, or to one of its groups
+(``group``, a number or a name). Rules with the same ``mode`` (default
+``rules``) are compiled into one alternation, lowest ``order`` first (then
+in file order), and the text is scanned once: at each position the first
+rule that matches wins, and its replacement is not looked at again.
+
+Matches do not cross line breaks when streaming, so patterns should not
+either. :meth:`RuleSet.timings` runs each rule on its own to find a slow one.
+"""
+
+from __future__ import annotations
+
+import configparser
+import hashlib
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import (
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from .streaming import MAX_WORD_CARRY
+
+RULE_SECTION_PREFIX = "rule:"
+DEFAULT_RULE_MODE = "rules"
+_GLOBAL_FLAGS = re.compile(r"\(\?([aimsux]+)\)")
+_NUMBERED_BACKREFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\([1-9]")
+
+Operation = Callable[[str], str]
+
+
+class RuleError(ValueError):
+    """Raised for a rule that cannot be used."""
+
+
+class Rule(NamedTuple):
+    name: str
+    pattern: str
+    case: str
+    group: Union[int, str] = 0
+    order: int = 0
+    mode: str = DEFAULT_RULE_MODE
+
+
+class RuleTiming(NamedTuple):
+    name: str
+    seconds: float
+    matches: int
+
+
+class RuleSet:
+    """The rules of one mode, compiled into a single pattern."""
+
+    def __init__(self, mode: str, rules: Iterable[Rule], operations: Mapping[str, Operation]):
+        self.mode = mode
+        self.rules: Tuple[Rule, ...] = tuple(sorted(rules, key=lambda rule: rule.order))
+        self._patterns: List[Pattern[str]] = []
+        # Each rule's branch ends in an empty marker group; it closes last, so
+        # ``lastindex`` names the rule. A group around each branch instead
+        # would hide the branches' leading literals from ``re``'s prefilter.
+        self._targets: Dict[int, Tuple[Operation, int]] = {}
+        alternatives = []
+        base = 1
+        for rule in self.rules:
+            pattern = _compile_rule(rule)
+            group = rule.group
+            if isinstance(group, str):
+                group = pattern.groupindex[group]
+            self._patterns.append(pattern)
+            self._targets[base + pattern.groups] = (
+                operations[rule.case],
+                base + group - 1 if group else 0,
+            )
+            alternatives.append(f"{_scoped(rule)}()")
+            base += pattern.groups + 1
+        try:
+            self._combined = re.compile("|".join(alternatives))
+        except re.error as exc:
+            raise RuleError(f"mode {mode!r}: the rules cannot be combined: {exc}") from exc
+
+    def apply(self, text: str) -> str:
+        return self._combined.sub(self._replace, text)
+
+    def _replace(self, match: "re.Match[str]") -> str:
+        operation, group = self._targets[match.lastindex or 0]
+        if not group:
+            return operation(match.group())
+        start, end = match.span(group)
+        if start < 0:
+            return match.group()
+        whole = match.group()
+        offset = match.start()
+        start -= offset
+        end -= offset
+        return whole[:start] + operation(whole[start:end]) + whole[end:]
+
+    def timings(self, text: str) -> List[RuleTiming]:
+        """Time each rule's pattern alone over *text*, slowest first."""
+
+        results = []
+        for rule, pattern in zip(self.rules, self._patterns):
+            started = time.perf_counter()
+            matches = sum(1 for _ in pattern.finditer(text))
+            results.append(RuleTiming(rule.name, time.perf_counter() - started, matches))
+        return sorted(results, key=lambda timing: -timing.seconds)
+
+
+class Rules(NamedTuple):
+    modes: Dict[str, RuleSet]
+    fingerprint: str
+
+    def apply(self, mode: str, text: str) -> str:
+        rule_set = self.modes.get(mode)
+        return text if rule_set is None else rule_set.apply(text)
+
+
+EMPTY_RULES = Rules({}, "")
+
+
+def _scoped(rule: Rule) -> str:
+    """*rule*'s pattern, with leading global flags turned into a scoped group."""
+
+    match = _GLOBAL_FLAGS.match(rule.pattern)
+    if match is None:
+        return rule.pattern
+    return f"(?{match.group(1)}:{rule.pattern[match.end():]})"
+
+
+def _compile_rule(rule: Rule) -> Pattern[str]:
+    try:
+        pattern = re.compile(rule.pattern)
+    except re.error as exc:
+        raise RuleError(f"rule {rule.name!r}: bad pattern: {exc}") from exc
+    if _NUMBERED_BACKREFERENCE.search(rule.pattern):
+        # Group numbers shift once the rules are combined; names do not.
+        raise RuleError(f"rule {rule.name!r}: refer back to a named group, not a number")
+    if pattern.match(""):
+        raise RuleError(f"rule {rule.name!r}: the pattern matches empty text")
+    group = rule.group
+    if isinstance(group, str) and group not in pattern.groupindex:
+        raise RuleError(f"rule {rule.name!r}: the pattern has no group {group!r}")
+    if isinstance(group, int) and not 0 <= group <= pattern.groups:
+        raise RuleError(f"rule {rule.name!r}: the pattern has no group {group}")
+    return pattern
+
+
+def _rule(name: str, section: Mapping[str, str]) -> Rule:
+    unknown = set(section) - set(Rule._fields)
+    if unknown:
+        raise RuleError(f"rule {name!r}: unknown option(s): {', '.join(sorted(unknown))}")
+    missing = [option for option in ("pattern", "case") if not section.get(option)]
+    if missing:
+        raise RuleError(f"rule {name!r}: missing {' and '.join(missing)}")
+    group: Union[int, str] = section.get("group", "0").strip()
+    if group.isdigit():
+        group = int(group)
+    try:
+        order = int(section.get("order", "0"))
+    except ValueError:
+        raise RuleError(f"rule {name!r}: order must be a whole number") from None
+    mode = section.get("mode", DEFAULT_RULE_MODE).strip()
+    return Rule(name, section["pattern"], section["case"].strip(), group, order, mode)
+
+
+def parse_rules(
+    source: str, operations: Mapping[str, Operation], reserved: Collection[str] = ()
+) -> Rules:
+    """Compile the ``[rule:NAME]`` sections of the ini text *source*.
+
+    *operations* maps the allowed ``case`` values to their transforms; a rule
+    ``mode`` may not be one of them, nor one of *reserved*.
+    """
+
+    parser = configparser.RawConfigParser()
+    try:
+        parser.read_string(source)
+    except configparser.Error as exc:
+        raise RuleError(str(exc)) from exc
+    grouped: Dict[str, List[Rule]] = {}
+    digest = hashlib.sha1()
+    for section in parser.sections():
+        if not section.startswith(RULE_SECTION_PREFIX):
+            continue
+        rule = _rule(section[len(RULE_SECTION_PREFIX):], parser[section])
+        if rule.mode in operations or rule.mode in reserved or not re.fullmatch(r"[\w-]+", rule.mode):
+            raise RuleError(f"rule {rule.name!r}: {rule.mode!r} cannot be used as a mode name")
+        grouped.setdefault(rule.mode, []).append(rule)
+        digest.update(repr(rule).encode("utf-8"))
+    for rule in (rule for rules in grouped.values() for rule in rules):
+        if rule.case not in operations:
+            choices = ", ".join(sorted(operations))
+            raise RuleError(f"rule {rule.name!r}: unknown case {rule.case!r} (choose from {choices})")
+    if not grouped:
+        return EMPTY_RULES
+    modes = {mode: RuleSet(mode, rules, operations) for mode, rules in grouped.items()}
+    return Rules(modes, digest.hexdigest()[:12])
+
+
+class RulesFile:
+    """The rules in the ini file at *path*, recompiled only when it changes.
+
+    Like :class:`conversion.dictionary.DictionaryFile`, :meth:`current` costs
+    one ``stat`` when nothing changed, and a broken edit keeps the previous
+    rules in use with the problem in :attr:`error`.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        operations: Mapping[str, Operation],
+        reserved: Collection[str] = (),
+    ) -> None:
+        self.path = Path(path)
+        self.error: Optional[RuleError] = None
+        self._operations = operations
+        self._reserved = reserved
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[int, int]] = None
+        self._rules = EMPTY_RULES
+
+    def current(self) -> Rules:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            signature = None
+        else:
+            signature = (stat.st_size, stat.st_mtime_ns)
+        if signature == self._signature:
+            return self._rules
+        with self._lock:
+            if signature != self._signature:
+                try:
+                    self._rules = self._load()
+                except RuleError as exc:
+                    self.error = exc
+                else:
+                    self.error = None
+                self._signature = signature
+        return self._rules
+
+    def _load(self) -> Rules:
+        try:
+            source = Path(self.path).read_text(encoding="utf-8-sig")
+        except FileNotFoundError:
+            return EMPTY_RULES
+        return parse_rules(source, self._operations, self._reserved)
+
+
+class RuleTransformer:
+    """Apply a mode's rules chunk by chunk, a line at a time."""
+
+    def __init__(self, rules: Callable[[], Rules], mode: str) -> None:
+        self._rules = rules
+        self._mode = mode
+        self._carry = ""
+
+    def feed(self, chunk: str) -> str:
+        buffer = self._carry + chunk
+        cut = buffer.rfind("\n") + 1
+        if not cut and len(buffer) > MAX_WORD_CARRY:
+            cut = len(buffer)
+        self._carry = buffer[cut:]
+        return self._rules().apply(self._mode, buffer[:cut]) if cut else ""
+
+    def finish(self) -> str:
+        carry, self._carry = self._carry, ""
+        return self._rules().apply(self._mode, carry)
+
+
+__all__ = [
+    "DEFAULT_RULE_MODE",
+    "EMPTY_RULES",
+    "Rule",
+    "RuleError",
+    "RuleSet",
+    "RuleTiming",
+    "RuleTransformer",
+    "Rules",
+    "RulesFile",
+    "parse_rules",
+]
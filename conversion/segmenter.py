@@ -0,0 +1,142 @@
+"""Sentence boundaries that know about abbreviations, ellipses and quotes.
+
+A boundary is a run of ``.``, ``!`` or ``?`` followed by optional closing
+quotes or brackets and then whitespace or the end of the text, or a run of
+full-width terminators (``。``, ``！``, ``？``), which need no space after
+them. A lone ``.`` does not end a sentence after a known abbreviation
+("e.g.", "Dr.") or, when a number follows, after a numeric abbreviation
+("No. 5", "p. 12"). An ellipsis (``...`` or ``…``) never ends a sentence on
+its own, and decimals, versions and host names ("3.14", "v1.2.3",
+"example.com") have no space after the dot.
+
+Each rule set is compiled into one regular expression and cached. The
+pattern starts with a character class, so the regex engine skips straight to
+candidate terminators instead of trying the pattern at every position.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Pattern
+
+DEFAULT_ABBREVIATIONS = frozenset(
+    {
+        "al", "approx", "capt", "cf", "col", "dept", "dr", "e.g", "gen", "gov",
+        "i.e", "jr", "lt", "messrs", "mr", "mrs", "ms", "mt", "prof", "rep",
+        "rev", "sen", "sgt", "sr", "st", "viz", "vs",
+    }
+)
+# Only abbreviations when a number follows: "No. 5" but "Say no. Then...".
+DEFAULT_NUMERIC_ABBREVIATIONS = frozenset(
+    {
+        "art", "ch", "eq", "fig", "figs", "no", "nos", "p", "pp", "ref", "sec",
+        "vol", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep", "sept",
+        "oct", "nov", "dec",
+    }
+)
+
+TERMINATORS = ".!?…"
+FULL_WIDTH_TERMINATORS = "。！？｡"
+CLOSERS = "\"'”’»)]}」』）】"
+
+
+class SentenceRules(NamedTuple):
+    """Abbreviations (matched case-insensitively, without the final dot)."""
+
+    abbreviations: FrozenSet[str] = DEFAULT_ABBREVIATIONS
+    numeric_abbreviations: FrozenSet[str] = DEFAULT_NUMERIC_ABBREVIATIONS
+
+    @classmethod
+    def create(
+        cls, abbreviations: Iterable[str] = (), numeric_abbreviations: Iterable[str] = ()
+    ) -> "SentenceRules":
+        return cls(_normalise(abbreviations), _normalise(numeric_abbreviations))
+
+    @property
+    def context(self) -> int:
+        """Characters before a terminator that a boundary decision can depend on."""
+
+        words = chain(self.abbreviations, self.numeric_abbreviations)
+        return max((len(word) for word in words), default=0) + 2
+
+
+DEFAULT_SENTENCE_RULES = SentenceRules()
+
+
+def _normalise(words: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(word.strip().rstrip(".").lower() for word in words if word.strip(" ."))
+
+
+def _trie(words: Iterable[str]) -> str:
+    """Alternation of *words* factored by common prefix, so it fails fast."""
+
+    branches: Dict[str, List[str]] = defaultdict(list)
+    for word in words:
+        branches[word[0]].append(word[1:])
+    parts = []
+    for head, tails in sorted(branches.items()):
+        rest = _trie(tail for tail in tails if tail)
+        if rest and ("" in tails or "|" in rest):
+            rest = f"(?:{rest}){'?' if '' in tails else ''}"
+        parts.append(re.escape(head) + rest)
+    return "|".join(parts)
+
+
+def _lookbehinds(words: Iterable[str], kind: str) -> List[str]:
+    """One ``(?<!...)``/``(?<=...)`` per abbreviation length, ending at the dot.
+
+    Look-behinds need a fixed width, so the words are grouped by length.
+    """
+
+    groups: Dict[int, List[str]] = defaultdict(list)
+    for word in words:
+        groups[len(word)].append(word)
+    return [rf"(?<{kind}\b(?i:{_trie(group)})\.)" for _length, group in sorted(groups.items())]
+
+
+@lru_cache(maxsize=16)
+def boundary_pattern(rules: SentenceRules = DEFAULT_SENTENCE_RULES) -> Pattern[str]:
+    """Compile *rules*; a match spans a terminator run and its closers."""
+
+    terminators = re.escape(TERMINATORS + FULL_WIDTH_TERMINATORS)
+    closers = f"[{re.escape(CLOSERS)}]*"
+    lone_dot = rf"(?<=\.)(?![{terminators}])" + "".join(_lookbehinds(rules.abbreviations, "!"))
+    numeric = _lookbehinds(rules.numeric_abbreviations, "=")
+    if numeric:
+        lone_dot += rf"(?!(?=\s+\d)(?:{'|'.join(numeric)}))"
+    return re.compile(
+        # First character of a run: the character class lets the engine skip ahead.
+        rf"[{terminators}](?<![{terminators}][{terminators}])"
+        rf"(?:"
+        rf"(?<=[{re.escape(FULL_WIDTH_TERMINATORS)}])[{terminators}]*{closers}"
+        # Cheap test first: most dots ("3.14", "a.b") have no space after them.
+        rf"|(?=[{terminators}]*{closers}(?:\s|\Z))(?:"
+        rf"(?:(?<=[!?])|(?=[{terminators}]*[!?]))[{terminators}]*"  # contains "!" or "?"
+        rf"|(?<=\.)\.(?![{terminators}])"  # ".." is a typo for "."
+        rf"|{lone_dot}"
+        rf"){closers}"
+        rf")"
+    )
+
+
+def sentence_boundaries(text: str, rules: SentenceRules = DEFAULT_SENTENCE_RULES) -> Iterator[int]:
+    """Yield the offsets in *text* where a new sentence may start."""
+
+    for match in boundary_pattern(rules).finditer(text):
+        yield match.end()
+
+
+__all__ = [
+    "CLOSERS",
+    "DEFAULT_ABBREVIATIONS",
+    "DEFAULT_NUMERIC_ABBREVIATIONS",
+    "DEFAULT_SENTENCE_RULES",
+    "FULL_WIDTH_TERMINATORS",
+    "SentenceRules",
+    "TERMINATORS",
+    "boundary_pattern",
+    "sentence_boundaries",
+]
@@ -0,0 +1,357 @@
+"""Chunk-safe sentence capitalisation.
+
+The rules mirror the original ``funky`` behaviour:
+
+- everything is lower-cased except for the positions below;
+- the first letter after the start of the text or a sentence boundary is
+  upper-cased (digits and punctuation in between are skipped); boundaries
+  come from :mod:`conversion.segmenter`, so "e.g.", "Dr.", "3.14" and
+  ellipses do not start a new sentence;
+- a standalone ``i`` (preceded by a space and followed by a space, ``.``,
+  ``!``, ``?``, a newline or the end) and ``i`` before an apostrophe become
+  ``I``;
+- the first character after a run of tabs or line breaks is upper-cased;
+- trailing line breaks are dropped unless the text also starts with one.
+
+With a :class:`~conversion.locales.LocaleCasing` the letters are cased by the
+language's rules instead, the ``i`` rules (which are English) are off, a
+sentence-initial digraph such as Dutch "ij" is capitalised as a whole and a
+Greek word-final ``σ`` becomes ``ς``.
+
+:class:`SentenceCaser` applies the rules incrementally. It holds back the
+last whitespace-separated token and remembers a few characters before each
+block, so that neither look-ahead nor abbreviation decisions depend on where
+a chunk ends.
+The common path locates the handful of positions to upper-case with compiled
+regular expressions and copies everything else from a single ``str.lower``
+call; inputs the fast path cannot model exactly use a per-character loop.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from itertools import chain
+from typing import TYPE_CHECKING, List, Optional, Pattern, Set, Tuple
+
+from .segmenter import DEFAULT_SENTENCE_RULES, SentenceRules, boundary_pattern
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .locales import LocaleCasing
+
+_NEWLINES = "\r\n"
+_LINE_BREAKS = "\t\r\n"
+_PRONOUN_FOLLOWERS = " .!?\n"
+_APOSTROPHES = ("’", "'")
+
+# Letters as the exact loop sees them, up to numeric letter-like symbols.
+_LETTER = re.compile(r"[^\W\d_]")
+_SPACED_PRONOUN = re.compile(r" ([iI])(?=[ .!?\n]|\Z)")
+_APOSTROPHE = re.compile("['’]")
+_AFTER_LINE_BREAK = re.compile(r"[\t\r\n]+([^\t\r\n])")
+# Tokens longer than this are split even without whitespace; only a terminator
+# followed by that many closing quotes could then be misjudged.
+_HOLD_LIMIT = 64
+_LAST_TOKEN = re.compile(r"\S*\s*\Z")
+_ASCII_UPPER = bytes.maketrans(
+    b"abcdefghijklmnopqrstuvwxyz", b"ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+
+
+def _upper_first(piece: str, casing: Optional[LocaleCasing] = None) -> str:
+    first = casing.capital(piece[:1]) if casing is not None else piece[:1].upper()
+    return first + piece[1:]
+
+
+@lru_cache(maxsize=16)
+def _sentence_starts(rules: SentenceRules) -> Pattern[str]:
+    """A boundary plus the first letter after it (group 1), if there is one."""
+
+    return re.compile(boundary_pattern(rules).pattern + r"[\W\d_]*([^\W\d_])?")
+
+
+def _sentence_letters(
+    window: str, offset: int, limit: int, caps: bool, rules: SentenceRules
+) -> Optional[Tuple[List[int], bool]]:
+    """Return the sentence-initial letter positions and the trailing caps state."""
+
+    positions: List[int] = []
+    if caps:
+        letter = _LETTER.search(window, offset, limit)
+        if letter is not None:
+            positions.append(letter.start() - offset)
+            caps = False
+    # Boundaries with no letter before the next one share that letter, so the
+    # letter search may run over them.
+    for start in _sentence_starts(rules).finditer(window, offset):
+        if start.start() >= limit:
+            break
+        letter = start.start(1)
+        if letter < 0 or letter >= limit:
+            caps = True
+            break
+        positions.append(letter - offset)
+        caps = False
+    if not window.isascii() and not all(window[offset + index].isalpha() for index in positions):
+        return None  # numeric letter-like symbol; let the exact loop decide
+    return positions, caps
+
+
+def _digraph_tails(text: str, lowered: str, positions: List[int], casing: LocaleCasing) -> List[int]:
+    """Second letters of digraphs ("ij") that start at one of *positions*."""
+
+    tails = []
+    for index in positions:
+        for digraph in casing.digraphs:
+            if lowered.startswith(digraph, index) and index + len(digraph) <= len(text):
+                tails.extend(range(index + 1, index + len(digraph)))
+    return tails
+
+
+def _case_block_fast(
+    text: str,
+    prev: str,
+    following: str,
+    caps: bool,
+    rules: SentenceRules,
+    casing: Optional[LocaleCasing] = None,
+) -> Optional[Tuple[str, bool]]:
+    if casing is not None:
+        lowered = casing.lower_chars(text)
+    elif "Σ" in text:
+        # Lower-case character by character semantics: no final-sigma context.
+        lowered = text.replace("Σ", "σ").lower()
+    else:
+        lowered = text.lower()
+    if len(lowered) != len(text):
+        return None
+
+    window = prev + text + following
+    offset = len(prev)
+    limit = offset + len(text)
+    found = _sentence_letters(window, offset, limit, caps, rules)
+    if found is None:
+        return None
+    upper_at, caps = found
+    english = casing is None or casing.english_pronoun
+    if casing is not None and casing.digraphs:
+        upper_at.extend(_digraph_tails(text, lowered, upper_at, casing))
+    for match in (_SPACED_PRONOUN.finditer(window, max(0, offset - 1)) if english else ()):
+        index = match.start(1)
+        if index >= limit:
+            break
+        upper_at.append(index - offset)
+    for match in (_APOSTROPHE.finditer(window, offset + 1) if english else ()):
+        index = match.start() - 1
+        if index >= limit:
+            break
+        if window[index] in "iI":
+            upper_at.append(index - offset)
+
+    after_break = []
+    for match in _AFTER_LINE_BREAK.finditer(window, max(0, offset - 1)):
+        index = match.start(1)
+        if index >= limit:
+            break
+        if index >= offset:
+            after_break.append(index - offset)
+
+    if not upper_at and not after_break:
+        return lowered, caps
+
+    if lowered.isascii() and (
+        casing is None
+        or casing.ascii_plain
+        or not any(lowered[index] in casing.ascii_special for index in chain(upper_at, after_break))
+    ):
+        # Single-byte characters: patch the positions in place.
+        buffer = bytearray(lowered, "ascii")
+        for index in upper_at:
+            buffer[index] = _ASCII_UPPER[buffer[index]]
+        for index in after_break:
+            buffer[index] = _ASCII_UPPER[buffer[index]]
+        return buffer.decode("ascii"), caps
+
+    targets = set(upper_at)
+    breaks = set(after_break)
+    pieces: List[str] = []
+    last = 0
+    for index in sorted(targets | breaks):
+        pieces.append(lowered[last:index])
+        if index not in targets:
+            piece = lowered[index]
+        elif casing is not None:
+            piece = casing.capital(text[index])
+        else:
+            piece = text[index].upper()
+        if index in breaks:
+            piece = _upper_first(piece, casing)
+        pieces.append(piece)
+        last = index + 1
+    pieces.append(lowered[last:])
+    return "".join(pieces), caps
+
+
+def _boundary_ends(window: str, offset: int, limit: int, rules: SentenceRules) -> Set[int]:
+    ends = set()
+    for boundary in boundary_pattern(rules).finditer(window, offset):
+        if boundary.start() >= limit:
+            break
+        ends.add(min(boundary.end(), limit) - offset)
+    return ends
+
+
+def _case_block_exact(
+    text: str,
+    prev: str,
+    following: str,
+    caps: bool,
+    rules: SentenceRules,
+    casing: Optional[LocaleCasing] = None,
+) -> Tuple[str, bool]:
+    window = prev + text + following
+    ends = _boundary_ends(window, len(prev), len(prev) + len(text), rules)
+    before_text = prev[-1:]
+    english = casing is None or casing.english_pronoun
+    upper = str.upper if casing is None else casing.capital
+    lower = str.lower if casing is None else casing.lower_chars
+    digraph_tail = ""
+    pieces: List[str] = []
+    last_index = len(text) - 1
+    for index, char in enumerate(text):
+        before = text[index - 1] if index else before_text
+        after = text[index + 1] if index < last_index else following[:1]
+        if index in ends:
+            caps = True
+        tail, digraph_tail = digraph_tail, ""
+        if tail and char.lower() == tail[0]:
+            piece = upper(char)
+            digraph_tail = tail[1:]
+        elif char.isalpha() and caps:
+            piece = upper(char)
+            caps = False
+            if casing is not None and casing.digraphs:
+                rest = lower(text[index : index + 4])
+                digraph_tail = next(
+                    (digraph[1:] for digraph in casing.digraphs if rest.startswith(digraph)), ""
+                )
+        elif char.isalpha():
+            if english and char.lower() == "i" and (
+                (before == " " and (not after or after in _PRONOUN_FOLLOWERS))
+                or after in _APOSTROPHES
+            ):
+                piece = char.upper()
+            else:
+                piece = lower(char)
+        else:
+            piece = lower(char)
+        if before and before in _LINE_BREAKS and char not in _LINE_BREAKS:
+            piece = _upper_first(piece, casing)
+        pieces.append(piece)
+    return "".join(pieces), caps or len(text) in ends
+
+
+def _case_block(
+    text: str,
+    prev: str,
+    following: str,
+    caps: bool,
+    rules: SentenceRules,
+    casing: Optional[LocaleCasing] = None,
+) -> Tuple[str, bool]:
+    result = _case_block_fast(text, prev, following, caps, rules, casing)
+    if result is None:
+        result = _case_block_exact(text, prev, following, caps, rules, casing)
+    if casing is not None and casing.final_sigma:
+        output, caps = result
+        return casing.fix_final_sigma(output, prev, following), caps
+    return result
+
+
+class SentenceCaser:
+    """Incremental sentence-case transformer.
+
+    Feed text with :meth:`feed` and call :meth:`finish` once at the end; the
+    concatenated return values equal the one-shot result for the whole text.
+    ``upper_first`` upper-cases each chunk before applying the rules (the
+    ``sentence`` mode). ``keep_trailing_newlines`` disables the clipboard-style
+    stripping of trailing line breaks, which is what splicing callers want.
+    ``rules`` selects the abbreviations the sentence segmenter knows and
+    ``casing`` the language's casing rules (default: ``str`` casing).
+    """
+
+    def __init__(
+        self,
+        *,
+        upper_first: bool = True,
+        keep_trailing_newlines: bool = False,
+        rules: SentenceRules = DEFAULT_SENTENCE_RULES,
+        casing: Optional[LocaleCasing] = None,
+    ) -> None:
+        self._upper_first = upper_first
+        self._keep_trailing_newlines = keep_trailing_newlines
+        self._rules = rules
+        self._casing = casing
+        self._context = rules.context
+        self._caps = True
+        self._prev = ""
+        self._hold = ""
+        self._pending = ""
+        self._leading: Optional[bool] = None
+
+    def feed(self, chunk: str) -> str:
+        if not chunk:
+            return ""
+        if self._upper_first:
+            chunk = chunk.upper() if self._casing is None else self._casing.capital(chunk)
+        if self._leading is None:
+            self._leading = chunk[0] in _NEWLINES
+        buffer = self._hold + chunk
+        # Keep the last token and any space after it back: whether a
+        # terminator ends a sentence depends on the token that follows it.
+        cut = _LAST_TOKEN.search(buffer, max(0, len(buffer) - _HOLD_LIMIT)).start()
+        text, self._hold = buffer[:cut], buffer[cut:]
+        return self._emit(self._process(text, self._hold))
+
+    def finish(self) -> str:
+        text, self._hold = self._hold, ""
+        output = self._pending + self._process(text, "")
+        self._pending = ""
+        if self._leading or self._keep_trailing_newlines:
+            return output
+        return output.rstrip(_NEWLINES)
+
+    def _process(self, text: str, following: str) -> str:
+        if not text:
+            return ""
+        output, self._caps = _case_block(
+            text, self._prev, following, self._caps, self._rules, self._casing
+        )
+        self._prev = (self._prev + text)[-self._context :]
+        return output
+
+    def _emit(self, output: str) -> str:
+        # Trailing line breaks are only known to be "trailing" at the end, so
+        # keep the current run back until more text arrives.
+        if not output:
+            return ""
+        output = self._pending + output
+        stripped = output.rstrip(_NEWLINES)
+        self._pending = output[len(stripped) :]
+        return stripped
+
+
+def sentence_case(
+    text: str,
+    *,
+    upper_first: bool = True,
+    rules: SentenceRules = DEFAULT_SENTENCE_RULES,
+    casing: Optional[LocaleCasing] = None,
+) -> str:
+    """Return *text* in sentence case in a single call."""
+
+    caser = SentenceCaser(upper_first=upper_first, rules=rules, casing=casing)
+    return caser.feed(text) + caser.finish()
+
+
+__all__ = ["SentenceCaser", "sentence_case"]
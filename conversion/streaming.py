@@ -0,0 +1,102 @@
+"""Chunked conversion of large texts and streams."""
+
+from __future__ import annotations
+
+from typing import Callable, Iterable, Iterator, Optional, Protocol, TextIO
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+# A chunk without any whitespace is carried over at most this far before it is
+# converted anyway; word-level context is meaningless for such input.
+MAX_WORD_CARRY = 1 << 16
+_WORD_BREAKS = (" ", "\n", "\t", "\r")
+
+
+class ChunkTransformer(Protocol):
+    """Incremental transformer: ``feed`` chunks, then ``finish`` once."""
+
+    def feed(self, chunk: str) -> str:
+        ...
+
+    def finish(self) -> str:
+        ...
+
+
+class WordBufferedTransformer:
+    """Apply a whole-text transform chunk by chunk.
+
+    The trailing partial word of every chunk is carried into the next one, so
+    transforms that look at neighbouring letters (``str.title``, final sigma in
+    ``str.lower``) see the same context as they would on the whole text.
+    """
+
+    def __init__(self, transform: Callable[[str], str]) -> None:
+        self._transform = transform
+        self._carry = ""
+
+    def feed(self, chunk: str) -> str:
+        buffer = self._carry + chunk
+        cut = max(buffer.rfind(separator) for separator in _WORD_BREAKS) + 1
+        if cut <= 0:
+            if len(buffer) <= MAX_WORD_CARRY:
+                self._carry = buffer
+                return ""
+            cut = len(buffer)
+        self._carry = buffer[cut:]
+        return self._transform(buffer[:cut])
+
+    def finish(self) -> str:
+        buffer, self._carry = self._carry, ""
+        return self._transform(buffer) if buffer else ""
+
+
+def iter_convert(chunks: Iterable[str], transformer: ChunkTransformer) -> Iterator[str]:
+    """Yield converted output for *chunks*, skipping empty pieces."""
+
+    for chunk in chunks:
+        output = transformer.feed(chunk)
+        if output:
+            yield output
+    tail = transformer.finish()
+    if tail:
+        yield tail
+
+
+def read_chunks(source: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def convert_stream(
+    source: TextIO,
+    sink: TextIO,
+    transformer: ChunkTransformer,
+    *,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    flush: Optional[bool] = None,
+) -> None:
+    """Copy *source* to *sink* through *transformer* in bounded memory.
+
+    With ``flush`` (default: when *sink* is interactive) the sink is flushed
+    after every chunk so output appears as it is produced.
+    """
+
+    if flush is None:
+        isatty = getattr(sink, "isatty", None)
+        flush = bool(isatty and isatty())
+    for output in iter_convert(read_chunks(source, chunk_size), transformer):
+        sink.write(output)
+        if flush:
+            sink.flush()
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "ChunkTransformer",
+    "WordBufferedTransformer",
+    "convert_stream",
+    "iter_convert",
+    "read_chunks",
+]
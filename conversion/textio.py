@@ -0,0 +1,226 @@
+"""Reading and rewriting text files on disk.
+
+The encoding of a file is sniffed from a bounded window at its start: a byte
+order mark wins, then UTF-16 without a BOM (recognised by its NUL-byte
+pattern), then UTF-8, and finally a legacy single-byte code page. Files are
+then decoded and re-encoded incrementally in the same encoding, without any
+newline translation, so memory use does not depend on the file size.
+
+In-place rewrites go to a temporary file next to the original that replaces
+it with :func:`os.replace` only once it is complete; a crash mid-write leaves
+the original untouched. A symlink is resolved first, so the file it points to
+is replaced and the link itself is kept.
+"""
+
+from __future__ import annotations
+
+import codecs
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager, suppress
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional, Tuple
+
+from .streaming import DEFAULT_CHUNK_SIZE, ChunkTransformer
+
+# Files with a NUL byte in this many leading bytes are treated as binary
+# (unless the NULs are the pattern of UTF-16 text).
+BINARY_SNIFF_BYTES = 8192
+ENCODING_SNIFF_BYTES = 64 * 1024
+LEGACY_ENCODING = "cp1252"
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32-le"),
+    (codecs.BOM_UTF32_BE, "utf-32-be"),
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+# Bytes cp1252 leaves undefined; their presence means Latin-1 is the better guess.
+_CP1252_UNDEFINED = frozenset(b"\x81\x8d\x8f\x90\x9d")
+
+
+class TextEncoding(NamedTuple):
+    """A codec plus the byte order mark that precedes the text, if any."""
+
+    codec: str
+    bom: bytes = b""
+
+    @property
+    def errors(self) -> str:
+        # Single-byte codecs and UTF-8 round-trip undecodable bytes through
+        # lone surrogates; the wide codecs have no such escape hatch, so a
+        # truncated or corrupt UTF-16/32 file raises UnicodeDecodeError.
+        return "strict" if self.codec.startswith(("utf-16", "utf-32")) else "surrogateescape"
+
+
+UTF8 = TextEncoding("utf-8")
+
+
+def _utf16_without_bom(head: bytes) -> Optional[str]:
+    sample = head[: len(head) & ~1]
+    if len(sample) < 4:
+        return None
+    half = len(sample) // 2
+    even = sample[0::2].count(0) / half
+    odd = sample[1::2].count(0) / half
+    if odd > 0.4 and even < 0.05:
+        return "utf-16-le"
+    if even > 0.4 and odd < 0.05:
+        return "utf-16-be"
+    return None
+
+
+def sniff_encoding(head: bytes, *, complete: bool = False) -> Optional[TextEncoding]:
+    """Guess the encoding of a file starting with *head*.
+
+    *complete* says that *head* is the whole file, so a multi-byte sequence
+    cut off at the end of the window is an error rather than expected.
+    Returns None for binary data.
+    """
+
+    for bom, codec in _BOMS:
+        if head.startswith(bom):
+            return TextEncoding(codec, bom)
+    wide = _utf16_without_bom(head)
+    if wide is not None:
+        return TextEncoding(wide)
+    if b"\0" in head[:BINARY_SNIFF_BYTES]:
+        return None
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=complete)
+    except UnicodeDecodeError:
+        if _CP1252_UNDEFINED.intersection(head):
+            return TextEncoding("latin-1")
+        return TextEncoding(LEGACY_ENCODING)
+    return UTF8
+
+
+def sniff_file(path: Path) -> Optional[TextEncoding]:
+    """Sniff the encoding of the file at *path*; None if it looks binary."""
+
+    with open(path, "rb") as handle:
+        head = handle.read(ENCODING_SNIFF_BYTES)
+        return sniff_encoding(head, complete=len(head) < ENCODING_SNIFF_BYTES)
+
+
+def iter_decoded(
+    handle: BinaryIO, encoding: TextEncoding, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[str]:
+    """Yield the text of *handle* (positioned after the BOM) chunk by chunk."""
+
+    decoder = codecs.getincrementaldecoder(encoding.codec)(encoding.errors)
+    while True:
+        data = handle.read(chunk_size)
+        text = decoder.decode(data, final=not data)
+        if text:
+            yield text
+        if not data:
+            return
+
+
+def temp_sibling(path: Path) -> Tuple[BinaryIO, Path]:
+    """Open a new temporary file next to *path* (after symlinks) for its replacement."""
+
+    path = Path(os.path.realpath(path))
+    fd, temp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".casemonster", dir=path.parent)
+    return os.fdopen(fd, "wb"), Path(temp)
+
+
+def replace_with(path: Path, temp: Path) -> None:
+    """Move the complete temporary file *temp* over *path*, keeping its mode.
+
+    If *path* is a symlink, the file it points to is replaced.
+    """
+
+    path = Path(os.path.realpath(path))
+    if path.exists():
+        shutil.copymode(path, temp)
+    os.replace(temp, path)
+
+
+@contextmanager
+def atomic_write(path: Path) -> Iterator[BinaryIO]:
+    """Write to a temporary sibling of *path* and move it into place on success.
+
+    The temporary file receives the permission bits of the original. Raising
+    inside the ``with`` block discards the temporary file.
+    """
+
+    path = Path(path)
+    handle, temp = temp_sibling(path)
+    try:
+        with handle:
+            yield handle
+            handle.flush()
+            os.fsync(handle.fileno())
+        replace_with(path, temp)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.unlink(temp)
+        raise
+
+
+class _Unchanged(Exception):
+    """Abort an atomic write whose result equals the original."""
+
+
+def convert_in_place(
+    path: Path,
+    transformer: ChunkTransformer,
+    *,
+    encoding: Optional[TextEncoding] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    precondition: Optional[Callable[[], bool]] = None,
+) -> bool:
+    """Stream the text file at *path* through *transformer*, keeping its encoding.
+
+    Returns True if the file was replaced. Binary files, and files the
+    transformer leaves byte-for-byte identical, are not rewritten. Nor is the
+    file if *precondition* returns False right before the replace (it was
+    saved again while it was being converted, say).
+    """
+
+    path = Path(path)
+    encoding = encoding or sniff_file(path)
+    if encoding is None:
+        return False
+    encoder = codecs.getincrementalencoder(encoding.codec)(encoding.errors)
+    changed = False
+    try:
+        # ``original`` is read in step with the output so an unchanged file
+        # is detected without holding either version in memory. The sources
+        # are closed before the replace, which Windows requires.
+        with atomic_write(path) as sink, open(path, "rb") as source, open(path, "rb") as original:
+            source.seek(len(encoding.bom))
+            sink.write(encoding.bom)
+            original.seek(len(encoding.bom))
+            for text in iter_decoded(source, encoding, chunk_size):
+                data = encoder.encode(transformer.feed(text))
+                changed = changed or original.read(len(data)) != data
+                sink.write(data)
+            data = encoder.encode(transformer.finish(), final=True)
+            changed = changed or original.read(len(data)) != data or bool(original.read(1))
+            sink.write(data)
+            if not changed or (precondition is not None and not precondition()):
+                raise _Unchanged
+    except _Unchanged:
+        return False
+    return True
+
+
+__all__ = [
+    "BINARY_SNIFF_BYTES",
+    "ENCODING_SNIFF_BYTES",
+    "LEGACY_ENCODING",
+    "TextEncoding",
+    "UTF8",
+    "atomic_write",
+    "convert_in_place",
+    "iter_decoded",
+    "replace_with",
+    "sniff_encoding",
+    "sniff_file",
+    "temp_sibling",
+]
@@ -0,0 +1,184 @@
+"""Title case that knows about apostrophes, hyphens, ordinals and mixed case.
+
+``str.title`` starts a new word after every non-letter, which gives "Don'T",
+"O'Neill'S", "E-Mail" and "21St". :func:`title_case` keeps ``str.title`` for
+the bulk of the work and then repairs the few places it gets wrong:
+
+- a contraction or possessive suffix after an apostrophe (``'s``, ``'t``,
+  ``'d``, ``'m``, ``'re``, ``'ve``, ``'ll``; straight or curly) stays lower
+  case, while a name part such as "O'Neill" keeps its capital;
+- the parts of a hyphenated compound after the first are lower-cased
+  ("E-mail", "Well-known");
+- ordinal and decade suffixes stay lower case ("21st", "1990s");
+- a whitespace-separated token that is already in mixed case, with a capital
+  right after a lower-case letter or a hyphen ("McDonald", "iPhone",
+  "Jean-Luc"), is left exactly as it was.
+
+Each repair is a regular expression that starts with a literal character (an
+apostrophe, a hyphen or a digit). It only runs when that character occurs,
+and the regex engine then jumps between candidates with a fast substring
+search. One pattern with several starting characters would instead test every
+position, which on its own costs about as much as ``str.title``.
+
+ASCII text is title-cased with ``bytes.title``, which follows the same rules
+several times faster, and the repairs lower-case single bytes in place. On
+large ASCII input this makes :func:`title_case` faster than ``str.title``
+(``benchmarks/bench_titlecase.py``). Other text has to go through
+``str.title`` itself, so it is bound to be slower by the cost of the repairs.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Pattern, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .locales import LocaleCasing
+
+_LETTER = r"[^\W\d_]"
+_SUFFIXES = r"(?:S|T|D|M|Re|Ve|Ll)\b"
+
+
+# Keyed by the literal each pattern starts with: a pattern only runs when its
+# literal occurs, and the regex engine then jumps between candidates with a
+# fast substring search. The look-behind after the literal checks what
+# precedes it. The whole match is one group, so ``split`` returns the text to
+# lower-case at the odd indices.
+_FIXES: Dict[str, Pattern[str]] = {
+    **{quote: re.compile(rf"({quote}(?<={_LETTER}{quote}){_SUFFIXES})") for quote in "'’"},
+    "-": re.compile(rf"(-(?<={_LETTER}-){_LETTER})"),
+    **{digit: re.compile(rf"({digit}(?:St|Nd|Rd|Th|S)\b)") for digit in string.digits},
+}
+# An upper-case letter right after a lower-case letter or a hyphen: the token
+# was typed in mixed case on purpose. Only Latin-1 letters are told apart.
+_LOWER = "a-zß-öø-ÿ"
+_UPPER = "A-ZÀ-ÖØ-Þ"
+# Upper-case first: capitals are rarer, so fewer positions get past the class.
+_MIXED = re.compile(f"[{_UPPER}](?<=[{_LOWER}-].)")
+# Latin-1 lower-case letters and hyphens as "a", upper-case letters as "A",
+# whitespace as " " and anything else as ".": "aA" then marks a mixed-case
+# token, which extends to the nearest spaces.
+_SHAPE = bytes(
+    ord("a") if re.fullmatch(f"[{_LOWER}-]", chr(code))
+    else ord("A") if re.fullmatch(f"[{_UPPER}]", chr(code))
+    else ord(" ") if chr(code).isspace()
+    else ord(".")
+    for code in range(256)
+)
+_TOKEN_END = re.compile(r"\S*")
+_TOKEN = re.compile(r"\S+")
+
+
+# :data:`_FIXES` for ASCII text title-cased with ``bytes.title``, where ``\b``
+# means the same as for ``str``. A match ends right before the letter to
+# lower-case, which is then changed in place.
+_ASCII_LETTER = rb"[A-Za-z]"
+_ASCII_FIXES: Dict[bytes, Pattern[bytes]] = {
+    b"'": re.compile(rb"'(?<=" + _ASCII_LETTER + rb"')(?=(?:S|T|D|M|Re|Ve|Ll)\b)"),
+    b"-": re.compile(rb"-(?<=" + _ASCII_LETTER + rb"-)(?=" + _ASCII_LETTER + rb")"),
+    **{
+        digit.encode(): re.compile(digit.encode() + rb"(?=(?:St|Nd|Rd|Th|S)\b)")
+        for digit in string.digits
+    },
+}
+_ASCII_LOWER = bytes(range(256)).lower()
+
+
+def _title_ascii(text: str, data: bytes) -> str:
+    """:func:`title_case` for ASCII *text*, whose bytes are *data*."""
+
+    titled = data.title()
+    fixed = bytearray(titled)
+    for literal, pattern in _ASCII_FIXES.items():
+        if literal in data:
+            for match in pattern.finditer(titled):
+                fixed[match.end()] = _ASCII_LOWER[fixed[match.end()]]
+    # Without lower-case letters, only a hyphen can start a mixed-case token.
+    if not (data.islower() or data.isupper() and b"-" not in data):
+        for start, end in _mixed_spans(text, data):
+            fixed[start:end] = data[start:end]
+    return fixed.decode("ascii")
+
+
+def _literals(text: str) -> List[str]:
+    """The :data:`_FIXES` keys that occur in *text* (single-character searches are cheap)."""
+
+    return [literal for literal in _FIXES if literal in text]
+
+
+def _repair(titled: str, literals: Iterable[str]) -> str:
+    for literal in literals:
+        # Cheaper than ``sub`` with a callback once there are many matches.
+        parts = _FIXES[literal].split(titled)
+        if len(parts) > 1:
+            parts[1::2] = [part.lower() for part in parts[1::2]]
+            titled = "".join(parts)
+    return titled
+
+
+def _mixed_spans(text: str, data: Optional[bytes]) -> List[Tuple[int, int]]:
+    """Token spans to keep as typed; *data* is *text* in Latin-1, if it fits."""
+
+    spans: List[Tuple[int, int]] = []
+    if data is not None:
+        shape = data.translate(_SHAPE)
+        position = shape.find(b"aA")
+        while position >= 0:
+            end = shape.find(b" ", position)
+            end = len(shape) if end < 0 else end
+            spans.append((shape.rfind(b" ", 0, position) + 1, end))
+            position = shape.find(b"aA", end)
+        return spans
+    if b"A" not in text.encode("latin-1", "ignore").translate(_SHAPE):
+        return spans  # no Latin-1 capitals at all, so nothing for the regex to find
+    for position in (match.start() - 1 for match in _MIXED.finditer(text)):
+        if spans and position < spans[-1][1]:
+            continue  # same token as the previous match
+        start = position
+        while start and not text[start - 1].isspace():
+            start -= 1
+        spans.append((start, _TOKEN_END.match(text, position).end()))
+    return spans
+
+
+def _title_token(token: str, title: Callable[[str], str]) -> str:
+    if _MIXED.search(token):
+        return token
+    return _repair(title(token), _literals(token))
+
+
+def title_case(text: str, *, casing: Optional[LocaleCasing] = None) -> str:
+    """Return *text* in title case (see the module docstring for the rules).
+
+    ``casing`` supplies a locale's title casing for the underlying
+    ``str.title`` step (see :mod:`conversion.locales`).
+    """
+
+    if casing is None and text.isascii():
+        return _title_ascii(text, text.encode("ascii"))
+    try:
+        # One byte per character, so byte offsets are character offsets.
+        data: Optional[bytes] = text.encode("latin-1")
+    except UnicodeEncodeError:
+        data = None
+    title: Callable[[str], str] = str.title if casing is None else casing.title
+    fixed = _repair(title(text), _literals(text))
+    if len(fixed) != len(text):
+        # A letter changed length ("ß" -> "Ss"), so offsets into the original
+        # no longer line up; repair token by token instead.
+        return _TOKEN.sub(lambda match: _title_token(match.group(), title), text)
+    spans = _mixed_spans(text, data)
+    if not spans:
+        return fixed
+    pieces = []
+    last = 0
+    for start, end in spans:
+        pieces.append(fixed[last:start])
+        pieces.append(text[start:end])
+        last = end
+    pieces.append(fixed[last:])
+    return "".join(pieces)
+
+
+__all__ = ["title_case"]
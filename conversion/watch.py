@@ -0,0 +1,294 @@
+"""Convert files below a directory as they are written.
+
+On Linux the directory tree is watched with inotify, so only files that were
+actually written are looked at. Elsewhere (or when inotify is unavailable) a
+polling backend compares ``stat`` snapshots of the tree.
+
+Events for the same path are debounced: a file is handled once it has been
+quiet for ``debounce`` seconds. Handlers run on a small thread pool, with at
+most one job per path in flight. After a handler rewrites a file its new
+size/mtime are remembered so the event caused by our own write is dropped.
+A file saved again while it is being converted is not overwritten: the
+conversion is dropped and the new save's event converts it afresh.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Protocol, Set, Tuple
+
+from .manifest import is_hidden_name
+
+WATCH_DEBOUNCE_SECONDS = 0.5
+WATCH_POLL_SECONDS = 1.0
+WATCH_WORKERS = 2
+
+Signature = Tuple[int, int]
+
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ISDIR = 0x40000000
+_WATCH_MASK = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class WatchBackend(Protocol):
+    def read(self, timeout: float) -> List[str]:
+        """Return paths that changed, waiting at most *timeout* seconds."""
+
+    def close(self) -> None:
+        ...
+
+
+def is_hidden(path: str, root: str) -> bool:
+    """Whether *path* is, or lies in, a hidden file or directory below *root*."""
+
+    relative = os.path.relpath(path, root)
+    return any(is_hidden_name(part) for part in Path(relative).parts)
+
+
+def _visible_subdirs(subdirs: List[str]) -> None:
+    # .git, .venv and the like are never watched or converted.
+    subdirs[:] = [name for name in subdirs if not is_hidden_name(name)]
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    for directory, subdirs, files in os.walk(root):
+        _visible_subdirs(subdirs)
+        for name in files:
+            yield os.path.join(directory, name)
+
+
+def file_signature(path: str) -> Optional[Signature]:
+    """``(size, mtime_ns)`` of *path*, or None if it cannot be stat'ed."""
+
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+class PollingBackend:
+    """Detect changes by comparing ``(size, mtime_ns)`` snapshots of the tree."""
+
+    def __init__(self, root: str, interval: float = WATCH_POLL_SECONDS) -> None:
+        self._root = root
+        self._interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+        self._closed = threading.Event()
+
+    def _scan(self) -> Dict[str, Signature]:
+        snapshot = {}
+        for path in _walk_files(self._root):
+            signature = file_signature(path)
+            if signature is not None:
+                snapshot[path] = signature
+        return snapshot
+
+    def read(self, timeout: float) -> List[str]:
+        if self._closed.wait(max(0.0, min(timeout, self._next_scan - time.monotonic()))):
+            return []
+        if time.monotonic() < self._next_scan:
+            return []
+        self._next_scan = time.monotonic() + self._interval
+        snapshot = self._scan()
+        changed = [path for path, signature in snapshot.items() if self._snapshot.get(path) != signature]
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        self._closed.set()
+
+
+class InotifyBackend:
+    """Recursive inotify watch implemented with :mod:`ctypes`."""
+
+    def __init__(self, root: str) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._root = root
+        self._directories: Dict[int, str] = {}
+        self._watch_tree(root)
+
+    def _watch_tree(self, top: str) -> List[str]:
+        """Watch *top* and its subdirectories; return the files already there."""
+
+        existing: List[str] = []
+        if is_hidden(top, self._root):
+            return existing
+        for directory, subdirs, files in os.walk(top):
+            _visible_subdirs(subdirs)
+            wd = self._add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+            if wd >= 0:
+                self._directories[wd] = directory
+            existing.extend(os.path.join(directory, name) for name in files)
+        return existing
+
+    def read(self, timeout: float) -> List[str]:
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        changed: List[str] = []
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & _IN_Q_OVERFLOW:
+                # Events were lost: fall back to looking at everything once.
+                changed.extend(_walk_files(self._root))
+                continue
+            if mask & _IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # Files can land in a new directory before it is watched.
+                    changed.extend(self._watch_tree(path))
+            elif mask & (_IN_CLOSE_WRITE | _IN_MOVED_TO):
+                changed.append(path)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def open_backend(root: str, *, poll_interval: float = WATCH_POLL_SECONDS) -> WatchBackend:
+    """Return an inotify backend on Linux, a polling backend elsewhere."""
+
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyBackend(root)
+        except (OSError, AttributeError):
+            pass  # no inotify (old libc, exhausted watch limit): poll instead
+    return PollingBackend(root, poll_interval)
+
+
+class DirectoryWatcher:
+    """Debounce change events below *root* and feed them to *handler*.
+
+    *handler* receives the path of a changed file and returns True when it
+    rewrote the file. Exceptions are passed to *on_error* (if given).
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        handler: Callable[[str], bool],
+        *,
+        debounce: float = WATCH_DEBOUNCE_SECONDS,
+        workers: int = WATCH_WORKERS,
+        backend: Optional[WatchBackend] = None,
+        on_error: Optional[Callable[[str, BaseException], None]] = None,
+    ) -> None:
+        self.root = os.path.abspath(root)
+        self._handler = handler
+        self._debounce = debounce
+        self._workers = max(1, workers)
+        self._backend = backend if backend is not None else open_backend(self.root)
+        self._on_error = on_error
+        self._due: Dict[str, float] = {}
+        self._running: Set[str] = set()
+        self._own_writes: Dict[str, Signature] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def run(self) -> None:
+        """Process events until :meth:`stop` is called."""
+
+        with ThreadPoolExecutor(self._workers, thread_name_prefix="caseMonster-watch") as pool:
+            try:
+                while not self._stop.is_set():
+                    for path in self._backend.read(self._wait_time()):
+                        if is_hidden(path, self.root):
+                            continue
+                        self._due[path] = time.monotonic() + self._debounce
+                    self._dispatch(pool)
+            finally:
+                self._backend.close()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _wait_time(self) -> float:
+        # Short enough to notice stop() and pick up debounced paths promptly.
+        if not self._due:
+            return 0.2
+        return min(max(min(self._due.values()) - time.monotonic(), 0.02), 0.2)
+
+    def _dispatch(self, pool: ThreadPoolExecutor) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for path, deadline in list(self._due.items()):
+                if deadline > now or path in self._running:
+                    continue
+                if len(self._running) >= self._workers:
+                    break  # pool busy: leave the rest queued, never pile up jobs
+                del self._due[path]
+                if self._own_writes.pop(path, None) == file_signature(path):
+                    continue  # the event for our own rewrite
+                self._running.add(path)
+                pool.submit(self._handle, path).add_done_callback(
+                    lambda _future, path=path: self._finished(path)
+                )
+
+    def _handle(self, path: str) -> None:
+        try:
+            if self._handler(path):
+                signature = file_signature(path)
+                if signature is not None:
+                    with self._lock:
+                        self._own_writes[path] = signature
+        except FileNotFoundError:
+            pass  # removed before we got to it (e.g. an editor's temp file)
+        except Exception as exc:
+            if self._on_error is not None:
+                self._on_error(path, exc)
+
+    def _finished(self, path: str) -> None:
+        with self._lock:
+            self._running.discard(path)
+
+
+__all__ = [
+    "DirectoryWatcher",
+    "InotifyBackend",
+    "PollingBackend",
+    "WATCH_DEBOUNCE_SECONDS",
+    "WATCH_POLL_SECONDS",
+    "WATCH_WORKERS",
+    "WatchBackend",
+    "file_signature",
+    "is_hidden",
+    "open_backend",
+]
@@ -3,137 +3,267 @@
 Third-party dependencies:
 - pyperclip (tested with 1.8.2)
 - pyautogui (tested with 0.9.54)
+
+Both are imported lazily: pyautogui connects to the display when imported,
+which file conversions never need.
 """
 
 from __future__ import annotations
 
 import argparse
+import io
+import os
 import sys
 import time
+from functools import partial
 from pathlib import Path
-from typing import Callable
-
-try:
-    import pyautogui as _pyautogui
-except Exception as exc:  # pragma: no cover - import guard for optional dependency
-    _pyautogui = None
-    _PYAUTOGUI_IMPORT_ERROR = exc
-else:
-    _PYAUTOGUI_IMPORT_ERROR = None
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence, TextIO
 
+import clipboard
 from clipboard import (
+    PLAIN_TEXT,
     ClipboardUnavailable,
     copy as clipboard_copy,
+    copy_flavours as clipboard_copy_flavours,
     paste as clipboard_paste,
+    paste_flavours as clipboard_paste_flavours,
 )
 
+from conversion import (
+    BatchReport,
+    ChunkTransformer,
+    SentenceCaser,
+    WordBufferedTransformer,
+    convert_in_place,
+    convert_stream,
+    convert_tree,
+    iter_convert,
+    iter_decoded,
+    sentence_case,
+    sniff_file,
+)
+from conversion.casediff import DiffStats, describe_stats, format_change, iter_line_changes
+from conversion.detect import detect_style, next_style
+from conversion.dictionary import (
+    DICTIONARY_NAME,
+    CasingDictionary,
+    DictionaryFile,
+    DictionaryTransformer,
+)
+from conversion.fanout import expand_output_template
+from conversion.identifiers import IDENTIFIER_MODES, identifier_case
+from conversion.locales import (
+    NORMALIZATION_FORMS,
+    SUPPORTED_LOCALES,
+    LocaleCasing,
+    NormalizingTransformer,
+    get_casing,
+)
+from conversion.manifest import is_artifact, iter_tree
+from conversion.protect import ProtectingTransformer, convert_protected
+from conversion.registry import TransformRegistry
+from conversion.richtext import RICH_FLAVOURS, RichTextTransformer
+from conversion.rules import Rules, RulesFile, RuleTransformer
+from conversion.titlecase import title_case as _title_case
 from platform_utils import primary_modifier_key, supports_alt_tab
 
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from conversion.archives import ArchiveReport
+    from conversion.lineindex import LineRange, RangeResult
+
 
 Transform = Callable[[str], str]
+# Converts a rich-text clipboard flavour: (MIME type, document) -> document.
+RichTransform = Callable[[str, str], str]
 
 
-def _cap_sentences(text: str) -> str:
-    sentences = text.split(".")
-    transformed = ["".join(_cap_first_letter(list(sentence))) for sentence in sentences]
-    result = _cap_special(".".join(transformed))
+def funky(text: str) -> str:
+    return sentence_case(text, upper_first=False)
 
-    trailing_newlines = len(text) - len(text.rstrip("\r\n"))
-    leading_newlines = len(text) - len(text.lstrip("\r\n"))
 
-    if trailing_newlines:
-        if leading_newlines == 0:
-            result = result.rstrip("\r\n")
-        else:
-            stripped = result.rstrip("\r\n")
-            result = stripped + text[-trailing_newlines:]
+def _sentence_case(text: str) -> str:
+    return sentence_case(text, rules=casing_dictionary().sentence_rules)
+
+
+def _sentence_stream(**options: Any) -> SentenceCaser:
+    return SentenceCaser(rules=casing_dictionary().sentence_rules, **options)
+
+
+# Every conversion mode: the built-ins below, plugins declared as
+# ``casemonster.transforms`` entry points, and user rules (see use_rules).
+# The GUI buttons, tray menu, Explorer menu and CLI modes all come from it.
+TRANSFORMS = TransformRegistry()
+for _mode, _transform, _label, _title, _description in (
+    ("upper", str.upper, "Upper", "Upper case", "Convert to UPPERCASE"),
+    ("lower", str.lower, "Lower", "Lower case", "Convert to lowercase"),
+    ("title", _title_case, "Title", "Title case", "Convert to Title Case"),
+    ("sentence", _sentence_case, "Sentence", "Sentence case", "Convert to Sentence case"),
+):
+    TRANSFORMS.register(
+        _mode,
+        _transform,
+        label=_label,
+        title=_title,
+        description=_description,
+        category="case",
+        # Sentence rules carry state across chunk boundaries, so the mode has
+        # its own incremental implementation; everything else is word-buffered.
+        stream=_sentence_stream if _mode == "sentence" else None,
+    )
+for _mode, _label, _title in (
+    ("camel", "camelCase", "camelCase"),
+    ("pascal", "PascalCase", "PascalCase"),
+    ("snake", "snake_case", "snake_case"),
+    ("kebab", "kebab-case", "kebab-case"),
+    ("constant", "CONSTANT", "CONSTANT_CASE"),
+):
+    TRANSFORMS.register(
+        _mode,
+        partial(identifier_case, mode=_mode),
+        label=_label,
+        title=_title,
+        description=f"Convert to {_title}",
+        category="identifier",
+    )
+BUILTIN_MODES = frozenset(("upper", "lower", "title", "sentence", *IDENTIFIER_MODES))
+
+# Modes whose casing follows the selected locale (``--locale``).
+LOCALE_TRANSFORMS: dict[str, Callable[[LocaleCasing], Transform]] = {
+    "upper": lambda casing: casing.upper,
+    "lower": lambda casing: casing.lower,
+    "title": lambda casing: partial(_title_case, casing=casing),
+    "sentence": lambda casing: partial(
+        sentence_case, casing=casing, rules=casing_dictionary().sentence_rules
+    ),
+}
 
-    return result
+# Modes that consult the user dictionary, and whether they apply its stop words.
+DICTIONARY_MODES: dict[str, bool] = {
+    "title": True,
+    "sentence": False,
+}
 
+# Next to the Kivy config, which lives beside the application module.
+DEFAULT_DICTIONARY_PATH = Path(__file__).resolve().parent / DICTIONARY_NAME
+_dictionary = DictionaryFile(DEFAULT_DICTIONARY_PATH)
 
-def _cap_special(text: str) -> str:
-    fin: list[str] = []
-    caps = False
 
-    for char in text:
-        if char in ["\t", "\n", "\r"]:
-            fin.append(char)
-            caps = True
-        elif caps:
-            fin.append(char.upper())
-            caps = False
-        else:
-            fin.append(char)
-
-    return "".join(fin)
-
-
-def _cap_first_letter(characters: list[str]) -> list[str]:
-    fin_list: list[str] = []
-    symbols = ["!", "?"]
-    caps = True
-
-    for index, char in enumerate(characters):
-        if char == " ":
-            fin_list.append(char)
-        elif char in symbols:
-            fin_list.append(char)
-            caps = True
-        elif char.isalpha() and caps:
-            fin_list.append(char.upper())
-            caps = False
-        elif char.isalpha():
-            if (
-                char.lower() == "i"
-                and fin_list
-                and fin_list[-1] == " "
-                and (
-                    index + 1 == len(characters)
-                    or characters[index + 1]
-                    in [" ", ".", "!", "?", "\n"]
-                )
-            ):
-                fin_list.append(char.upper())
-            elif (
-                char.lower() == "i"
-                and index + 1 < len(characters)
-                and characters[index + 1] in ["’", "'"]
-            ):
-                fin_list.append(char.upper())
-            else:
-                fin_list.append(char.lower())
-        else:
-            fin_list.append(char.lower())
+def use_dictionary(path: Path) -> DictionaryFile:
+    """Read preserved spellings and stop words from *path* from now on."""
 
-    return fin_list
+    global _dictionary
+    if Path(path) != _dictionary.path:
+        _dictionary = DictionaryFile(path)
+    return _dictionary
 
 
-def funky(text: str) -> str:
-    return _cap_sentences(text)
+def casing_dictionary() -> CasingDictionary:
+    """The user dictionary as it is on disk now (re-read if it changed)."""
 
+    return _dictionary.current()
 
-def _sentence_case(text: str) -> str:
-    return funky(text.upper())
 
+# User rules (``[rule:NAME]`` sections of the GUI config) add modes of their
+# own; their ``case`` can be any built-in or plugin mode.
+DEFAULT_RULES_PATH = Path(__file__).resolve().parent / "casemonster.ini"
+_RULE_OPERATIONS = TRANSFORMS.without("rule")
+_rules = RulesFile(DEFAULT_RULES_PATH, _RULE_OPERATIONS, {"cycle"})
 
-TRANSFORMS: dict[str, Transform] = {
-    "upper": str.upper,
-    "lower": str.lower,
-    "title": str.title,
-    "sentence": _sentence_case,
-}
+
+def user_rules() -> Rules:
+    """The user rules as they are on disk now (recompiled if they changed)."""
+
+    return _rules.current()
 
 
+def _apply_rules(mode: str, text: str) -> str:
+    return user_rules().apply(mode, text)
+
+
+def _rule_stream(mode: str, **_options: Any) -> ChunkTransformer:
+    return RuleTransformer(user_rules, mode)
+
+
+def use_rules(path: Path) -> RulesFile:
+    """Read user rules from *path* and register their modes.
+
+    Edits to the patterns are picked up by the next conversion; added or
+    removed modes are registered by calling this again.
+    """
+
+    global _rules
+    if Path(path) != _rules.path:
+        _rules = RulesFile(path, _RULE_OPERATIONS, {"cycle"})
+    modes = user_rules().modes
+    for spec in TRANSFORMS.specs("rule"):
+        if spec.name not in modes:
+            TRANSFORMS.unregister(spec.name)
+    for mode in sorted(modes):
+        TRANSFORMS.register(
+            mode,
+            partial(_apply_rules, mode),
+            description=f"Apply the {mode} rules",
+            category="rule",
+            stream=partial(_rule_stream, mode),
+        )
+    return _rules
+
+
+def rule_modes() -> list[str]:
+    """The registered user-rule modes, in name order."""
+
+    return sorted(spec.name for spec in TRANSFORMS.specs("rule"))
+
+
+def output_fingerprint(mode: str) -> str:
+    """Changes whenever a user file changes what *mode* produces."""
+
+    if mode in DICTIONARY_MODES:
+        return casing_dictionary().fingerprint
+    if mode in user_rules().modes:
+        return user_rules().fingerprint
+    return ""
+
+
+FANOUT_DEFAULT_TEMPLATE = "{parent}/{stem}.{mode}{suffix}"
+
 MODIFIER_KEY = primary_modifier_key()
 
+_pyautogui: Any = None
+_PYAUTOGUI_IMPORT_ERROR: Optional[BaseException] = None
+
+
+def _load_automation_backend() -> Any:
+    global _pyautogui, _PYAUTOGUI_IMPORT_ERROR
+    if _pyautogui is None and _PYAUTOGUI_IMPORT_ERROR is None:
+        try:
+            import pyautogui as backend
+        except Exception as exc:  # pragma: no cover - import guard for optional dependency
+            _PYAUTOGUI_IMPORT_ERROR = exc
+        else:
+            _pyautogui = backend
+    return _pyautogui
+
 
 def _require_automation_backend():
-    if _pyautogui is None:
+    backend = _load_automation_backend()
+    if backend is None:
         raise ClipboardUnavailable(
             "pyautogui is required for clipboard automation. "
             "Install it with 'pip install pyautogui' to enable the GUI actions."
         ) from _PYAUTOGUI_IMPORT_ERROR
-    return _pyautogui
+    return backend
+
+
+def prewarm_backends() -> None:
+    """Import the automation and clipboard backends ahead of first use.
+
+    Safe to call from a background thread; failures are deferred until an
+    action actually needs the backend.
+    """
+
+    _load_automation_backend()
+    clipboard.prewarm()
 
 
 def _maybe_switch_window():
@@ -161,79 +291,686 @@ def transform_clipboard(
     source_text: str | None = None,
     *,
     paste: bool = True,
+    rich: RichTransform | None = None,
 ) -> tuple[str, str]:
+    """Convert the selection (or *source_text*) with *transform* and paste it back.
+
+    With *rich*, HTML and RTF copies of the selection are converted by it
+    and put back alongside the plain text, so formatting survives.
+    """
+
     _maybe_switch_window()
+    flavours: dict[str, str] = {}
     if source_text is None:
         _copy_selection()
-        source_text = clipboard_paste()
+        if rich is None:
+            source_text = clipboard_paste()
+        else:
+            flavours = clipboard_paste_flavours()
+            source_text = flavours.get(PLAIN_TEXT, "")
     transformed = transform(source_text)
-    clipboard_copy(transformed)
+    converted = _convert_flavours(flavours, rich) if rich is not None else {}
+    if converted:
+        clipboard_copy_flavours({PLAIN_TEXT: transformed, **converted})
+    else:
+        clipboard_copy(transformed)
     if paste:
         _paste_selection()
     time.sleep(0.01)
     return source_text, transformed
 
 
-def upper_case(source_text: str | None = None, *, paste: bool = True) -> tuple[str, str]:
-    return transform_clipboard(TRANSFORMS["upper"], source_text, paste=paste)
+def upper_case(
+    source_text: str | None = None, *, paste: bool = True, protect: bool = True
+) -> tuple[str, str]:
+    return transform_clipboard(
+        _transform("upper", protect=protect),
+        source_text,
+        paste=paste,
+        rich=_rich_transform("upper", protect=protect),
+    )
 
 
-def lower_case(source_text: str | None = None, *, paste: bool = True) -> tuple[str, str]:
-    return transform_clipboard(TRANSFORMS["lower"], source_text, paste=paste)
+def lower_case(
+    source_text: str | None = None, *, paste: bool = True, protect: bool = True
+) -> tuple[str, str]:
+    return transform_clipboard(
+        _transform("lower", protect=protect),
+        source_text,
+        paste=paste,
+        rich=_rich_transform("lower", protect=protect),
+    )
 
 
-def title_case(source_text: str | None = None, *, paste: bool = True) -> tuple[str, str]:
-    return transform_clipboard(TRANSFORMS["title"], source_text, paste=paste)
+def title_case(
+    source_text: str | None = None, *, paste: bool = True, protect: bool = True
+) -> tuple[str, str]:
+    return transform_clipboard(
+        _transform("title", protect=protect),
+        source_text,
+        paste=paste,
+        rich=_rich_transform("title", protect=protect),
+    )
 
 
-def funky_case(source_text: str | None = None, *, paste: bool = True) -> tuple[str, str]:
-    return transform_clipboard(TRANSFORMS["sentence"], source_text, paste=paste)
+def funky_case(
+    source_text: str | None = None, *, paste: bool = True, protect: bool = True
+) -> tuple[str, str]:
+    return transform_clipboard(
+        _transform("sentence", protect=protect),
+        source_text,
+        paste=paste,
+        rich=_rich_transform("sentence", protect=protect),
+    )
 
 
-def convert_text(text: str, mode: str) -> str:
+def _base_transform(mode: str, casing: LocaleCasing | None = None) -> Transform:
+    if casing is not None and mode in LOCALE_TRANSFORMS:
+        return LOCALE_TRANSFORMS[mode](casing)
     try:
-        transform = TRANSFORMS[mode]
-    except KeyError as exc:  # pragma: no cover - defensive guard
+        return TRANSFORMS[mode]
+    except KeyError as exc:
         raise ValueError(f"Unsupported mode: {mode}") from exc
+
+
+def _with_dictionary(
+    transform: Transform, dictionary: CasingDictionary, title: bool, text: str
+) -> str:
+    return dictionary.apply(transform(text), title=title)
+
+
+def convert_clipboard(
+    mode: str, source_text: str | None = None, *, paste: bool = True, protect: bool = True
+) -> tuple[str, str]:
+    """Convert the selection (or *source_text*) with any mode in :data:`TRANSFORMS`."""
+
+    return transform_clipboard(
+        _transform(mode, protect=protect),
+        source_text,
+        paste=paste,
+        rich=_rich_transform(mode, protect=protect),
+    )
+
+
+def cycle_case(
+    rotation: Sequence[str],
+    source_text: str | None = None,
+    *,
+    paste: bool = True,
+    protect: bool = True,
+) -> tuple[str, str]:
+    """Convert the selection to the mode after its current style in *rotation*."""
+
+    chosen: list[str] = []
+
+    def convert(text: str) -> str:
+        chosen.append(next_style(detect_style(text), rotation))
+        return convert_text(text, chosen[-1], protect=protect)
+
+    def convert_rich(flavour: str, document: str) -> str:
+        # The plain text is converted first and decides the mode.
+        return convert_rich_text(document, chosen[-1], flavour, protect=protect)
+
+    return transform_clipboard(convert, source_text, paste=paste, rich=convert_rich)
+
+
+def _transform(
+    mode: str, casing: LocaleCasing | None = None, *, protect: bool = False
+) -> Transform:
+    transform = _base_transform(mode, casing)
+    dictionary = casing_dictionary()
+    if mode in DICTIONARY_MODES and not dictionary.empty:
+        transform = partial(_with_dictionary, transform, dictionary, DICTIONARY_MODES[mode])
+    if protect:
+        # URLs, e-mail addresses, paths and code are left as they are.
+        transform = partial(convert_protected, transform=transform)
+    return transform
+
+
+def convert_text(
+    text: str, mode: str, *, casing: LocaleCasing | None = None, protect: bool = False
+) -> str:
+    transform = _transform(mode, casing, protect=protect)
+    if casing is not None:
+        text = casing.normalized(text)
     return transform(text)
 
 
-def _convert_file(path: Path, mode: str, in_place: bool) -> None:
-    text = path.read_text(encoding="utf-8")
-    transformed = convert_text(text, mode)
-    if in_place:
-        path.write_text(transformed, encoding="utf-8")
+def convert_rich_text(
+    document: str,
+    mode: str,
+    flavour: str = RICH_FLAVOURS[0],
+    *,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> str:
+    """Convert the text of an HTML or RTF *document*, leaving its markup as it is."""
+
+    inner = stream_transformer(mode, keep_trailing_newlines=True, casing=casing, protect=protect)
+    return "".join(iter_convert([document], RichTextTransformer(inner, flavour)))
+
+
+def _rich_transform(mode: str, *, protect: bool = False) -> RichTransform:
+    return lambda flavour, document: convert_rich_text(document, mode, flavour, protect=protect)
+
+
+def _convert_flavours(flavours: dict[str, str], rich: RichTransform) -> dict[str, str]:
+    """The rich-text flavours among *flavours*, converted with *rich*."""
+
+    return {
+        flavour: rich(flavour, document)
+        for flavour, document in flavours.items()
+        if flavour in RICH_FLAVOURS
+    }
+
+
+def stream_transformer(
+    mode: str,
+    *,
+    keep_trailing_newlines: bool = False,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> ChunkTransformer:
+    """Return a fresh incremental transformer for *mode*.
+
+    ``keep_trailing_newlines`` is for output that is spliced between other
+    text, such as a line range. ``casing`` selects a locale's casing rules
+    and normalisation form (see :func:`conversion.locales.get_casing`).
+    Title and sentence output also goes through the user dictionary.
+    ``protect`` leaves URLs, e-mail addresses, paths and code unchanged.
+    """
+
+    transform = _base_transform(mode, casing)
+    factory = TRANSFORMS.stream_factory(mode)
+    if factory is None:
+        transformer: ChunkTransformer = WordBufferedTransformer(transform)
+    elif casing is None or mode not in LOCALE_TRANSFORMS:
+        transformer = factory(keep_trailing_newlines=keep_trailing_newlines)
     else:
-        sys.stdout.write(transformed)
+        transformer = factory(keep_trailing_newlines=keep_trailing_newlines, casing=casing)
+    dictionary = casing_dictionary()
+    if mode in DICTIONARY_MODES and not dictionary.empty:
+        transformer = DictionaryTransformer(
+            transformer, dictionary, title=DICTIONARY_MODES[mode]
+        )
+    if protect:
+        transformer = ProtectingTransformer(transformer)
+    if casing is not None and casing.normalize:
+        transformer = NormalizingTransformer(transformer, casing)
+    return transformer
+
+
+def _stream_factory(
+    casing: LocaleCasing | None, protect: bool = False
+) -> Callable[[str], ChunkTransformer]:
+    if casing is None and not protect:
+        return stream_transformer
+    return partial(stream_transformer, casing=casing, protect=protect)
+
+
+def _mode_label(mode: str, casing: LocaleCasing | None, protect: bool = False) -> str:
+    """*mode* as recorded in a manifest: a locale, user file or protection changes the output."""
+
+    parts = [mode]
+    if casing is not None:
+        parts += [casing.name, casing.normalize]
+    parts.append(output_fingerprint(mode))
+    if protect:
+        parts.append("protect")
+    return "@".join(filter(None, parts))
+
+
+def _is_archive(path: Path) -> bool:
+    from conversion.archives import archive_kind
+
+    return archive_kind(path) is not None
+
+
+def _convert_archive(
+    path: Path,
+    mode: str,
+    destination: Path,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> ArchiveReport:
+    from conversion.archives import convert_archive
+
+    return convert_archive(path, destination, partial(_stream_factory(casing, protect), mode))
+
+
+def _convert_file(
+    path: Path,
+    mode: str,
+    in_place: bool,
+    stdout: TextIO | None = None,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> None:
+    if _is_archive(path):
+        if not in_place:
+            raise ValueError(f"{path} is an archive; convert it with --in-place or --output")
+        _convert_archive(path, mode, path, casing, protect)
+        return
+    encoding = sniff_file(path)
+    if encoding is None:
+        raise ValueError(f"{path} does not look like a text file")
+    if in_place:
+        # Written to a temporary file in the original encoding, then swapped in.
+        convert_in_place(
+            path, stream_transformer(mode, casing=casing, protect=protect), encoding=encoding
+        )
+        return
+    sink = stdout or sys.stdout
+    with path.open("rb") as source:
+        source.seek(len(encoding.bom))
+        transformer = stream_transformer(mode, casing=casing, protect=protect)
+        for output in iter_convert(iter_decoded(source, encoding), transformer):
+            sink.write(output)
+
+
+def _convert_lines(
+    path: Path,
+    mode: str,
+    lines: LineRange,
+    in_place: bool,
+    stdout: TextIO | None = None,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> RangeResult:
+    from conversion.lineindex import convert_line_range
+
+    encoding = sniff_file(path)
+    if encoding is None:
+        raise ValueError(f"{path} does not look like a text file")
+    transformer = stream_transformer(
+        mode, keep_trailing_newlines=True, casing=casing, protect=protect
+    )
+    return convert_line_range(
+        path, encoding, lines, transformer, in_place=in_place, stdout=stdout or sys.stdout
+    )
+
+
+def _convert_directory(
+    path: Path,
+    mode: str,
+    manifest: Path | None = None,
+    prune: bool = False,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> BatchReport:
+    label = _mode_label(mode, casing, protect)
+    return convert_tree(
+        path,
+        label,
+        lambda _label: stream_transformer(mode, casing=casing, protect=protect),
+        manifest_path=manifest,
+        prune=prune,
+    )
+
+
+def _preview_changes(
+    target: Path,
+    mode: str,
+    *,
+    show_lines: bool,
+    stdout: TextIO | None = None,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> DiffStats:
+    """Report what converting *target* (a file or a tree) would change."""
+
+    sink = stdout or sys.stdout
+    paths = iter_tree(target) if target.is_dir() else [target]
+    total_lines = total_characters = files = 0
+    for path in paths:
+        encoding = sniff_file(path)
+        if encoding is None:
+            continue
+        lines = characters = 0
+        try:
+            with path.open("rb") as source:
+                source.seek(len(encoding.bom))
+                transformer = stream_transformer(mode, casing=casing, protect=protect)
+                changes = iter_line_changes(iter_decoded(source, encoding), transformer)
+                for change in changes:
+                    if show_lines:
+                        if not lines:
+                            sink.write(f"--- {path}\n")
+                        sink.write(format_change(change))
+                    lines += 1
+                    characters += change.changed
+        except UnicodeDecodeError as exc:
+            # A truncated UTF-16/32 file; a directory conversion would report it too.
+            print(f"caseMonster: {path}: {type(exc).__name__}: {exc}", file=sys.stderr)
+            continue
+        if lines:
+            files += 1
+            total_lines += lines
+            total_characters += characters
+            sink.write(f"{path}: {describe_stats(DiffStats(lines, characters))}\n")
+    stats = DiffStats(total_lines, total_characters)
+    if target.is_dir():
+        sink.write(f"caseMonster: {files} file(s), {describe_stats(stats)}\n")
+    return stats
+
+
+def _fanout_file(
+    path: Path,
+    modes: list[str],
+    template: str,
+    casing: LocaleCasing | None = None,
+    protect: bool = False,
+) -> None:
+    from conversion.fanout import fanout_file
+
+    targets = {mode: expand_output_template(template, path, mode) for mode in modes}
+    for target in fanout_file(path, targets, _stream_factory(casing, protect)).values():
+        print(f"caseMonster: wrote {target}", file=sys.stderr)
+
+
+def _watch_directory(
+    path: Path, mode: str, casing: LocaleCasing | None = None, protect: bool = False
+) -> None:
+    from conversion.watch import DirectoryWatcher, file_signature, is_hidden
+
+    root = os.path.abspath(path)
+
+    def handle(changed: str) -> bool:
+        if is_hidden(changed, root) or is_artifact(Path(changed).name):
+            return False  # .git, editor swap files, our own temporary files
+        transformer = stream_transformer(mode, casing=casing, protect=protect)
+        before = file_signature(changed)
+        # A save during the conversion must not be overwritten with the old
+        # text; its own event converts the file again.
+        if not convert_in_place(
+            Path(changed), transformer, precondition=lambda: file_signature(changed) == before
+        ):
+            return False
+        print(f"caseMonster: converted {changed}", file=sys.stderr)
+        return True
+
+    def report(changed: str, exc: BaseException) -> None:
+        print(f"caseMonster: {changed}: {type(exc).__name__}: {exc}", file=sys.stderr)
+
+    watcher = DirectoryWatcher(path, handle, on_error=report)
+    print(f"caseMonster: watching {watcher.root} ({mode}); Ctrl+C to stop", file=sys.stderr)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        watcher.stop()
+
+
+def _convert_stdin(mode: str, casing: LocaleCasing | None = None, protect: bool = False) -> None:
+    # Binary-backed wrappers keep line endings and undecodable bytes intact.
+    source = io.TextIOWrapper(
+        sys.stdin.buffer, encoding="utf-8", errors="surrogateescape", newline=""
+    )
+    sink = io.TextIOWrapper(
+        sys.stdout.buffer, encoding="utf-8", errors="surrogateescape", newline=""
+    )
+    try:
+        convert_stream(source, sink, stream_transformer(mode, casing=casing, protect=protect))
+    finally:
+        sink.flush()
+        sink.detach()
+        source.detach()
 
 
 def _cli(argv: list[str]) -> int:
     parser = argparse.ArgumentParser(description="caseMonster text conversion utilities")
     parser.add_argument(
         "--convert",
-        choices=sorted(TRANSFORMS.keys()),
         required=True,
-        help="Conversion mode to apply",
+        metavar="MODE",
+        help=(
+            f"Conversion mode to apply: {', '.join(sorted(TRANSFORMS))}. "
+            "With --fanout, a comma-separated list of modes."
+        ),
     )
     parser.add_argument(
         "--target",
         type=Path,
-        help="Optional path to a text file to convert. If omitted, uses the clipboard.",
+        help=(
+            "Optional path to a text file to convert. If omitted, uses the clipboard. "
+            "Use '-' to filter stdin to stdout. A directory is converted recursively "
+            "in place (requires --in-place)."
+        ),
+    )
+    parser.add_argument(
+        "--stdin",
+        action="store_true",
+        help="Read text from stdin and stream the converted text to stdout.",
+    )
+    parser.add_argument(
+        "--watch",
+        type=Path,
+        metavar="DIR",
+        help="Keep running and convert text files below DIR in place as they are written.",
     )
     parser.add_argument(
         "--in-place",
         action="store_true",
         help="When used with --target, overwrite the file instead of printing to stdout.",
     )
+    parser.add_argument(
+        "--fanout",
+        action="store_true",
+        help="Write one output per --convert mode from a single read of --target.",
+    )
+    parser.add_argument(
+        "--output",
+        metavar="TEMPLATE",
+        help=(
+            "Output path template for --fanout and archive targets; fields: {parent}, "
+            f"{{name}}, {{stem}}, {{suffix}} and {{mode}} (--fanout default: {FANOUT_DEFAULT_TEMPLATE})."
+        ),
+    )
+    parser.add_argument(
+        "--lines",
+        metavar="START:END",
+        help=(
+            "Only convert lines START to END (1-based, inclusive) of a file --target; "
+            "either bound may be omitted."
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --target, report how many lines and characters would change; write nothing.",
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Like --dry-run, but also print every changed line with its changed columns.",
+    )
+    parser.add_argument(
+        "--locale",
+        choices=SUPPORTED_LOCALES,
+        help=(
+            "Case letters by this language's rules: Turkish/Azerbaijani dotted i, "
+            "Greek accents and final sigma, Dutch IJ, German capital sharp s."
+        ),
+    )
+    parser.add_argument(
+        "--normalize",
+        choices=NORMALIZATION_FORMS,
+        help="Unicode-normalise the text in the same pass as the conversion.",
+    )
+    parser.add_argument(
+        "--protect",
+        action="store_true",
+        help="Leave URLs, e-mail addresses, file paths and `code` unchanged.",
+    )
+    parser.add_argument(
+        "--dictionary",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "Dictionary of preserved spellings, title-case stop words and "
+            "sentence abbreviations "
+            f"(default: {DEFAULT_DICTIONARY_PATH.name} next to the GUI config)."
+        ),
+    )
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        metavar="FILE",
+        help=(
+            "Ini file whose [rule:NAME] sections define extra modes "
+            f"(default: {DEFAULT_RULES_PATH.name}, the GUI config)."
+        ),
+    )
+    parser.add_argument(
+        "--rule-timings",
+        action="store_true",
+        help="Time each rule of the --convert mode on --target (or the clipboard); convert nothing.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        help=(
+            "Manifest used to skip unchanged files when converting a directory "
+            "(default: .casemonster-manifest.json inside it)."
+        ),
+    )
+    parser.add_argument(
+        "--prune-manifest",
+        action="store_true",
+        help="Drop manifest entries for files that no longer exist.",
+    )
 
     args = parser.parse_args(argv)
+    if args.rules and not args.rules.is_file():
+        parser.error(f"--rules: no such file: {args.rules}")
+    rules = use_rules(args.rules or DEFAULT_RULES_PATH)
+    if rules.error is not None:
+        raise SystemExit(f"caseMonster: {rules.path}: {rules.error}")
+    modes = args.convert.split(",")
+    for mode in modes:
+        if mode not in TRANSFORMS:
+            choices = ", ".join(repr(name) for name in sorted(TRANSFORMS))
+            parser.error(f"argument --convert: invalid choice: {mode!r} (choose from {choices})")
+    casing = None
+    if args.locale or args.normalize:
+        casing = get_casing(args.locale, args.normalize)
+    if args.dictionary and not args.dictionary.is_file():
+        parser.error(f"--dictionary: no such file: {args.dictionary}")
+    dictionary = use_dictionary(args.dictionary or DEFAULT_DICTIONARY_PATH)
+    dictionary.current()
+    if dictionary.error is not None:
+        raise SystemExit(f"caseMonster: {dictionary.path}: {dictionary.error}")
+
+    if args.rule_timings:
+        rule_set = user_rules().modes.get(args.convert)
+        if rule_set is None:
+            parser.error("--rule-timings needs a --convert mode defined by --rules")
+        try:
+            text = args.target.read_text(encoding="utf-8") if args.target else clipboard_paste()
+        except (OSError, ClipboardUnavailable) as exc:
+            raise SystemExit(f"caseMonster: {exc}") from exc
+        for timing in rule_set.timings(text):
+            print(f"{timing.seconds * 1000:10.2f} ms {timing.matches:8} matches  {timing.name}")
+        return 0
+
+    if args.fanout:
+        if not args.target or not args.target.is_file():
+            parser.error("--fanout needs a file --target")
+        template = args.output or FANOUT_DEFAULT_TEMPLATE
+        if len(modes) > 1 and "{mode}" not in template:
+            parser.error("--output must contain {mode} when writing several variants")
+        try:
+            _fanout_file(args.target, modes, template, casing, args.protect)
+        except (KeyError, ValueError) as exc:
+            raise SystemExit(f"caseMonster: {exc}") from exc
+        return 0
+    if len(modes) > 1:
+        parser.error("several --convert modes need --fanout")
+
+    if args.stdin or str(args.target) == "-":
+        if args.in_place:
+            parser.error("--in-place cannot be used when reading stdin")
+        _convert_stdin(args.convert, casing, args.protect)
+        return 0
+
+    if args.watch:
+        if not args.watch.is_dir():
+            parser.error(f"--watch needs a directory: {args.watch}")
+        _watch_directory(args.watch, args.convert, casing, args.protect)
+        return 0
+
+    if args.dry_run or args.diff:
+        if not args.target:
+            parser.error("--dry-run and --diff need --target")
+        _preview_changes(
+            args.target, args.convert, show_lines=args.diff, casing=casing, protect=args.protect
+        )
+        return 0
+
+    if args.lines:
+        from conversion.lineindex import parse_line_range
+
+        if not args.target or not args.target.is_file() or _is_archive(args.target):
+            parser.error("--lines needs a text file --target")
+        try:
+            _convert_lines(
+                args.target,
+                args.convert,
+                parse_line_range(args.lines),
+                args.in_place,
+                casing=casing,
+                protect=args.protect,
+            )
+        except ValueError as exc:
+            raise SystemExit(f"caseMonster: {exc}") from exc
+        return 0
+
+    if args.target and args.target.is_file() and _is_archive(args.target):
+        if not (args.in_place or args.output):
+            parser.error("archive targets need --in-place or --output")
+        destination = args.target
+        try:
+            if args.output:
+                destination = expand_output_template(args.output, args.target, args.convert)
+            report = _convert_archive(
+                args.target, args.convert, destination, casing, args.protect
+            )
+        except (ValueError, OSError) as exc:
+            raise SystemExit(f"caseMonster: {exc}") from exc
+        print(f"caseMonster: {destination}: {report.summary()}", file=sys.stderr)
+        return 0
+
+    if args.target and args.target.is_dir():
+        if not args.in_place:
+            parser.error("converting a directory requires --in-place")
+        report = _convert_directory(
+            args.target, args.convert, args.manifest, args.prune_manifest, casing, args.protect
+        )
+        print(f"caseMonster: {report.summary()}", file=sys.stderr)
+        for name, message in report.failed.items():
+            print(f"caseMonster: {name}: {message}", file=sys.stderr)
+        return 1 if report.failed else 0
 
     if args.target:
-        _convert_file(args.target, args.convert, args.in_place)
+        try:
+            _convert_file(
+                args.target, args.convert, args.in_place, casing=casing, protect=args.protect
+            )
+        except ValueError as exc:
+            raise SystemExit(f"caseMonster: {exc}") from exc
         return 0
 
     try:
-        clipboard_copy(convert_text(clipboard_paste(), args.convert))
+        flavours = clipboard_paste_flavours()
+        text = convert_text(
+            flavours.get(PLAIN_TEXT, ""), args.convert, casing=casing, protect=args.protect
+        )
+        converted = _convert_flavours(
+            flavours,
+            lambda flavour, document: convert_rich_text(
+                document, args.convert, flavour, casing=casing, protect=args.protect
+            ),
+        )
+        clipboard_copy_flavours({PLAIN_TEXT: text, **converted})
     except ClipboardUnavailable as exc:
         raise SystemExit(str(exc)) from exc
     return 0
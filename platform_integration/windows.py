@@ -20,12 +20,15 @@ _CONTEXT_LOCATIONS = [
     r"Software\Classes\Directory\shell",
 ]
 
-_MODES = {
-    "upper": "Convert to UPPERCASE",
-    "lower": "Convert to lowercase",
-    "title": "Convert to Title Case",
-    "sentence": "Convert to Sentence case",
-}
+_KEY_PREFIX = "caseMonster_"
+
+
+def _modes() -> dict[str, str]:
+    """Explorer menu text of every conversion mode, from the transform registry."""
+
+    from main import TRANSFORMS
+
+    return {spec.name: spec.description for spec in TRANSFORMS.specs()}
 
 
 def _ensure_windows() -> None:
@@ -43,19 +46,23 @@ def _python_executable() -> str:
 
 
 def register_context_menu(script_path: Path | None = None) -> None:
-    """Register Explorer context menu entries for case conversions."""
+    """Register Explorer context menu entries for case conversions.
+
+    Entries call the thin ``client.py`` entry point, which forwards to the
+    resident conversion service when it runs and converts in-process otherwise.
+    """
 
     _ensure_windows()
 
     assert winreg is not None  # appease the type-checker
 
-    script = script_path or Path(__file__).resolve().parents[1] / "main.py"
+    script = script_path or Path(__file__).resolve().parents[1] / "client.py"
     icon_path = Path(__file__).resolve().parents[1] / "logoico.ico"
     python_exe = _python_executable()
 
     for base_key in _CONTEXT_LOCATIONS:
-        for mode, description in _MODES.items():
-            key_path = f"{base_key}\\caseMonster_{mode}"
+        for mode, description in _modes().items():
+            key_path = f"{base_key}\\{_KEY_PREFIX}{mode}"
             with winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path) as key:
                 winreg.SetValueEx(key, None, 0, winreg.REG_SZ, description)
                 if icon_path.exists():
@@ -75,9 +82,24 @@ def unregister_context_menu() -> None:
     assert winreg is not None  # appease the type-checker
 
     for base_key in _CONTEXT_LOCATIONS:
-        for mode in _MODES:
-            key_path = f"{base_key}\\caseMonster_{mode}"
-            _delete_tree(winreg.HKEY_CURRENT_USER, key_path)
+        # Every entry we ever added, including modes that are gone since.
+        for name in _sub_keys(winreg.HKEY_CURRENT_USER, base_key):
+            if name.startswith(_KEY_PREFIX):
+                _delete_tree(winreg.HKEY_CURRENT_USER, f"{base_key}\\{name}")
+
+
+def _sub_keys(root: int, key_path: str) -> list[str]:
+    names: list[str] = []
+    try:
+        with winreg.OpenKey(root, key_path, 0, winreg.KEY_READ) as key:
+            while True:
+                try:
+                    names.append(winreg.EnumKey(key, len(names)))
+                except OSError:
+                    break
+    except FileNotFoundError:
+        pass
+    return names
 
 
 def _delete_tree(root: int, key_path: str) -> None:
@@ -0,0 +1,372 @@
+"""Resident conversion service for Explorer and script invocations.
+
+Starting a Python interpreter per Explorer click dominates the cost of small
+conversions. ``python service.py`` keeps one interpreter running and listens on
+a per-user named pipe (Windows) or Unix domain socket. ``client.py`` forwards
+requests to it and falls back to converting in-process when no service runs.
+
+Requests are dictionaries sent over :mod:`multiprocessing.connection`:
+
+- ``{"mode": "upper", "text": "..."}`` returns ``{"ok": True, "text": "..."}``.
+- ``{"mode": "upper", "paths": [...], "in_place": True}`` converts files and
+  returns ``{"ok": bool, "outputs": [...], "errors": {path: message}}``.
+- ``{"command": "ping"}`` and ``{"command": "shutdown"}`` manage the service.
+
+Path requests arriving within a short window (an Explorer multi-select fires
+one request per file) are merged into a single batch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import platform
+import queue
+import secrets
+import stat
+import sys
+import tempfile
+import threading
+from contextlib import suppress
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+SERVICE_BATCH_SECONDS = 0.05
+SERVICE_CONNECT_ERRORS = (
+    FileNotFoundError,
+    ConnectionRefusedError,
+    ConnectionResetError,
+    EOFError,
+    AuthenticationError,
+)
+
+_IS_WINDOWS = platform.system() == "Windows"
+_AUTHKEY_NAME = "service.key"
+_O_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+Request = Dict[str, Any]
+Response = Dict[str, Any]
+
+
+def runtime_dir() -> Path:
+    """Return the private per-user directory holding the socket and key.
+
+    Raises PermissionError if the directory is not a real directory owned by
+    the current user with mode 0700: in the shared temporary directory another
+    user could have created it first and planted their own key and socket.
+    """
+
+    if _IS_WINDOWS:  # pragma: no cover - exercised on Windows environments
+        base = Path(os.environ.get("LOCALAPPDATA") or tempfile.gettempdir())
+        path = base / "caseMonster"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    path = Path(base) / "caseMonster" if base else Path(tempfile.gettempdir()) / f"caseMonster-{os.getuid()}"
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(path)
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) != 0o700
+    ):
+        raise PermissionError(
+            f"refusing to use {path}: it must be a directory owned by the current user with mode 0700"
+        )
+    return path
+
+
+def default_address() -> str:
+    if _IS_WINDOWS:  # pragma: no cover - exercised on Windows environments
+        user = os.environ.get("USERNAME", "user")
+        return rf"\\.\pipe\caseMonster-{user}"
+    return str(runtime_dir() / "service.sock")
+
+
+def _family(address: str) -> str:
+    return "AF_PIPE" if address.startswith("\\\\.\\pipe\\") else "AF_UNIX"
+
+
+def load_authkey(*, create: bool = False) -> Optional[bytes]:
+    """Return the shared secret used to authenticate clients.
+
+    The key file is never opened through a symlink.
+    """
+
+    path = runtime_dir() / _AUTHKEY_NAME
+    if create:
+        key = secrets.token_bytes(32)
+        with suppress(FileNotFoundError):
+            os.unlink(path)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | _O_NOFOLLOW, 0o600)
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(key)
+        return key
+    try:
+        fd = os.open(path, os.O_RDONLY | _O_NOFOLLOW)
+    except FileNotFoundError:
+        return None
+    with os.fdopen(fd, "rb") as handle:
+        return handle.read()
+
+
+def send_request(
+    request: Request,
+    *,
+    address: Optional[str] = None,
+    authkey: Optional[bytes] = None,
+) -> Optional[Response]:
+    """Send *request* to a running service; return None if none is listening.
+
+    None is also returned when the runtime directory or key cannot be trusted,
+    so the client converts in-process instead.
+    """
+
+    try:
+        address = address or default_address()
+        if authkey is None:
+            authkey = load_authkey()
+    except OSError:
+        return None
+    if authkey is None:
+        return None
+    try:
+        with Client(address, family=_family(address), authkey=authkey) as connection:
+            connection.send(request)
+            return connection.recv()
+    except SERVICE_CONNECT_ERRORS:
+        return None
+
+
+class _Pending:
+    __slots__ = ("request", "response", "done")
+
+    def __init__(self, request: Request) -> None:
+        self.request = request
+        self.response: Response = {}
+        self.done = threading.Event()
+
+
+class ConversionServer:
+    """Accept conversion requests and process path requests in batches."""
+
+    def __init__(
+        self,
+        address: Optional[str] = None,
+        *,
+        authkey: Optional[bytes] = None,
+        batch_seconds: float = SERVICE_BATCH_SECONDS,
+    ) -> None:
+        self.address = address or default_address()
+        self._authkey = authkey
+        self._batch_seconds = batch_seconds
+        self._queue: "queue.Queue[Optional[_Pending]]" = queue.Queue()
+        self._listener: Optional[Listener] = None
+        self._closed = threading.Event()
+        self.batches = 0
+
+    def start(self) -> threading.Thread:
+        """Run :meth:`serve_forever` on a daemon thread and return it."""
+
+        self._listen()
+        thread = threading.Thread(target=self.serve_forever, name="caseMonster-service", daemon=True)
+        thread.start()
+        return thread
+
+    def serve_forever(self) -> None:
+        listener = self._listen()
+        batcher = threading.Thread(target=self._batch_loop, name="caseMonster-batcher", daemon=True)
+        batcher.start()
+        try:
+            while not self._closed.is_set():
+                try:
+                    connection = listener.accept()
+                except (OSError, EOFError):
+                    if self._closed.is_set():
+                        break
+                    continue  # failed handshake from a stray client
+                if self._closed.is_set():
+                    connection.close()
+                    break
+                threading.Thread(
+                    target=self._handle_connection, args=(connection,), daemon=True
+                ).start()
+        finally:
+            self.close()
+            batcher.join(timeout=1)
+
+    def close(self) -> None:
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._queue.put(None)
+        if self._listener is not None:
+            # Closing a listening socket does not interrupt a blocked accept()
+            # on every platform, so connect once to let the accept loop exit.
+            with suppress(*SERVICE_CONNECT_ERRORS, OSError):
+                Client(self.address, family=_family(self.address), authkey=self._authkey).close()
+            with suppress(OSError):
+                self._listener.close()
+        if _family(self.address) == "AF_UNIX":
+            with suppress(FileNotFoundError):
+                os.unlink(self.address)
+
+    def _listen(self) -> Listener:
+        if self._listener is None:
+            if _family(self.address) == "AF_UNIX" and os.path.exists(self.address):
+                if send_request({"command": "ping"}, address=self.address, authkey=self._authkey):
+                    raise OSError(f"caseMonster service already running at {self.address}")
+                os.unlink(self.address)
+            if self._authkey is None:
+                self._authkey = load_authkey(create=True)
+            self._listener = Listener(self.address, family=_family(self.address), authkey=self._authkey)
+        return self._listener
+
+    def _handle_connection(self, connection: Connection) -> None:
+        with connection:
+            try:
+                request = connection.recv()
+            except (EOFError, OSError):
+                return
+            response = self._dispatch(request)
+            with suppress(OSError):
+                connection.send(response)
+
+    def _dispatch(self, request: Any) -> Response:
+        if not isinstance(request, dict):
+            return {"ok": False, "error": "malformed request"}
+        command = request.get("command")
+        if command == "ping":
+            return {"ok": True}
+        if command == "shutdown":
+            threading.Thread(target=self.close, daemon=True).start()
+            return {"ok": True}
+        if "text" in request:
+            return _convert_text_request(request)
+        if "paths" in request:
+            pending = _Pending(request)
+            self._queue.put(pending)
+            pending.done.wait()
+            return pending.response
+        return {"ok": False, "error": "request needs 'text' or 'paths'"}
+
+    def _batch_loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            # Explorer fires one request per selected file; wait briefly so a
+            # multi-select burst is handled as a single batch.
+            while True:
+                try:
+                    item = self._queue.get(timeout=self._batch_seconds)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)
+                    break
+                batch.append(item)
+            self._process_batch(batch)
+
+    def _process_batch(self, batch: List[_Pending]) -> None:
+        self.batches += 1
+        groups: Dict[Tuple[str, bool], Dict[str, Tuple[Optional[str], Optional[str]]]] = {}
+        for pending in batch:
+            key = (str(pending.request.get("mode")), bool(pending.request.get("in_place")))
+            paths = groups.setdefault(key, {})
+            for path in pending.request.get("paths") or []:
+                paths.setdefault(str(path), (None, None))
+
+        for (mode, in_place), paths in groups.items():
+            for path in paths:
+                paths[path] = _convert_path(path, mode, in_place)
+
+        for pending in batch:
+            key = (str(pending.request.get("mode")), bool(pending.request.get("in_place")))
+            results = groups[key]
+            outputs: List[Optional[str]] = []
+            errors: Dict[str, str] = {}
+            for path in pending.request.get("paths") or []:
+                output, error = results[str(path)]
+                outputs.append(output)
+                if error is not None:
+                    errors[str(path)] = error
+            pending.response = {"ok": not errors, "outputs": outputs, "errors": errors}
+            pending.done.set()
+
+
+def _convert_text_request(request: Request) -> Response:
+    from main import convert_text
+
+    try:
+        return {"ok": True, "text": convert_text(str(request["text"]), str(request.get("mode")))}
+    except Exception as exc:
+        return {"ok": False, "error": str(exc)}
+
+
+def _convert_path(path: str, mode: str, in_place: bool) -> Tuple[Optional[str], Optional[str]]:
+    from main import _convert_directory, _convert_file
+
+    if in_place and os.path.isdir(path):
+        report = _convert_directory(Path(path), mode)
+        if report.failed:
+            return None, "; ".join(f"{name}: {message}" for name, message in report.failed.items())
+        return None, None
+
+    buffer = None if in_place else io.StringIO()
+    try:
+        _convert_file(Path(path), mode, in_place, stdout=buffer)
+    except Exception as exc:
+        return None, f"{type(exc).__name__}: {exc}"
+    return (None if buffer is None else buffer.getvalue()), None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="caseMonster resident conversion service")
+    parser.add_argument("--address", help="Override the socket path or pipe name.")
+    parser.add_argument("--stop", action="store_true", help="Ask a running service to exit.")
+    args = parser.parse_args(argv)
+
+    if args.stop:
+        response = send_request({"command": "shutdown"}, address=args.address)
+        if response is None:
+            print("caseMonster service is not running", file=sys.stderr)
+            return 1
+        return 0
+
+    from main import DEFAULT_RULES_PATH, use_rules
+
+    # Explorer entries include the user-rule modes of the GUI config.
+    rules = use_rules(DEFAULT_RULES_PATH)
+    if rules.error is not None:
+        print(f"caseMonster service: ignoring {rules.path}: {rules.error}", file=sys.stderr)
+    try:
+        server = ConversionServer(args.address)
+        server._listen()  # report an untrusted runtime directory before serving
+    except OSError as exc:
+        print(f"caseMonster service: {exc}", file=sys.stderr)
+        return 1
+    print(f"caseMonster service listening on {server.address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:  # pragma: no cover - interactive shutdown
+        server.close()
+    return 0
+
+
+__all__ = [
+    "ConversionServer",
+    "SERVICE_BATCH_SECONDS",
+    "default_address",
+    "load_authkey",
+    "runtime_dir",
+    "send_request",
+]
+
+
+if __name__ == "__main__":  # pragma: no cover - service entry point
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+from pathlib import Path
+import bz2
+import gzip
+import io
+import sys
+import tarfile
+import types
+import zipfile
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion.archives import archive_kind, convert_archive
+from main import main, stream_transformer
+
+BINARY = b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR" * 10
+
+
+def _upper():
+    return stream_transformer("upper")
+
+
+@pytest.mark.parametrize(
+    "name, kind",
+    [
+        ("docs.zip", "zip"),
+        ("docs.tar", "tar"),
+        ("docs.tar.gz", "tar"),
+        ("docs.TGZ", "tar"),
+        ("docs.tar.xz", "tar"),
+        ("notes.txt.gz", "compressed"),
+        ("notes.txt.bz2", "compressed"),
+        ("notes.txt", None),
+    ],
+)
+def test_archive_kind(name: str, kind) -> None:
+    assert archive_kind(Path(name)) == kind
+
+
+def test_zip_members_are_converted_and_metadata_kept(tmp_path) -> None:
+    source = tmp_path / "docs.zip"
+    with zipfile.ZipFile(source, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.comment = b"drop 7"
+        info = zipfile.ZipInfo("guide/readme.txt", (2020, 5, 17, 10, 30, 0))
+        info.external_attr = 0o640 << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        archive.writestr(info, "hello straße\r\n".encode("utf-8"))
+        archive.writestr("guide/", b"")
+        archive.writestr("logo.png", BINARY)
+    target = tmp_path / "out.zip"
+
+    report = convert_archive(source, target, _upper)
+
+    assert report.converted == ["guide/readme.txt"]
+    assert report.copied == ["logo.png"]
+    with zipfile.ZipFile(target) as archive:
+        assert archive.comment == b"drop 7"
+        assert archive.read("guide/readme.txt") == "HELLO STRASSE\r\n".encode("utf-8")
+        assert archive.read("logo.png") == BINARY
+        info = archive.getinfo("guide/readme.txt")
+        assert info.date_time == (2020, 5, 17, 10, 30, 0)
+        assert info.external_attr >> 16 == 0o640
+        assert info.compress_type == zipfile.ZIP_DEFLATED
+        assert archive.getinfo("guide/").is_dir()
+
+
+def test_zip_symlink_members_are_copied_unchanged(tmp_path) -> None:
+    source = tmp_path / "links.zip"
+    with zipfile.ZipFile(source, "w") as archive:
+        archive.writestr("target/File.txt", "text")
+        link = zipfile.ZipInfo("link")
+        link.create_system = 3
+        link.external_attr = 0o120777 << 16
+        archive.writestr(link, "target/File.txt")
+
+    report = convert_archive(source, tmp_path / "out.zip", _upper)
+
+    assert report.converted == ["target/File.txt"]
+    with zipfile.ZipFile(tmp_path / "out.zip") as archive:
+        assert archive.read("link") == b"target/File.txt"
+        assert archive.getinfo("link").external_attr >> 16 == 0o120777
+        assert archive.read("target/File.txt") == b"TEXT"
+
+
+def test_tar_gz_is_converted_in_place(tmp_path) -> None:
+    source = tmp_path / "docs.tar.gz"
+    with tarfile.open(source, "w:gz") as archive:
+        for name, data in (("a.txt", "lower text".encode("utf-16")), ("b.bin", BINARY)):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mtime = 1_600_000_000
+            info.mode = 0o600
+            archive.addfile(info, io.BytesIO(data))
+        link = tarfile.TarInfo("latest")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "a.txt"
+        archive.addfile(link)
+
+    assert main(["--convert", "upper", "--target", str(source), "--in-place"]) == 0
+
+    with tarfile.open(source, "r:gz") as archive:
+        assert archive.extractfile("a.txt").read() == "LOWER TEXT".encode("utf-16")
+        assert archive.extractfile("b.bin").read() == BINARY
+        info = archive.getmember("a.txt")
+        assert (info.mtime, info.mode) == (1_600_000_000, 0o600)
+        assert archive.getmember("latest").linkname == "a.txt"
+
+
+@pytest.mark.parametrize("opener, suffix", [(gzip.open, ".gz"), (bz2.open, ".bz2")])
+def test_single_compressed_stream(tmp_path, opener, suffix) -> None:
+    source = tmp_path / f"notes.txt{suffix}"
+    with opener(source, "wb") as handle:
+        handle.write(b"one. two.\n")
+
+    assert main(["--convert", "sentence", "--target", str(source), "--output", str(tmp_path / "{name}.out")]) == 0
+    with opener(tmp_path / f"notes.txt{suffix}.out", "rb") as handle:
+        assert handle.read() == b"One. Two."
+
+
+def test_archive_needs_an_explicit_destination(tmp_path) -> None:
+    source = tmp_path / "docs.zip"
+    with zipfile.ZipFile(source, "w") as archive:
+        archive.writestr("a.txt", "text")
+    with pytest.raises(SystemExit):
+        main(["--convert", "upper", "--target", str(source)])
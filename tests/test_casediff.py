@@ -0,0 +1,51 @@
+from pathlib import Path
+import sys
+import types
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion.casediff import changed_spans, format_change, iter_line_changes
+from main import convert_text, main, stream_transformer
+
+
+def test_changed_spans_for_ascii_unicode_and_length_changes() -> None:
+    assert changed_spans("hello world\n", "HELlo World\n") == ([(0, 3), (6, 7)], 4)
+    assert changed_spans("ÿes élan", "Ÿes Élan") == ([(0, 1), (4, 5)], 2)
+    assert changed_spans("straße", "STRASSE") == ([(0, 6)], 7)
+    assert changed_spans("end\n", "End") == ([(0, 1), (3, 4)], 2)
+
+
+def test_line_changes_are_independent_of_chunking() -> None:
+    text = "first line. second!\r\nALL CAPS\nFine as is.\n\nstraße ends here\n"
+    expected = list(iter_line_changes([text], stream_transformer("sentence")))
+    pieces = [text[index : index + 3] for index in range(0, len(text), 3)]
+
+    assert list(iter_line_changes(pieces, stream_transformer("sentence"))) == expected
+    converted = convert_text(text, "sentence").split("\n")
+    for change in expected:
+        assert change.after.rstrip("\n") == converted[change.number - 1]
+    assert [change.number for change in expected] == [1, 2, 5]
+
+
+def test_format_change_lists_one_based_columns() -> None:
+    (change,) = iter_line_changes(["one two\n"], stream_transformer("title"))
+    assert format_change(change) == "@@ line 1, columns 1, 5 @@\n-one two\n+One Two\n"
+
+
+def test_dry_run_and_diff_report_without_writing(tmp_path, capsys) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("keep THIS\nand this\n", encoding="utf-8")
+
+    assert main(["--convert", "lower", "--target", str(path), "--dry-run"]) == 0
+    assert capsys.readouterr().out == f"{path}: 4 characters on 1 line would change\n"
+
+    assert main(["--convert", "upper", "--target", str(tmp_path), "--diff"]) == 0
+    output = capsys.readouterr().out
+    assert "@@ line 2, columns 1-3, 5-8 @@\n-and this\n+AND THIS\n" in output
+    assert output.endswith("caseMonster: 1 file(s), 11 characters on 2 lines would change\n")
+    assert path.read_text(encoding="utf-8") == "keep THIS\nand this\n"
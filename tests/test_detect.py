@@ -0,0 +1,78 @@
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion.detect import _sample, detect_style, next_style
+from ui import actions
+
+
+@pytest.mark.parametrize(
+    "text, style",
+    [
+        ("HELLO WORLD. ANOTHER ONE.", "upper"),
+        ("hello world. another one.", "lower"),
+        ("The Lord of the Rings Returns Home", "title"),
+        ("This is a sentence. And another one! I think so.", "sentence"),
+        ("this Is mIxEd tExT here", "mixed"),
+        ("user_id, other_name", "snake"),
+        ("USER_ID MAX_COUNT", "constant"),
+        ("kebab-case other-thing", "kebab"),
+        ("fooBar bazQux", "camel"),
+        ("FooBar BazQux", "pascal"),
+        ("12 + 34", "mixed"),
+    ],
+)
+def test_detect_style(text: str, style: str) -> None:
+    assert detect_style(text) == style
+
+
+def test_detection_samples_a_bounded_amount_of_text() -> None:
+    text = "This is a sentence. And another one! I think so. " * 200_000
+    windows = _sample(text, 4096)
+    assert sum(map(len, windows)) <= 4096
+    words = set(text[:60].split())
+    assert all(window.split()[0] in words and window.split()[-1] in words for window in windows)
+    assert detect_style(text) == "sentence"
+
+
+def test_next_style() -> None:
+    rotation = ("upper", "lower", "title")
+    assert next_style("upper", rotation) == "lower"
+    assert next_style("title", rotation) == "upper"
+    assert next_style("mixed", rotation) == "upper"
+    with pytest.raises(ValueError):
+        next_style("upper", ())
+
+
+def test_cycle_action_follows_the_rotation(monkeypatch) -> None:
+    monkeypatch.setattr(actions, "_cycle_rotation", actions.DEFAULT_CYCLE_ROTATION)
+    monkeypatch.setattr("main.clipboard_copy", lambda _text: None)
+    monkeypatch.setattr("main.time.sleep", lambda _seconds: None)
+
+    text = "hello there. general kenobi"
+    seen = []
+    for _ in range(5):
+        text = actions.run("cycle", source_text=text, paste=False)[1]
+        seen.append(text)
+    assert seen == [
+        "Hello There. General Kenobi",
+        "Hello there. General kenobi",
+        "HELLO THERE. GENERAL KENOBI",
+        "hello there. general kenobi",
+        "Hello There. General Kenobi",
+    ]
+
+    actions.set_cycle_rotation(["snake", "camel"])
+    assert actions.run("cycle", source_text="user_id", paste=False)[1] == "userId"
+    assert actions.run("cycle", source_text="userId", paste=False)[1] == "user_id"
+    with pytest.raises(ValueError, match="unknown mode"):
+        actions.set_cycle_rotation(["upper", "shouting"])
@@ -0,0 +1,157 @@
+from pathlib import Path
+import os
+import random
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+import main
+from conversion import iter_convert
+from conversion.dictionary import DictionaryError, DictionaryFile, parse_dictionary
+from main import DEFAULT_DICTIONARY_PATH, convert_text, stream_transformer, use_dictionary
+
+DICTIONARY = """\
+# house spellings
+[preserve]
+NASA
+iPhone
+GitHub
+Wi-Fi
+
+[stopwords]
+of
+and
+the
+"""
+
+
+@pytest.fixture
+def dictionary_file(tmp_path):
+    path = tmp_path / "casemonster-dictionary.txt"
+    path.write_text(DICTIONARY, encoding="utf-8")
+    use_dictionary(path)
+    yield path
+    use_dictionary(DEFAULT_DICTIONARY_PATH)
+
+
+def test_preserved_spellings_and_stopwords() -> None:
+    dictionary = parse_dictionary(DICTIONARY.splitlines())
+    assert dictionary.apply("Nasa Buys An Iphone On Github", title=True) == (
+        "NASA Buys An iPhone On GitHub"
+    )
+    assert dictionary.apply("The Lord Of The Rings And Wi-fi", title=True) == (
+        "The Lord of the Rings and Wi-Fi"
+    )
+    # A stop word keeps its capital at the start of a line or sentence.
+    assert dictionary.apply("Tea. The End\nOf Days: The Sequel", title=True) == (
+        "Tea. The End\nOf Days: The Sequel"
+    )
+    assert dictionary.apply("The nasa of it") == "The NASA of it"
+
+
+@pytest.mark.parametrize(
+    "source, problem",
+    [
+        ("NASA", "outside a section"),
+        ("[acronyms]\nNASA", "unknown section"),
+        ("[preserve]\nNew York", "not a single word"),
+        ("[abbreviations]\ne.g.,", "not an abbreviation"),
+    ],
+)
+def test_invalid_dictionary(source: str, problem: str) -> None:
+    with pytest.raises(DictionaryError, match=problem):
+        parse_dictionary(source.splitlines())
+
+
+def test_dictionary_is_reloaded_when_the_file_changes(tmp_path) -> None:
+    path = tmp_path / "words.txt"
+    watched = DictionaryFile(path)
+    assert watched.current().empty
+
+    path.write_text("[preserve]\nNASA\n", encoding="utf-8")
+    first = watched.current()
+    assert first.preserve == {"nasa": "NASA"}
+    assert watched.current() is first
+
+    path.write_text("[preserve]\nnasa\n[", encoding="utf-8")
+    os.utime(path, ns=(0, 10**9))
+    assert watched.current() is first  # a broken edit keeps the last good dictionary
+    assert watched.error is not None
+
+    path.write_text("[preserve]\nGitHub\n", encoding="utf-8")
+    os.utime(path, ns=(0, 2 * 10**9))
+    assert watched.current().preserve == {"github": "GitHub"}
+    assert watched.error is None
+
+
+def test_convert_text_and_streaming_use_the_dictionary(dictionary_file) -> None:
+    text = "the iphone of nasa. the end of the road\nand github and wi-fi. " * 5
+    assert convert_text(text, "sentence").startswith("The iPhone of NASA. The end")
+    assert convert_text(text, "title").startswith("The iPhone of NASA. The End of the Road\nAnd")
+    assert convert_text(text, "upper") == text.upper()
+
+    rng = random.Random(44)
+    for mode in ["title", "sentence"]:
+        expected = convert_text(text, mode)
+        for _ in range(50):
+            cuts = sorted(rng.sample(range(len(text) + 1), 4))
+            chunks = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+            assert "".join(iter_convert(chunks, stream_transformer(mode))) == expected
+
+
+def test_user_abbreviations_stop_sentence_breaks(dictionary_file) -> None:
+    text = "sales at acme corp. rose in sch. 4 as well. sch. then."
+    assert convert_text(text, "sentence") == (
+        "Sales at acme corp. Rose in sch. 4 As well. Sch. Then."
+    )
+    label = main._mode_label("sentence", None)
+
+    with open(dictionary_file, "a", encoding="utf-8") as handle:
+        handle.write("[abbreviations]\nCorp.\n[numeric-abbreviations]\nSch\n")
+    os.utime(dictionary_file, ns=(0, 10**9))
+    expected = "Sales at acme corp. rose in sch. 4 as well. Sch. Then."
+    assert convert_text(text, "sentence") == expected
+    for size in range(1, len(text) + 1):
+        chunks = [text[start:start + size] for start in range(0, len(text), size)]
+        assert "".join(iter_convert(chunks, stream_transformer("sentence"))) == expected
+    assert main._mode_label("sentence", None) != label
+
+
+@pytest.mark.parametrize("text", ["\nthe end of it", ". the end of it", "\n\nthe end. the road"])
+def test_text_opening_with_a_phrase_break(dictionary_file, text: str) -> None:
+    assert parse_dictionary(DICTIONARY.splitlines()).apply(text.title(), title=True) == (
+        text.title().replace(" Of ", " of ")
+    )
+    expected = convert_text(text, "title")
+    assert "TheThe" not in expected
+    for size in range(1, len(text) + 1):
+        chunks = [text[start:start + size] for start in range(0, len(text), size)]
+        assert "".join(iter_convert(chunks, stream_transformer("title"))) == expected
+
+
+def test_dictionary_changes_the_manifest_label(dictionary_file) -> None:
+    label = main._mode_label("title", None)
+    assert label.startswith("title@")
+    assert main._mode_label("upper", None) == "upper"
+    use_dictionary(DEFAULT_DICTIONARY_PATH)
+    assert main._mode_label("title", None) == "title"
+
+
+def test_cli_dictionary_option(tmp_path, dictionary_file, capsys) -> None:
+    target = tmp_path / "notes.txt"
+    target.write_text("nasa and the iphone", encoding="utf-8")
+
+    assert main.main(["--convert", "title", "--target", str(target), "--dictionary", str(dictionary_file)]) == 0
+    assert capsys.readouterr().out == "NASA and the iPhone"
+
+    dictionary_file.write_text("[preserve]\nNew York\n", encoding="utf-8")
+    with pytest.raises(SystemExit, match="not a single word"):
+        main.main(["--convert", "title", "--target", str(target), "--dictionary", str(dictionary_file)])
@@ -0,0 +1,116 @@
+from pathlib import Path
+import codecs
+import sys
+import time
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import WordBufferedTransformer
+from conversion.fanout import expand_output_template, fanout_file
+from main import convert_text, main, stream_transformer
+
+TEXT = "the straße is long. i think so!\r\nsecond LINE here\n" * 50
+
+
+def test_every_variant_matches_a_separate_conversion(tmp_path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_bytes(codecs.BOM_UTF16_LE + TEXT.encode("utf-16-le"))
+    modes = ["upper", "lower", "title", "sentence"]
+    targets = {mode: expand_output_template("{parent}/out/{stem}.{mode}{suffix}", source, mode) for mode in modes}
+
+    written = fanout_file(source, targets, stream_transformer, chunk_size=37)
+
+    assert written == targets
+    for mode in modes:
+        data = (tmp_path / "out" / f"doc.{mode}.txt").read_bytes()
+        assert data == codecs.BOM_UTF16_LE + convert_text(TEXT, mode).encode("utf-16-le")
+
+
+def test_failing_variant_discards_all_outputs(tmp_path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text(TEXT, encoding="utf-8")
+
+    class Failing(WordBufferedTransformer):
+        def feed(self, chunk: str) -> str:
+            raise RuntimeError("boom")
+
+    def make(mode: str):
+        return Failing(str.upper) if mode == "upper" else stream_transformer(mode)
+
+    targets = {"upper": tmp_path / "u.txt", "lower": tmp_path / "l.txt"}
+    with pytest.raises(RuntimeError, match="boom"):
+        fanout_file(source, targets, make, chunk_size=16)
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["doc.txt"]
+
+
+def test_outputs_are_replaced_only_after_every_writer_finished(tmp_path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text(TEXT, encoding="utf-8")
+
+    class FailsLast(WordBufferedTransformer):
+        def finish(self) -> str:
+            time.sleep(0.2)  # the other writers are done by now
+            raise RuntimeError("boom")
+
+    def make(mode: str):
+        return FailsLast(str.upper) if mode == "upper" else stream_transformer(mode)
+
+    targets = {"upper": tmp_path / "u.txt", "lower": tmp_path / "l.txt", "title": tmp_path / "t.txt"}
+    for path in targets.values():
+        path.write_text("previous", encoding="utf-8")
+    with pytest.raises(RuntimeError, match="boom"):
+        fanout_file(source, targets, make, chunk_size=16)
+    assert [path.read_text(encoding="utf-8") for path in targets.values()] == ["previous"] * 3
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["doc.txt", "l.txt", "t.txt", "u.txt"]
+
+
+def test_existing_symlinked_output_is_written_through(tmp_path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("Mixed Case", encoding="utf-8")
+    real = tmp_path / "real.txt"
+    real.write_text("old", encoding="utf-8")
+    link = tmp_path / "upper.txt"
+    link.symlink_to(real)
+
+    fanout_file(source, {"upper": link, "lower": tmp_path / "lower.txt"}, stream_transformer)
+    assert link.is_symlink()
+    assert real.read_text(encoding="utf-8") == "MIXED CASE"
+
+
+def test_outputs_must_not_overwrite_the_source(tmp_path) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text(TEXT, encoding="utf-8")
+    with pytest.raises(ValueError):
+        fanout_file(source, {"upper": source}, stream_transformer)
+
+
+def test_cli_fanout_with_template(tmp_path, capsys) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("Mixed Case", encoding="utf-8")
+    template = str(tmp_path / "{mode}" / "{name}")
+
+    assert main(["--convert", "upper,lower", "--fanout", "--target", str(source), "--output", template]) == 0
+    assert (tmp_path / "upper" / "doc.txt").read_text(encoding="utf-8") == "MIXED CASE"
+    assert (tmp_path / "lower" / "doc.txt").read_text(encoding="utf-8") == "mixed case"
+    assert capsys.readouterr().err.count("wrote") == 2
+
+    with pytest.raises(SystemExit):
+        main(["--convert", "upper,lower", "--target", str(source)])
+
+
+@pytest.mark.parametrize("template", ["{0}/{mode}{name}", "{mode}{name.x}", "{mode}{nope}", "{mode"])
+def test_bad_output_templates_are_reported(tmp_path, template) -> None:
+    source = tmp_path / "doc.txt"
+    source.write_text("text", encoding="utf-8")
+    with pytest.raises(ValueError, match="may only use"):
+        expand_output_template(template, source, "upper")
+    with pytest.raises(SystemExit, match="bad output template"):
+        main(["--convert", "upper", "--fanout", "--target", str(source), "--output", template])
@@ -0,0 +1,94 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ui.history import ClipboardHistory
+from ui.main_frame import format_history_label
+
+
+def _reference_label(text: str, max_length: int = 48) -> str:
+    collapsed = " ".join(line.strip() for line in text.splitlines()).strip()
+    if not collapsed:
+        collapsed = "(whitespace)"
+    if len(collapsed) > max_length:
+        collapsed = collapsed[: max_length - 1] + "…"
+    return collapsed
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "short",
+        "  padded line  \n\n  second  ",
+        "x" * 10_000,
+        " " * 5_000 + "late start " * 20,
+        "\r\n" * 3_000 + "after blank lines",
+        "word\r\nword\n" * 400,
+        "\n \t \n",
+    ],
+)
+def test_prefix_label_matches_full_scan(text: str) -> None:
+    assert format_history_label(text) == _reference_label(text)
+
+
+def test_labels_are_computed_once_per_entry() -> None:
+    history = ClipboardHistory(limit=3)
+    history.record("first entry")
+    entry = history.entries[0]
+    label = entry.label
+
+    history.record("second entry")
+    history.record("first entry")
+
+    assert history.entries[0] is entry
+    assert entry.label is label
+    assert history.labels == ["first entry", "second entry"]
+
+
+def test_record_reports_changes_and_evicts_oldest() -> None:
+    history = ClipboardHistory(limit=2)
+    assert history.record("a")
+    assert not history.record("a")
+    assert not history.record("")
+    assert history.record("b")
+    assert history.record("c")
+
+    assert history.items == ["c", "b"]
+    assert history.record("a")
+    assert history.items == ["a", "c"]
+
+
+def test_change_events_describe_incremental_updates() -> None:
+    history = ClipboardHistory(limit=2)
+    changes = []
+    history.add_listener(changes.append)
+
+    history.record("a")
+    history.record("b")
+    history.record("a")
+    history.record("c")
+
+    first = history.entries[1]
+    assert [(c.kind, c.index, c.entry.text, c.previous_index) for c in changes] == [
+        ("insert", 0, "a", None),
+        ("insert", 0, "b", None),
+        ("move", 0, "a", 1),
+        ("insert", 0, "c", None),
+        ("remove", 2, "b", None),
+    ]
+    assert history.index_of(first) == 1
+
+    history.update_limit(1)
+    assert changes[-1].kind == "remove"
+    assert history.index_of(first) == -1
+
+
+def test_recent_returns_newest_entries_only() -> None:
+    history = ClipboardHistory(limit=50)
+    history.extend(str(index) for index in range(30))
+
+    assert [entry.text for entry in history.recent(3)] == ["29", "28", "27"]
+    assert history.recent(0) == []
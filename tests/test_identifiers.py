@@ -0,0 +1,64 @@
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import iter_convert
+from conversion.identifiers import IDENTIFIER_MODES, identifier_case, split_identifier
+from main import TRANSFORMS, convert_text, stream_transformer
+
+
+@pytest.mark.parametrize(
+    "name, words",
+    [
+        ("parseHTTPResponse", ["parse", "HTTP", "Response"]),
+        ("XMLHttpRequest", ["XML", "Http", "Request"]),
+        ("getUserID", ["get", "User", "ID"]),
+        ("sha256sum", ["sha", "256", "sum"]),
+        ("kebab-case--name", ["kebab", "case", "name"]),
+        ("CONSTANT_CASE", ["CONSTANT", "CASE"]),
+        ("ÉcoleNormale", ["École", "Normale"]),
+    ],
+)
+def test_split_identifier(name: str, words: list) -> None:
+    assert split_identifier(name) == words
+
+
+@pytest.mark.parametrize(
+    "mode, expected",
+    [
+        ("camel", "parseHttpResponse _privateName x.y"),
+        ("pascal", "ParseHttpResponse _PrivateName X.Y"),
+        ("snake", "parse_http_response _private_name x.y"),
+        ("kebab", "parse-http-response _private-name x.y"),
+        ("constant", "PARSE_HTTP_RESPONSE _PRIVATE_NAME X.Y"),
+    ],
+)
+def test_identifier_modes(mode: str, expected: str) -> None:
+    assert convert_text("parseHTTPResponse _private_name x.y", mode) == expected
+
+
+def test_styles_round_trip() -> None:
+    names = "user_id parse_http_response sha_256_sum x"
+    for source in IDENTIFIER_MODES:
+        converted = identifier_case(names, source)
+        for target in IDENTIFIER_MODES:
+            assert identifier_case(converted, target) == identifier_case(names, target)
+
+
+def test_identifier_modes_are_registered_and_stream() -> None:
+    text = "fooBar baz_qux\nHTTPServer " * 1000
+    for mode in IDENTIFIER_MODES:
+        assert mode in TRANSFORMS
+        pieces = [text[start:start + 37] for start in range(0, len(text), 37)]
+        assert "".join(iter_convert(pieces, stream_transformer(mode))) == convert_text(text, mode)
+    with pytest.raises(ValueError):
+        identifier_case("x", "train")
@@ -0,0 +1,139 @@
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import sniff_file
+from conversion.lineindex import (
+    LineRange,
+    build_line_index,
+    convert_line_range,
+    index_path,
+    line_span,
+    load_line_index,
+    parse_line_range,
+)
+from main import main, stream_transformer
+
+
+def _lines(count: int) -> list:
+    return [f"line {number} ŉ with some words\n" for number in range(1, count + 1)]
+
+
+@pytest.mark.parametrize("codec", ["utf-8", "utf-16-le"])
+@pytest.mark.parametrize("trailing", ["", "last line without newline"])
+def test_index_matches_naive_line_starts(tmp_path, codec, trailing) -> None:
+    lines = _lines(50) + ([trailing] if trailing else [])
+    path = tmp_path / "big.txt"
+    data = b"\xff\xfe" if codec == "utf-16-le" else b""
+    data += "".join(lines).encode(codec)
+    path.write_bytes(data)
+    encoding = sniff_file(path)
+
+    index = build_line_index(path, encoding, stride=4, chunk_size=16)
+    assert index.lines == len(lines)
+    starts = [len(encoding.bom)]
+    for line in lines:
+        starts.append(starts[-1] + len(line.encode(codec)))
+    assert index.offsets == starts[: len(lines)][::4]
+
+    for first, last in [(1, 1), (3, 9), (17, 50), (48, None)]:
+        start, end = line_span(path, index, encoding, LineRange(first, last))
+        expected_end = starts[len(lines) if last is None else min(last, len(lines))]
+        assert (start, end) == (starts[first - 1], expected_end)
+
+
+def test_index_is_cached_until_the_file_changes(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "big.txt"
+    path.write_text("".join(_lines(10)), encoding="utf-8")
+    encoding = sniff_file(path)
+    load_line_index(path, encoding, stride=2)
+    assert index_path(path).exists()
+
+    def _no_scan(*_args, **_kwargs):
+        raise AssertionError("the cached index should be used")
+
+    monkeypatch.setattr("conversion.lineindex.build_line_index", _no_scan)
+    assert load_line_index(path, encoding, stride=2).lines == 10
+
+    path.write_text("".join(_lines(12)), encoding="utf-8")
+    monkeypatch.undo()
+    assert load_line_index(path, encoding, stride=2).lines == 12
+
+
+def test_equal_length_range_is_spliced_in_place(tmp_path) -> None:
+    path = tmp_path / "big.txt"
+    lines = [f"line {number} has words\n" for number in range(1, 3001)]
+    path.write_text("".join(lines), encoding="utf-8")
+    inode = path.stat().st_ino
+
+    result = convert_line_range(
+        path, sniff_file(path), LineRange(1200, 1202), stream_transformer("upper"), in_place=True
+    )
+    assert result.spliced
+    assert path.stat().st_ino == inode
+    expected = lines[:1199] + [line.upper() for line in lines[1199:1202]] + lines[1202:]
+    assert path.read_text(encoding="utf-8") == "".join(expected)
+
+
+def test_growing_range_rewrites_file_and_shifts_cached_offsets(tmp_path) -> None:
+    path = tmp_path / "big.txt"
+    lines = _lines(3000)
+    path.write_text("".join(lines), encoding="utf-8")
+    encoding = sniff_file(path)
+    load_line_index(path, encoding)
+
+    result = convert_line_range(
+        path, encoding, LineRange(1030, 1031), stream_transformer("upper"), in_place=True
+    )
+    assert not result.spliced
+    expected = lines[:1029] + [line.upper() for line in lines[1029:1031]] + lines[1031:]
+    assert path.read_text(encoding="utf-8") == "".join(expected)
+
+    cached = load_line_index(path, encoding)
+    assert cached.offsets == build_line_index(path, encoding).offsets
+    assert cached.size == path.stat().st_size
+
+
+def test_sentence_range_keeps_its_line_breaks(tmp_path) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("ONE.\nTWO THINGS.\n\nTHREE.\n", encoding="utf-8")
+
+    convert_line_range(
+        path,
+        sniff_file(path),
+        LineRange(2, 3),
+        stream_transformer("sentence", keep_trailing_newlines=True),
+        in_place=True,
+    )
+    assert path.read_text(encoding="utf-8") == "ONE.\nTwo things.\n\nTHREE.\n"
+
+
+def test_parse_line_range() -> None:
+    assert parse_line_range("120000:125000") == LineRange(120000, 125000)
+    assert parse_line_range("5:") == LineRange(5, None)
+    assert parse_line_range(":3") == LineRange(1, 3)
+    assert parse_line_range("7") == LineRange(7, 7)
+    for bad in ["0:3", "9:2", "a:b"]:
+        with pytest.raises(ValueError):
+            parse_line_range(bad)
+
+
+def test_cli_prints_only_the_requested_lines(tmp_path, capsys) -> None:
+    path = tmp_path / "big.txt"
+    path.write_text("alpha\nbeta\ngamma\ndelta\n", encoding="utf-8")
+
+    assert main(["--convert", "upper", "--target", str(path), "--lines", "2:3"]) == 0
+    assert capsys.readouterr().out == "BETA\nGAMMA\n"
+    assert path.read_text(encoding="utf-8") == "alpha\nbeta\ngamma\ndelta\n"
+
+    assert main(["--convert", "upper", "--target", str(path), "--lines", "4:", "--in-place"]) == 0
+    assert path.read_text(encoding="utf-8") == "alpha\nbeta\ngamma\nDELTA\n"
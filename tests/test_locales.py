@@ -0,0 +1,104 @@
+from pathlib import Path
+import random
+import sys
+import types
+import unicodedata
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import iter_convert, sentence_case
+from conversion.locales import ROOT_CASING, get_casing
+from main import convert_text, main, stream_transformer
+
+
+@pytest.mark.parametrize(
+    "locale, mode, source, expected",
+    [
+        ("tr", "upper", "istanbul ılık", "İSTANBUL ILIK"),
+        ("tr", "lower", "İSTANBUL ILIK", "istanbul ılık"),
+        ("tr", "title", "istanbul ılık İZMİR", "İstanbul Ilık İzmir"),
+        ("az", "upper", "bakı şəhəri", "BAKI ŞƏHƏRİ"),
+        ("el", "upper", "μάιος ή όνομα ήλιος", "ΜΑΪΟΣ Ή ΟΝΟΜΑ ΗΛΙΟΣ"),
+        ("el", "lower", "ΟΔΟΣ ΣΟΦΙΑΣ", "οδος σοφιας"),
+        ("el", "title", "καλή μέρα", "Καλή Μέρα"),
+        ("nl", "title", "het ijsselmeer en ijmuiden", "Het IJsselmeer En IJmuiden"),
+        ("de", "upper", "straße", "STRAẞE"),
+        ("de", "lower", "STRAẞE", "straße"),
+    ],
+)
+def test_locale_modes(locale: str, mode: str, source: str, expected: str) -> None:
+    assert convert_text(source, mode, casing=get_casing(locale)) == expected
+
+
+def test_root_casing_matches_str_methods() -> None:
+    text = "Istanbul ıi ΟΔΟΣ straße ijs"
+    assert convert_text(text, "upper", casing=ROOT_CASING) == text.upper()
+    assert convert_text(text, "title", casing=ROOT_CASING) == convert_text(text, "title")
+    assert convert_text(text, "sentence", casing=ROOT_CASING) == sentence_case(text)
+
+
+@pytest.mark.parametrize(
+    "locale, source, expected",
+    [
+        ("tr", "İSTANBUL ÇOK GÜZEL. İŞTE BURADA.", "İstanbul çok güzel. İşte burada."),
+        ("tr", "bu iyi. ıslak bir gün i", "Bu iyi. Islak bir gün i"),
+        ("nl", "ijsland is koud. ijs is lekker.", "IJsland is koud. IJs is lekker."),
+        ("el", "ΤΟ ΟΝΟΜΑ ΜΟΥ ΕΙΝΑΙ ΓΙΩΡΓΟΣ. ΕΣΥ ΠΩΣ;", "Το ονομα μου ειναι γιωργος. Εσυ πως;"),
+        ("el", "άλλος ένας.", "Άλλος ένας."),
+        ("de", "GROßE STRAßE.", "Große straße."),
+    ],
+)
+def test_locale_sentence_case(locale: str, source: str, expected: str) -> None:
+    assert sentence_case(source, casing=get_casing(locale)) == expected
+
+
+@pytest.mark.parametrize("locale", ["tr", "nl", "el", "de"])
+def test_chunked_locale_sentence_case_matches_one_shot(locale: str) -> None:
+    casing = get_casing(locale)
+    alphabet = ["i", "I", "ı", "İ", "ij", "IJ", "σ", "Σ", "ά", "ß", "a", " ", ". ", "\n", "! ", "ος", "x"]
+    rng = random.Random(locale)
+    for _ in range(300):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        transformer = stream_transformer("sentence", casing=casing)
+        cuts = sorted(rng.sample(range(len(text) + 1), min(3, len(text) + 1)))
+        chunks = [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+        assert "".join(iter_convert(chunks, transformer)) == sentence_case(text, casing=casing), text
+
+
+def test_normalization_is_fused_into_the_stream() -> None:
+    casing = get_casing("tr", "NFC")
+    text = unicodedata.normalize("NFD", "çay ve şeker. önce işte ğ.") * 3
+    expected = convert_text(text, "sentence", casing=casing)
+    assert unicodedata.is_normalized("NFC", expected)
+    transformer = stream_transformer("sentence", casing=casing)
+    # One character per chunk splits every base letter from its combining mark.
+    assert "".join(iter_convert(list(text), transformer)) == expected
+
+    compatible = get_casing(None, "NFKC")
+    assert convert_text("ﬁne ①", "upper", casing=compatible) == "FINE 1"
+
+
+def test_unknown_locale_is_rejected() -> None:
+    assert get_casing("tr-TR") is get_casing("tr")
+    with pytest.raises(ValueError, match="no casing rules"):
+        get_casing("xx")
+    with pytest.raises(ValueError):
+        get_casing("tr", "NFD")
+
+
+def test_cli_locale_option(tmp_path, capsys) -> None:
+    path = tmp_path / "notes.txt"
+    path.write_text("istanbul. izmir", encoding="utf-8")
+
+    assert main(["--convert", "upper", "--target", str(path), "--locale", "tr"]) == 0
+    assert capsys.readouterr().out == "İSTANBUL. İZMİR"
+
+    assert main(["--convert", "upper", "--target", str(path)]) == 0
+    assert capsys.readouterr().out == "ISTANBUL. IZMIR"
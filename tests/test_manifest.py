@@ -0,0 +1,134 @@
+from pathlib import Path
+import os
+import sys
+import types
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import MANIFEST_NAME, Manifest, convert_tree
+from main import main, stream_transformer
+
+
+class _CountingConvert:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, mode: str):
+        transformer = stream_transformer(mode)
+        feed = transformer.feed
+
+        def record(chunk: str) -> str:
+            self.calls.append(chunk)
+            return feed(chunk)
+
+        transformer.feed = record
+        return transformer
+
+
+def _tree(tmp_path: Path) -> Path:
+    root = tmp_path / "docs"
+    (root / "nested").mkdir(parents=True)
+    (root / "a.txt").write_text("hello there", encoding="utf-8")
+    (root / "nested" / "b.txt").write_text("second file", encoding="utf-8")
+    (root / "image.bin").write_bytes(b"\x89PNG\0\0data")
+    return root
+
+
+def test_repeat_run_skips_untouched_files_without_reading(tmp_path, monkeypatch) -> None:
+    root = _tree(tmp_path)
+    convert = _CountingConvert()
+
+    first = convert_tree(root, "upper", convert)
+    assert first.converted == ["a.txt", "nested/b.txt"]
+    assert first.skipped == ["image.bin"]
+    assert (root / "a.txt").read_text(encoding="utf-8") == "HELLO THERE"
+    assert (root / MANIFEST_NAME).exists()
+
+    def _no_reads(path, *_args):
+        raise AssertionError(f"{path} should not be read")
+
+    monkeypatch.setattr("conversion.manifest.file_digest", _no_reads)
+    monkeypatch.setattr("conversion.manifest.sniff_file", _no_reads)
+    second = convert_tree(root, "upper", convert)
+    assert sorted(second.unchanged) == ["a.txt", "image.bin", "nested/b.txt"]
+    assert len(convert.calls) == 2
+
+
+def test_metadata_change_rehashes_and_only_converts_new_content(tmp_path) -> None:
+    root = _tree(tmp_path)
+    convert_tree(root, "upper", stream_transformer)
+
+    stat = (root / "a.txt").stat()
+    os.utime(root / "a.txt", ns=(stat.st_atime_ns, stat.st_mtime_ns + 5_000_000_000))
+    (root / "nested" / "b.txt").write_text("edited later", encoding="utf-8")
+    convert = _CountingConvert()
+
+    report = convert_tree(root, "upper", convert)
+    assert report.converted == ["nested/b.txt"]
+    assert "a.txt" in report.unchanged
+    assert convert.calls == ["edited later"]
+
+    # A different mode reconverts everything.
+    report = convert_tree(root, "lower", stream_transformer)
+    assert report.converted == ["a.txt", "nested/b.txt"]
+
+
+def test_prune_drops_deleted_files_and_custom_manifest_path(tmp_path) -> None:
+    root = _tree(tmp_path)
+    manifest_path = tmp_path / "state" / "manifest.json"
+    convert_tree(root, "upper", stream_transformer, manifest_path=manifest_path)
+    assert not (root / MANIFEST_NAME).exists()
+
+    (root / "a.txt").unlink()
+    kept = convert_tree(root, "upper", stream_transformer, manifest_path=manifest_path)
+    assert kept.pruned == []
+    assert "a.txt" in Manifest.load(manifest_path).entries
+
+    pruned = convert_tree(root, "upper", stream_transformer, manifest_path=manifest_path, prune=True)
+    assert pruned.pruned == ["a.txt"]
+    assert "a.txt" not in Manifest.load(manifest_path).entries
+
+
+def test_cli_converts_directory_in_place(tmp_path, capsys) -> None:
+    root = _tree(tmp_path)
+
+    assert main(["--convert", "title", "--target", str(root), "--in-place"]) == 0
+    assert (root / "nested" / "b.txt").read_text(encoding="utf-8") == "Second File"
+    assert "2 converted" in capsys.readouterr().err
+
+
+def test_hidden_directories_and_own_artifacts_are_left_alone(tmp_path) -> None:
+    root = _tree(tmp_path)
+    (root / ".git" / "refs").mkdir(parents=True)
+    (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+    (root / ".git" / "refs" / "main").write_text("abc123\n", encoding="utf-8")
+    (root / ".a.txt.casemonster-lines.json").write_text('{"version": 1}', encoding="utf-8")
+    (root / "nested" / MANIFEST_NAME).write_text('{"version": 1, "files": {}}', encoding="utf-8")
+
+    report = convert_tree(root, "upper", stream_transformer, manifest_path=tmp_path / "elsewhere.json")
+    assert sorted(report.converted) == ["a.txt", "nested/b.txt"]
+    assert (root / ".git" / "HEAD").read_text(encoding="utf-8") == "ref: refs/heads/main\n"
+    assert (root / ".git" / "refs" / "main").read_text(encoding="utf-8") == "abc123\n"
+    assert (root / ".a.txt.casemonster-lines.json").read_text(encoding="utf-8") == '{"version": 1}'
+    assert (root / "nested" / MANIFEST_NAME).read_text(encoding="utf-8") == '{"version": 1, "files": {}}'
+
+
+def test_dot_files_are_skipped_like_in_watch_mode(tmp_path) -> None:
+    from conversion.watch import is_hidden
+
+    root = _tree(tmp_path)
+    for name in (".gitignore", ".env"):
+        (root / name).write_text("keep me\n", encoding="utf-8")
+    (root / "nested" / ".editorconfig").write_text("root = true\n", encoding="utf-8")
+
+    report = convert_tree(root, "upper", stream_transformer)
+    assert sorted(report.converted) == ["a.txt", "nested/b.txt"]
+    assert (root / ".gitignore").read_text(encoding="utf-8") == "keep me\n"
+    assert (root / ".env").read_text(encoding="utf-8") == "keep me\n"
+    assert (root / "nested" / ".editorconfig").read_text(encoding="utf-8") == "root = true\n"
+    assert is_hidden(str(root / ".gitignore"), str(root))
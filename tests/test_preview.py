@@ -0,0 +1,52 @@
+from pathlib import Path
+import sys
+import threading
+import time
+import types
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ui.preview import PreviewRenderer
+
+
+def _wait_for(renderer: PreviewRenderer, text: str, mode: str) -> str:
+    done = threading.Event()
+    results = []
+
+    def deliver(value: str) -> None:
+        results.append(value)
+        done.set()
+
+    renderer.request(text, mode, deliver)
+    assert done.wait(5)
+    return results[0]
+
+
+def test_preview_is_truncated_and_cached() -> None:
+    renderer = PreviewRenderer(limit=10)
+    try:
+        assert _wait_for(renderer, "hello world and more", "upper") == "HELLO WORL"
+        assert renderer.cached("hello world, different tail", "upper") == "HELLO WORL"
+        assert renderer.cached("hello world and more", "lower") is None
+    finally:
+        renderer.shutdown()
+
+
+def test_superseded_requests_are_not_delivered() -> None:
+    delivered = []
+    queued = []
+    renderer = PreviewRenderer(queued.append)
+    try:
+        renderer.request("first", "upper", delivered.append)
+        renderer.request("second", "upper", delivered.append)
+        deadline = time.monotonic() + 5
+        while not delivered and time.monotonic() < deadline:
+            while queued:
+                queued.pop(0)()
+            time.sleep(0.01)
+    finally:
+        renderer.shutdown()
+
+    assert delivered == ["SECOND"]
@@ -0,0 +1,88 @@
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+import main
+from conversion import iter_convert
+from conversion.protect import MARK, convert_protected, protected_spans
+from main import TRANSFORMS, convert_text, stream_transformer
+from ui import actions
+
+TEXT = (
+    "see https://Example.com/Some_Path?q=A. then mail Jane.Doe@Example.org about "
+    "C:\\Users\\Jane\\My_File.TXT and ~/src/Main_Module.py, or run `make Build_All`.\n"
+    "```\nSELECT Name FROM Users\n```\nwww.GitHub.com/Foo is fine. " + MARK + " stays too.\n"
+)
+SPANS = [
+    "https://Example.com/Some_Path?q=A",
+    "Jane.Doe@Example.org",
+    "C:\\Users\\Jane\\My_File.TXT",
+    "~/src/Main_Module.py",
+    "`make Build_All`",
+    "```\nSELECT Name FROM Users\n```",
+    "www.GitHub.com/Foo",
+    MARK,
+]
+
+
+def test_protected_spans() -> None:
+    assert [TEXT[start:end] for start, end in protected_spans(TEXT)] == SPANS
+    assert protected_spans("plain text, nothing to see: 3/4 done.") == []
+    assert protected_spans("and/or") == []
+
+
+@pytest.mark.parametrize("mode", sorted(TRANSFORMS))
+def test_every_mode_keeps_the_spans(mode: str) -> None:
+    converted = convert_text(TEXT, mode, protect=True)
+    for span in SPANS:
+        assert span in converted
+
+
+def test_sentence_state_carries_across_a_span() -> None:
+    converted = convert_text("see https://example.com. next step. `x` starts here.", "sentence", protect=True)
+    assert converted == "See https://example.com. Next step. `x` starts here."
+    assert convert_text("HTTPS://EXAMPLE.COM", "lower") == "https://example.com"
+
+
+def test_convert_protected_rejects_a_transform_that_drops_markers() -> None:
+    with pytest.raises(ValueError, match="markers"):
+        convert_protected("visit www.example.com now", lambda text: text.replace(MARK, ""))
+
+
+@pytest.mark.parametrize("mode", ["sentence", "title", "upper", "snake"])
+def test_streaming_matches_whole_text(mode: str) -> None:
+    text = TEXT * 50
+    expected = convert_text(text, mode, protect=True)
+    for size in (1, 7, 64):
+        pieces = [text[start:start + size] for start in range(0, len(text), size)]
+        assert "".join(iter_convert(pieces, stream_transformer(mode, protect=True))) == expected
+
+
+def test_actions_protect_by_default(monkeypatch) -> None:
+    monkeypatch.setattr("main.clipboard_copy", lambda _text: None)
+    monkeypatch.setattr("main.time.sleep", lambda _seconds: None)
+    source = "open www.example.com/Docs now"
+    assert actions.run("upper", source_text=source, paste=False)[1] == "OPEN www.example.com/Docs NOW"
+    try:
+        actions.set_protection(False)
+        assert actions.run("upper", source_text=source, paste=False)[1] == source.upper()
+    finally:
+        actions.set_protection(True)
+
+
+def test_cli_protect_flag(tmp_path, capsys) -> None:
+    target = tmp_path / "notes.txt"
+    target.write_text("read docs/Setup_Guide.md first", encoding="utf-8")
+    assert main.main(["--convert", "upper", "--target", str(target), "--protect"]) == 0
+    assert capsys.readouterr().out == "READ docs/Setup_Guide.md FIRST"
+    assert main.main(["--convert", "upper", "--target", str(target)]) == 0
+    assert capsys.readouterr().out == "READ DOCS/SETUP_GUIDE.MD FIRST"
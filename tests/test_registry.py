@@ -0,0 +1,115 @@
+from pathlib import Path
+import importlib
+import subprocess
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+import main
+from conversion import iter_convert
+from conversion.registry import ENTRY_POINT_GROUP, TransformRegistry
+from main import TRANSFORMS, convert_text, stream_transformer
+from ui import actions
+
+PLUGIN = '''
+from conversion.streaming import WordBufferedTransformer
+
+
+def shout(text):
+    return text.upper() + "!"
+
+
+def spaced(text):
+    return " ".join(text)
+
+
+def _leet_stream(**_options):
+    return WordBufferedTransformer(lambda text: text.replace("a", "4"))
+
+
+leet = lambda text: text.replace("a", "4")
+leet.stream_transformer = _leet_stream
+'''
+
+
+@pytest.fixture
+def plugin_dist(tmp_path, monkeypatch):
+    """An installed distribution declaring plugin modes, one clashing and one broken."""
+
+    (tmp_path / "cm_demo_plugin.py").write_text(PLUGIN, encoding="utf-8")
+    dist_info = tmp_path / "cm_demo_plugin-1.0.dist-info"
+    dist_info.mkdir()
+    (dist_info / "METADATA").write_text("Name: cm-demo-plugin\nVersion: 1.0\n", encoding="utf-8")
+    (dist_info / "entry_points.txt").write_text(
+        f"[{ENTRY_POINT_GROUP}]\n"
+        "shout = cm_demo_plugin:shout\n"
+        "leet = cm_demo_plugin:leet\n"
+        "upper = cm_demo_plugin:spaced\n"
+        "broken = cm_demo_plugin:missing\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    importlib.invalidate_caches()
+    yield tmp_path
+    sys.modules.pop("cm_demo_plugin", None)
+    for name in ("shout", "leet", "broken"):
+        TRANSFORMS.unregister(name)
+
+
+def test_plugins_register_from_metadata_and_load_lazily(plugin_dist) -> None:
+    registry = TransformRegistry()
+    registry.register("upper", str.upper, category="case")
+    assert "shout" in registry
+    assert "cm_demo_plugin" not in sys.modules
+    spec = registry.spec("shout")
+    assert (spec.label, spec.category, spec.description) == ("shout", "plugin", "Convert with shout")
+    assert registry["upper"] is str.upper  # a built-in name wins over a plugin
+    assert registry["shout"]("hi") == "HI!"
+    assert "cm_demo_plugin" in sys.modules
+    with pytest.raises(ValueError, match="could not be loaded"):
+        registry["broken"]
+    assert "broken" in registry.errors
+
+
+def test_plugin_modes_convert_stream_and_run(plugin_dist, monkeypatch) -> None:
+    assert set(TRANSFORMS.discover()) == {"shout", "leet", "broken"}
+    assert convert_text("hey there", "shout") == "HEY THERE!"
+    assert convert_text("banana", "upper") == "BANANA"
+    text = "a banana and a papaya " * 50
+    pieces = [text[start:start + 7] for start in range(0, len(text), 7)]
+    assert "".join(iter_convert(pieces, stream_transformer("leet"))) == text.replace("a", "4")
+
+    monkeypatch.setattr("main.clipboard_copy", lambda _text: None)
+    monkeypatch.setattr("main.time.sleep", lambda _seconds: None)
+    assert actions.run("shout", source_text="go", paste=False)[1] == "GO!"
+    labels = actions.action_labels()
+    assert labels[0] == ("Upper case", "upper") and labels[-1] == (actions.CYCLE_LABEL, "cycle")
+    assert ("shout", "shout") in labels
+    assert [category for category, _specs in TRANSFORMS.categories()] == ["case", "identifier", "plugin"]
+
+
+def test_cli_accepts_plugin_modes(plugin_dist, capsys) -> None:
+    TRANSFORMS.discover()
+    target = plugin_dist / "notes.txt"
+    target.write_text("a banana", encoding="utf-8")
+    assert main.main(["--convert", "leet", "--target", str(target)]) == 0
+    assert capsys.readouterr().out == "4 b4n4n4"
+    with pytest.raises(SystemExit):
+        main.main(["--convert", "whisper", "--target", str(target)])
+    assert "whisper" not in TRANSFORMS
+
+
+def test_importing_main_does_not_scan_entry_points() -> None:
+    code = "import sys, main; main.convert_text('x', 'title'); print('importlib.metadata' in sys.modules)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
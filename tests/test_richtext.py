@@ -0,0 +1,119 @@
+from pathlib import Path
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+import main
+from conversion.richtext import HTML, RTF, RichTextTransformer
+from main import convert_rich_text
+
+PAGE = (
+    '<html><head><style>p { color: red }</style></head><body>\n'
+    '<p class="intro">hello <b>wor</b>ld. the <a href="https://example.com/?a=b&amp;c">link'
+    ' &amp; more</a>\nis here</p><p>next &eacute;t&eacute;<br>line</p>'
+    '<script>var title = "a < b";</script><!-- a > b --><pre>keep\nthis</pre></body></html>'
+)
+DOCUMENT = (
+    r"{\rtf1\ansi\ansicpg1252\deff0{\fonttbl{\f0 Arial;}}{\*\generator Riched20;}"
+    r"\f0 hello {\b wor}ld. caf\'e9 \u261? the end\par next line \{kept\}}"
+)
+
+
+def _chunked(document: str, mode: str, flavour: str, size: int) -> str:
+    transformer = RichTextTransformer(main.stream_transformer(mode, keep_trailing_newlines=True), flavour)
+    pieces = [transformer.feed(document[start:start + size]) for start in range(0, len(document), size)]
+    return "".join(pieces) + transformer.finish()
+
+
+def test_html_text_is_converted_and_markup_kept() -> None:
+    assert convert_rich_text(PAGE, "upper") == (
+        '<html><head><style>p { color: red }</style></head><body>\n'
+        '<p class="intro">HELLO <b>WOR</b>LD. THE <a href="https://example.com/?a=b&amp;c">LINK'
+        ' &amp; MORE</a>\nIS HERE</p><p>NEXT ÉTÉ<br>LINE</p>'
+        '<script>var title = "a < b";</script><!-- a > b --><pre>KEEP\nTHIS</pre></body></html>'
+    )
+
+
+def test_sentence_state_carries_across_tags() -> None:
+    converted = convert_rich_text(PAGE, "sentence")
+    # Inline tags and source line breaks do not end a sentence; paragraphs and <br> do.
+    assert "<p class=\"intro\">Hello <b>wor</b>ld. The <a" in converted
+    assert "</a>\nis here</p><p>Next &eacute;t&eacute;<br>Line</p>" in converted
+    assert convert_rich_text("<b>one</b> two", "title") == "<b>One</b> Two"
+    assert convert_rich_text("in<b>side</b> word", "title") == "In<b>side</b> Word"
+
+
+def test_markup_inside_a_word_whose_length_changes() -> None:
+    assert convert_rich_text("<p>gro<b>ß</b>e straße</p>", "upper") == "<p>GRO<b>SS</b>E STRASSE</p>"
+
+
+def test_rtf_control_words_and_groups_are_kept() -> None:
+    assert convert_rich_text(DOCUMENT, "upper", RTF) == (
+        r"{\rtf1\ansi\ansicpg1252\deff0{\fonttbl{\f0 Arial;}}{\*\generator Riched20;}"
+        r"\f0 HELLO {\b WOR}LD. CAF\'c9 \u260? THE END\par NEXT LINE \{KEPT\}}"
+    )
+    assert r"\f0 Hello {\b wor}ld. Caf\'e9 \u261? the end\par Next line" in convert_rich_text(
+        DOCUMENT, "sentence", RTF
+    )
+
+
+@pytest.mark.parametrize("flavour, document", [(HTML, PAGE * 3), (RTF, DOCUMENT[:-1] * 3 + "}")])
+@pytest.mark.parametrize("mode", ["upper", "title", "sentence", "snake"])
+def test_chunked_conversion_matches_whole_document(flavour: str, document: str, mode: str) -> None:
+    whole = convert_rich_text(document, mode, flavour)
+    for size in (1, 2, 3, 7, 64):
+        assert _chunked(document, mode, flavour, size) == whole
+
+
+def test_windows_html_format_round_trip() -> None:
+    import clipboard
+
+    wrapped = clipboard._cf_html_wrap("<p>été</p>")
+    header, _, body = wrapped.partition(b"<html>")
+    offsets = dict(line.split(":") for line in header.decode("ascii").split())
+    start, end = int(offsets["StartFragment"]), int(offsets["EndFragment"])
+    assert wrapped[start:end].decode("utf-8") == "<p>été</p>"
+    assert int(offsets["EndHTML"]) == len(wrapped)
+    assert clipboard._cf_html_unwrap(wrapped + b"\0") == wrapped[int(offsets["StartHTML"]):].decode("utf-8")
+
+
+@pytest.fixture
+def fake_clipboard(monkeypatch):
+    fake = main.clipboard.FakeClipboard()
+    main.clipboard.use_backend(fake)
+    monkeypatch.setattr("main._maybe_switch_window", lambda: None)
+    monkeypatch.setattr("main._paste_selection", lambda: None)
+    monkeypatch.setattr("main.time.sleep", lambda _seconds: None)
+    yield fake
+    main.clipboard.use_backend(None)
+
+
+def test_clipboard_actions_write_rich_and_plain_flavours(fake_clipboard, monkeypatch) -> None:
+    copied = {"text/plain": "hello world. bye", HTML: "<i>hello</i> world. <b>bye</b>", RTF: DOCUMENT}
+    monkeypatch.setattr("main._copy_selection", lambda: fake_clipboard.write(copied))
+    assert main.funky_case() == ("hello world. bye", "Hello world. Bye")
+    assert fake_clipboard.flavours == {
+        "text/plain": "Hello world. Bye",
+        HTML: "<i>Hello</i> world. <b>Bye</b>",
+        RTF: convert_rich_text(DOCUMENT, "sentence", RTF),
+    }
+    monkeypatch.setattr("main._copy_selection", lambda: fake_clipboard.write(copied))
+    assert main.cycle_case(("lower", "upper"))[1] == "HELLO WORLD. BYE"
+    assert fake_clipboard.flavours[HTML] == "<i>HELLO</i> WORLD. <b>BYE</b>"
+
+
+def test_plain_only_clipboards_and_the_cli(fake_clipboard, monkeypatch) -> None:
+    monkeypatch.setattr("main._copy_selection", lambda: fake_clipboard.copy("plain text"))
+    assert main.convert_clipboard("upper") == ("plain text", "PLAIN TEXT")
+    assert fake_clipboard.flavours == {"text/plain": "PLAIN TEXT"}
+    fake_clipboard.write({"text/plain": "a b", HTML: "<u>a</u> b"})
+    assert main.main(["--convert", "title"]) == 0
+    assert fake_clipboard.flavours == {"text/plain": "A B", HTML: "<u>A</u> B"}
@@ -0,0 +1,114 @@
+from pathlib import Path
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+import main
+from conversion import iter_convert
+from conversion.rules import RuleError, parse_rules
+from main import TRANSFORMS, convert_text, stream_transformer
+from ui import actions
+
+RULES = r"""
+[preferences]
+always_on_top = 1
+
+[rule:ticket-keys]
+pattern = \b[a-z]+-\d+\b
+case = upper
+
+[rule:hashes]
+pattern = \b(?:commit|sha) (?P<hash>[0-9a-fA-F]{7,40})\b
+case = lower
+group = hash
+order = -1
+
+[rule:shouting]
+pattern = (?i)\bnote\b
+case = upper
+mode = notes
+"""
+OPERATIONS = {"upper": str.upper, "lower": str.lower}
+
+
+@pytest.fixture
+def rules_file(tmp_path):
+    path = tmp_path / "casemonster.ini"
+    path.write_text(RULES, encoding="utf-8")
+    main.use_rules(path)
+    yield path
+    main.use_rules(main.DEFAULT_RULES_PATH)
+
+
+def test_rules_become_modes(rules_file) -> None:
+    assert main.rule_modes() == ["notes", "rules"]
+    text = "Fixed abc-123 in commit 9F3A2B1C, see Note 4.\n"
+    assert convert_text(text, "rules") == "Fixed ABC-123 in commit 9f3a2b1c, see Note 4.\n"
+    assert convert_text(text, "notes") == "Fixed abc-123 in commit 9F3A2B1C, see NOTE 4.\n"
+    text *= 20
+    pieces = [text[start:start + 5] for start in range(0, len(text), 5)]
+    assert "".join(iter_convert(pieces, stream_transformer("rules"))) == convert_text(text, "rules")
+
+
+def test_order_decides_which_rule_wins() -> None:
+    source = "[rule:a]\npattern = abc\ncase = upper\norder = 2\n[rule:b]\npattern = ab\ncase = lower\norder = 1\n"
+    rules = parse_rules(source, OPERATIONS)
+    assert [rule.name for rule in rules.modes["rules"].rules] == ["b", "a"]
+    assert rules.apply("rules", "abc") == "abc"
+    rules = parse_rules(source.replace("order = 2", "order = 0"), OPERATIONS)
+    assert rules.apply("rules", "abc") == "ABC"
+
+
+def test_edited_rules_are_recompiled(rules_file) -> None:
+    assert convert_text("abc-1", "rules") == "ABC-1"
+    rules_file.write_text("[rule:keys]\npattern = abc\ncase = title\n", encoding="utf-8")
+    os.utime(rules_file, ns=(1, 1))
+    assert convert_text("abc-1", "rules") == "Abc-1"
+    assert main.output_fingerprint("rules") == main.user_rules().fingerprint != ""
+
+
+@pytest.mark.parametrize(
+    "source, problem",
+    [
+        ("[rule:x]\ncase = upper\n", "missing pattern"),
+        ("[rule:x]\npattern = (\ncase = upper\n", "bad pattern"),
+        ("[rule:x]\npattern = a*\ncase = upper\n", "empty text"),
+        ("[rule:x]\npattern = a\ncase = shout\n", "unknown case"),
+        ("[rule:x]\npattern = (a)\\1\ncase = upper\n", "named group"),
+        ("[rule:x]\npattern = a\ncase = upper\ngroup = 2\n", "no group 2"),
+        ("[rule:x]\npattern = a\ncase = upper\nmode = upper\n", "mode name"),
+        ("[rule:x]\npattern = a\ncase = upper\ncolour = red\n", "unknown option"),
+    ],
+)
+def test_invalid_rules(source: str, problem: str) -> None:
+    with pytest.raises(RuleError, match=problem):
+        parse_rules(source, OPERATIONS, reserved={"upper"})
+
+
+def test_rule_timings(rules_file, capsys) -> None:
+    target = rules_file.with_name("sample.txt")
+    target.write_text("abc-1 def-2 commit abcdef0\n", encoding="utf-8")
+    argv = ["--convert", "rules", "--rules", str(rules_file), "--target", str(target)]
+    assert main.main(argv + ["--rule-timings"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert sorted(line.split()[-1] for line in lines) == ["hashes", "ticket-keys"]
+    assert main.main(argv) == 0
+    assert capsys.readouterr().out == "ABC-1 DEF-2 commit abcdef0\n"
+
+
+def test_rule_modes_run_as_actions(rules_file, monkeypatch) -> None:
+    monkeypatch.setattr("main.clipboard_copy", lambda _text: None)
+    monkeypatch.setattr("main.time.sleep", lambda _seconds: None)
+    assert "rules" in TRANSFORMS
+    assert actions.run("rules", source_text="see xy-9", paste=False)[1] == "see XY-9"
+    main.use_rules(main.DEFAULT_RULES_PATH)
+    assert "rules" not in TRANSFORMS and actions.run("rules", source_text="x") is None
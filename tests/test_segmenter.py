@@ -0,0 +1,45 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import SentenceRules, sentence_boundaries, sentence_case
+from conversion.segmenter import boundary_pattern
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("see dr. smith. he waits.", "See dr. smith. He waits."),
+        ("e.g. this and cf. that. next", "E.g. this and cf. that. Next"),
+        ("pi is 3.14 today. v1.2.3 ships.", "Pi is 3.14 today. V1.2.3 ships."),
+        ("visit example.com now. ok", "Visit example.com now. Ok"),
+        ("wait... what? fine… go on", "Wait... what? Fine… go on"),
+        ('he said "stop." then left.', 'He said "stop." Then left.'),
+        ("as shown (see above.) next one", "As shown (see above.) Next one"),
+        ("see no. 5 here. say no. then go", "See no. 5 here. Say no. Then go"),
+        ("first。second！third", "First。Second！Third"),
+        ("really?! yes.. ok", "Really?! Yes.. Ok"),
+    ],
+)
+def test_sentence_case_uses_abbreviation_aware_boundaries(source: str, expected: str) -> None:
+    assert sentence_case(source, upper_first=False) == expected
+    assert sentence_case(source.upper()) == expected
+
+
+def test_boundaries_are_offsets_after_terminator_and_closers() -> None:
+    assert list(sentence_boundaries('One. "Two!" Three')) == [4, 11]
+    assert list(sentence_boundaries("Mr. Dr. Jr.")) == []
+
+
+def test_custom_rules_are_compiled_once() -> None:
+    rules = SentenceRules.create(["approx.", "Ca"], ["ex"])
+    assert rules.abbreviations == frozenset({"approx", "ca"})
+    assert boundary_pattern(rules) is boundary_pattern(SentenceRules.create(["ca", "approx"], ["ex"]))
+
+    text = "made ca. 1900. see ex. 4 and dr. who."
+    assert sentence_case(text, upper_first=False, rules=rules) == "Made ca. 1900. See ex. 4 and dr. Who."
@@ -0,0 +1,166 @@
+from pathlib import Path
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+
+import pytest
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import client
+import service
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="uses a Unix domain socket")
+
+
+@pytest.fixture
+def runtime(monkeypatch):
+    # Unix socket paths are length limited, so avoid pytest's deep tmp_path.
+    directory = Path(tempfile.mkdtemp(prefix="cm-"))
+    monkeypatch.setattr(service, "runtime_dir", lambda: directory)
+    yield directory
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def server(runtime):
+    instance = service.ConversionServer(str(runtime / "s.sock"), batch_seconds=0.2)
+    thread = instance.start()
+    yield instance
+    instance.close()
+    thread.join(timeout=2)
+
+
+def test_text_request_is_converted(server) -> None:
+    response = service.send_request({"mode": "upper", "text": "hello"}, address=server.address)
+    assert response == {"ok": True, "text": "HELLO"}
+
+
+def test_concurrent_path_requests_share_one_batch(server, runtime) -> None:
+    paths = []
+    for index in range(4):
+        path = runtime / f"file{index}.txt"
+        path.write_text(f"file {index}", encoding="utf-8")
+        paths.append(path)
+
+    responses = []
+
+    def submit(path: Path) -> None:
+        responses.append(
+            service.send_request(
+                {"mode": "upper", "paths": [str(path)], "in_place": True},
+                address=server.address,
+            )
+        )
+
+    threads = [threading.Thread(target=submit, args=(path,)) for path in paths]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert all(response["ok"] for response in responses)
+    assert [path.read_text(encoding="utf-8") for path in paths] == [f"FILE {i}" for i in range(4)]
+    assert server.batches == 1
+
+
+def test_client_uses_service_and_reports_errors(server, runtime, capsys) -> None:
+    target = runtime / "note.txt"
+    target.write_text("shout", encoding="utf-8")
+
+    assert client.main(["--convert", "upper", "--target", str(target)], address=server.address) == 0
+    assert capsys.readouterr().out == "SHOUT"
+
+    missing = runtime / "missing.txt"
+    assert client.main(["--convert", "upper", "--target", str(missing)], address=server.address) == 1
+    assert "missing.txt" in capsys.readouterr().err
+
+
+def test_client_falls_back_without_service(runtime, capsys) -> None:
+    target = runtime / "note.txt"
+    target.write_text("quiet", encoding="utf-8")
+
+    status = client.main(
+        ["--convert", "upper", "--target", str(target)], address=str(runtime / "none.sock")
+    )
+
+    assert status == 0
+    assert capsys.readouterr().out == "QUIET"
+
+
+def test_client_sends_paths_relative_to_its_own_directory(tmp_path, monkeypatch, capsys) -> None:
+    base = Path(tempfile.mkdtemp(prefix="cm-"))
+    monkeypatch.setattr(service, "runtime_dir", lambda: base / "caseMonster")
+    (tmp_path / "service").mkdir()
+    (tmp_path / "work").mkdir()
+    (tmp_path / "work" / "note.txt").write_text("relative", encoding="utf-8")
+    address = str(base / "s.sock")
+    env = dict(os.environ, XDG_RUNTIME_DIR=str(base))
+    process = subprocess.Popen(
+        [sys.executable, str(ROOT / "service.py"), "--address", address],
+        cwd=tmp_path / "service",
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        for _ in range(100):
+            if service.send_request({"command": "ping"}, address=address):
+                break
+            assert process.poll() is None, "the service exited"
+            time.sleep(0.1)
+        monkeypatch.chdir(tmp_path / "work")
+        monkeypatch.setattr("main.main", lambda _argv: pytest.fail("the service was not used"))
+
+        assert client.main(["--convert", "upper", "--target", "note.txt", "--in-place"], address=address) == 0
+        assert (tmp_path / "work" / "note.txt").read_text(encoding="utf-8") == "RELATIVE"
+    finally:
+        service.send_request({"command": "shutdown"}, address=address)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def test_untrusted_runtime_directory_is_refused(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    shared = tmp_path / "caseMonster"
+    shared.mkdir(mode=0o755)
+    shared.chmod(0o755)  # as another user could leave it, with their own key inside
+    (shared / "service.key").write_bytes(b"planted")
+
+    with pytest.raises(PermissionError):
+        service.runtime_dir()
+    assert service.send_request({"command": "ping"}) is None
+    assert service.main([]) == 1
+
+    shared.chmod(0o700)
+    assert service.runtime_dir() == shared
+    shared.rename(tmp_path / "elsewhere")
+    shared.symlink_to(tmp_path / "elsewhere")
+    with pytest.raises(PermissionError):
+        service.runtime_dir()
+
+
+def test_authkey_is_never_read_or_written_through_a_symlink(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    victim = tmp_path / "victim.txt"
+    victim.write_text("keep", encoding="utf-8")
+    key = service.runtime_dir() / "service.key"
+    key.symlink_to(victim)
+
+    with pytest.raises(OSError):
+        service.load_authkey()
+    assert service.send_request({"command": "ping"}) is None
+
+    created = service.load_authkey(create=True)
+    assert not key.is_symlink() and key.read_bytes() == created
+    assert victim.read_text(encoding="utf-8") == "keep"
@@ -0,0 +1,29 @@
+from pathlib import Path
+import subprocess
+import sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _imported_modules(statement: str) -> set[str]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        name = line.rsplit("|", 1)[1].strip()
+        modules.add(name)
+    return modules
+
+
+def test_importing_main_defers_automation_and_clipboard_backends() -> None:
+    modules = _imported_modules("import main")
+
+    assert "main" in modules
+    assert not {"pyautogui", "pyperclip", "kivy"} & modules
@@ -0,0 +1,188 @@
+from pathlib import Path
+import io
+import random
+import subprocess
+import sys
+import types
+
+import pytest
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from conversion import SentenceCaser, WordBufferedTransformer, iter_convert
+from conversion.segmenter import DEFAULT_ABBREVIATIONS, DEFAULT_NUMERIC_ABBREVIATIONS
+from main import TRANSFORMS, convert_text, stream_transformer
+
+
+_TERMINATORS = ".!?…"
+_FULL_WIDTH = "。！？｡"
+_CLOSERS = "\"'”’»)]}」』）】"
+
+
+def _reference_matches(text, start, word):
+    def same(char, letter):
+        return char == letter or char.lower()[:1] == letter or char.upper() == letter.upper()
+
+    return (
+        start >= 0
+        and all(same(char, letter) for char, letter in zip(text[start:], word))
+        and (start == 0 or not (text[start - 1].isalnum() or text[start - 1] == "_"))
+    )
+
+
+def _reference_boundaries(text):
+    """Character-by-character version of the segmenter's rules."""
+
+    ends = set()
+    index = 0
+    while index < len(text):
+        if text[index] not in _TERMINATORS + _FULL_WIDTH:
+            index += 1
+            continue
+        end = index
+        while end < len(text) and text[end] in _TERMINATORS + _FULL_WIDTH:
+            end += 1
+        run = text[index:end]
+        after = end
+        while after < len(text) and text[after] in _CLOSERS:
+            after += 1
+        spaced = after == len(text) or text[after].isspace()
+        if run[0] in _FULL_WIDTH:
+            ends.add(after)
+        elif spaced and ("!" in run or "?" in run or run == ".."):
+            ends.add(after)
+        elif spaced and run == ".":
+            gap = end
+            while gap < len(text) and text[gap].isspace():
+                gap += 1
+            numbered = gap > end and gap < len(text) and text[gap].isdecimal()
+            abbreviated = any(
+                _reference_matches(text, index - len(word), word) for word in DEFAULT_ABBREVIATIONS
+            ) or (
+                numbered
+                and any(
+                    _reference_matches(text, index - len(word), word)
+                    for word in DEFAULT_NUMERIC_ABBREVIATIONS
+                )
+            )
+            if not abbreviated:
+                ends.add(after)
+        index = end
+    return ends
+
+
+def _reference_cap_first_letter(characters):
+    fin_list = []
+    caps = True
+    ends = _reference_boundaries("".join(characters))
+    for index, char in enumerate(characters):
+        if index in ends:
+            caps = True
+        if char == " ":
+            fin_list.append(char)
+        elif char.isalpha() and caps:
+            fin_list.append(char.upper())
+            caps = False
+        elif char.isalpha():
+            if (
+                char.lower() == "i"
+                and fin_list
+                and fin_list[-1] == " "
+                and (
+                    index + 1 == len(characters)
+                    or characters[index + 1] in [" ", ".", "!", "?", "\n"]
+                )
+            ):
+                fin_list.append(char.upper())
+            elif (
+                char.lower() == "i"
+                and index + 1 < len(characters)
+                and characters[index + 1] in ["’", "'"]
+            ):
+                fin_list.append(char.upper())
+            else:
+                fin_list.append(char.lower())
+        else:
+            fin_list.append(char.lower())
+    return fin_list
+
+
+def _reference_cap_special(text):
+    fin = []
+    caps = False
+    for char in text:
+        if char in ["\t", "\n", "\r"]:
+            fin.append(char)
+            caps = True
+        elif caps:
+            fin.append(char.upper())
+            caps = False
+        else:
+            fin.append(char)
+    return "".join(fin)
+
+
+def _reference_sentence(text):
+    """A slow per-character implementation of sentence mode."""
+
+    upper = text.upper()
+    result = _reference_cap_special("".join(_reference_cap_first_letter(list(upper))))
+    trailing = len(upper) - len(upper.rstrip("\r\n"))
+    leading = len(upper) - len(upper.lstrip("\r\n"))
+    if trailing:
+        if leading == 0:
+            result = result.rstrip("\r\n")
+        else:
+            result = result.rstrip("\r\n") + upper[-trailing:]
+    return result
+
+
+_ALPHABET = list("abcdefghiI .!?\n\r\t'’,3²_") + ["ß", "Σ", "ς", "İ", "é", "ŉ", "ﬁ"]
+_ALPHABET += ["…", "...", "。", "！", '"', ")", "(", " dr", "e.g", " no", " 5", "v1.2", " vs"]
+
+
+def _chunked(text, sizes):
+    position = 0
+    for size in sizes:
+        yield text[position : position + size]
+        position += size
+    yield text[position:]
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_sentence_mode_matches_reference_for_any_chunking(seed: int) -> None:
+    rng = random.Random(seed)
+    text = "".join(rng.choice(_ALPHABET) for _ in range(rng.randint(0, 300)))
+    expected = _reference_sentence(text)
+
+    assert convert_text(text, "sentence") == expected
+    sizes = [rng.randint(1, 7) for _ in range(60)]
+    assert "".join(iter_convert(_chunked(text, sizes), SentenceCaser())) == expected
+
+
+@pytest.mark.parametrize("mode", ["upper", "lower", "title"])
+def test_word_buffered_modes_are_chunk_boundary_safe(mode: str) -> None:
+    text = "ΟΔΟΣ ΟΔΟΣ. hello wORLD they're\nnext line " * 20
+    pieces = list(_chunked(text, [3, 5, 11, 2] * 30))
+    streamed = "".join(iter_convert(pieces, WordBufferedTransformer(TRANSFORMS[mode])))
+    assert streamed == TRANSFORMS[mode](text)
+
+
+def test_stream_transformer_uses_sentence_caser() -> None:
+    assert isinstance(stream_transformer("sentence"), SentenceCaser)
+
+
+def test_stdin_filter_preserves_line_endings_and_bytes() -> None:
+    payload = b"hello there.\r\nsecond line \xff.\n"
+    completed = subprocess.run(
+        [sys.executable, "main.py", "--convert", "upper", "--target", "-"],
+        cwd=ROOT,
+        input=payload,
+        capture_output=True,
+        check=True,
+    )
+    assert completed.stdout == b"HELLO THERE.\r\nSECOND LINE \xff.\n"
@@ -0,0 +1,129 @@
+from pathlib import Path
+import codecs
+import os
+import stat
+import sys
+import types
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("pyautogui", types.SimpleNamespace(hotkey=lambda *_, **__: None))
+sys.modules.setdefault("pyperclip", types.SimpleNamespace(copy=lambda *_: None, paste=lambda: ""))
+
+from conversion import WordBufferedTransformer, convert_in_place, sniff_encoding
+from main import main
+
+TEXT = "hello wörld.\r\nsecond line ß\nend"
+
+
+@pytest.mark.parametrize(
+    "encoded, codec",
+    [
+        (codecs.BOM_UTF8 + TEXT.encode("utf-8"), "utf-8"),
+        (codecs.BOM_UTF16_LE + TEXT.encode("utf-16-le"), "utf-16-le"),
+        (codecs.BOM_UTF16_BE + TEXT.encode("utf-16-be"), "utf-16-be"),
+        (TEXT.encode("utf-16-le"), "utf-16-le"),
+        (TEXT.encode("utf-8"), "utf-8"),
+        ("naïve café “quoted”".encode("cp1252"), "cp1252"),
+    ],
+)
+def test_in_place_conversion_keeps_encoding_bom_and_line_endings(tmp_path, encoded, codec) -> None:
+    path = tmp_path / "sample.txt"
+    path.write_bytes(encoded)
+    encoding = sniff_encoding(encoded, complete=True)
+    assert encoding.codec == codec
+
+    assert convert_in_place(path, WordBufferedTransformer(str.upper), chunk_size=5)
+    text = encoded[len(encoding.bom) :].decode(codec)
+    assert path.read_bytes() == encoding.bom + text.upper().encode(codec)
+
+
+def test_binary_files_are_not_text() -> None:
+    assert sniff_encoding(b"\x89PNG\r\n\x1a\n\0\0\0\rIHDR") is None
+
+
+def test_unchanged_file_is_not_rewritten_and_mode_is_kept(tmp_path) -> None:
+    path = tmp_path / "script.sh"
+    path.write_bytes(b"ALREADY UPPER\n")
+    os.chmod(path, 0o750)
+    inode = path.stat().st_ino
+
+    assert not convert_in_place(path, WordBufferedTransformer(str.upper))
+    assert path.stat().st_ino == inode
+
+    path.write_bytes(b"lower\n")
+    assert convert_in_place(path, WordBufferedTransformer(str.upper))
+    assert path.read_bytes() == b"LOWER\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o750
+    assert [entry.name for entry in tmp_path.iterdir()] == ["script.sh"]
+
+
+def test_failure_mid_write_leaves_original_intact(tmp_path) -> None:
+    path = tmp_path / "big.txt"
+    original = ("line of text\n" * 1000).encode("utf-8")
+    path.write_bytes(original)
+
+    class Exploding(WordBufferedTransformer):
+        def feed(self, chunk: str) -> str:
+            if self._carry:
+                raise RuntimeError("disk full")
+            return super().feed(chunk)
+
+    with pytest.raises(RuntimeError):
+        convert_in_place(path, Exploding(str.upper), chunk_size=100)
+    assert path.read_bytes() == original
+    assert [entry.name for entry in tmp_path.iterdir()] == ["big.txt"]
+
+
+def test_cli_streams_utf16_file_to_stdout(tmp_path, capsys) -> None:
+    path = tmp_path / "wide.txt"
+    path.write_bytes(codecs.BOM_UTF16_LE + "one. two".encode("utf-16-le"))
+
+    assert main(["--convert", "sentence", "--target", str(path)]) == 0
+    assert capsys.readouterr().out == "One. Two"
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        codecs.BOM_UTF16_LE + "odd length".encode("utf-16-le") + b"x",
+        codecs.BOM_UTF32_LE + "cut".encode("utf-32-le")[:-2],
+    ],
+)
+def test_truncated_wide_files_are_reported_not_fatal(tmp_path, capsys, encoded) -> None:
+    (tmp_path / "good.txt").write_text("fine", encoding="utf-8")
+    broken = tmp_path / "broken.txt"
+    broken.write_bytes(encoded)
+
+    assert main(["--convert", "upper", "--target", str(tmp_path), "--dry-run"]) == 0
+    captured = capsys.readouterr()
+    assert "good.txt: 4 characters on 1 line would change" in captured.out
+    assert f"{broken}: UnicodeDecodeError" in captured.err
+
+    assert main(["--convert", "upper", "--target", str(tmp_path), "--in-place"]) == 1
+    assert "broken.txt: UnicodeDecodeError" in capsys.readouterr().err
+    assert (tmp_path / "good.txt").read_text(encoding="utf-8") == "FINE"
+    assert broken.read_bytes() == encoded
+
+
+def test_in_place_conversion_writes_through_symlinks(tmp_path) -> None:
+    real = tmp_path / "real.txt"
+    real.write_text("hello", encoding="utf-8")
+    link = tmp_path / "link.txt"
+    link.symlink_to(real)
+
+    assert main(["--convert", "upper", "--target", str(link), "--in-place"]) == 0
+    assert link.is_symlink()
+    assert real.read_text(encoding="utf-8") == "HELLO"
+
+    tree = tmp_path / "tree"
+    tree.mkdir()
+    (tree / "alias.txt").symlink_to(real)
+    assert main(["--convert", "lower", "--target", str(tree), "--in-place"]) == 0
+    assert (tree / "alias.txt").is_symlink()
+    assert real.read_text(encoding="utf-8") == "hello"
+    assert not list(tmp_path.glob("*.casemonster")) and not list(tree.glob(".*.casemonster"))
@@ -0,0 +1,53 @@
+from pathlib import Path
+import random
+import sys
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import title_case
+from conversion.titlecase import _TOKEN, _title_token
+
+
+def _by_token(text: str) -> str:
+    return _TOKEN.sub(lambda match: _title_token(match.group(), str.title), text)
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("don't stop", "Don't Stop"),
+        ("o'neill's e-mail", "O'Neill's E-mail"),
+        ("we’re sure they'll say i'd", "We’re Sure They'll Say I'd"),
+        ("the 21st century and the 1990s", "The 21st Century And The 1990s"),
+        ("2nd and 3rd and 4th", "2nd And 3rd And 4th"),
+        ("well-known x-ray", "Well-known X-ray"),
+        ("ask McDonald about the iPhone", "Ask McDonald About The iPhone"),
+        ("jean-luc and Jean-Luc", "Jean-luc And Jean-Luc"),
+        ("HELLO WORLD", "Hello World"),
+        ("'quoted' words", "'Quoted' Words"),
+        ("ça va? éCole", "Ça Va? éCole"),
+        ("straße und ßa", "Straße Und Ssa"),
+    ],
+)
+def test_title_case(source: str, expected: str) -> None:
+    assert title_case(source) == expected
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("script", ["ascii", "latin-1", "any"])
+def test_whole_text_matches_token_by_token(seed: int, script: str) -> None:
+    # The whole-text paths work on offsets; the token path is the definition.
+    alphabet = ["a", "b", "Mc", "D", "N", "R", "st", "s", "t", "re", "ll", "'", "-", "1", "9", "_", "@", " ", "\n", "."]
+    if script != "ascii":
+        alphabet += ["é", "É", "ß", "µ", "ÿ", "ª", "²", "À"]
+    if script == "any":
+        alphabet += ["’", "ω", "Ω", "ς"]
+    rng = random.Random(seed)
+    for _ in range(50):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+        assert title_case(text) == _by_token(text), text
+
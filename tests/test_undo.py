@@ -0,0 +1,70 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ui.undo import CaseMask, ConversionUndoStack, TextDiff, encode_step
+
+
+@pytest.mark.parametrize(
+    "base, target",
+    [
+        ("hello world", "HELLO WORLD"),
+        ("Hello World", "hello world"),
+        ("", ""),
+        ("ΣΊΣΥΦΟΣ και", "σίσυφοσ ΚΑΙ"),
+        ("ünïcode Text", "ÜNÏCODE text"),
+    ],
+)
+def test_case_only_changes_round_trip_through_mask(base: str, target: str) -> None:
+    step = encode_step(base, target)
+    assert isinstance(step, CaseMask)
+    assert step.apply(base) == target
+
+
+def test_mask_uses_about_one_bit_per_character() -> None:
+    base = "the quick brown fox. " * 50_000
+    mask = CaseMask.between(base, base.upper())
+    assert mask is not None
+    assert mask.nbytes <= len(base) // 8 + 1
+
+
+@pytest.mark.parametrize(
+    "base, target",
+    [
+        ("straße", "STRASSE"),
+        ("a@b", "a`b"),
+        ("abc", "abd"),
+    ],
+)
+def test_non_case_edits_fall_back_to_diff(base: str, target: str) -> None:
+    step = encode_step(base, target)
+    assert isinstance(step, TextDiff)
+    assert step.apply(base) == target
+
+
+def test_undo_redo_walks_the_conversion_chain() -> None:
+    stack = ConversionUndoStack()
+    stack.record("some text", "SOME TEXT")
+    stack.record("SOME TEXT", "Some Text")
+
+    assert stack.undo() == "SOME TEXT"
+    assert stack.undo() == "some text"
+    assert stack.undo() is None
+    assert stack.redo() == "SOME TEXT"
+
+    stack.record("SOME TEXT", "some text")
+    assert not stack.can_redo
+    assert stack.undo() == "SOME TEXT"
+
+
+def test_unrelated_source_starts_a_new_chain() -> None:
+    stack = ConversionUndoStack()
+    stack.record("first", "FIRST")
+    stack.record("second", "SECOND")
+
+    assert len(stack) == 2
+    assert stack.undo() == "second"
+    assert not stack.can_undo
@@ -0,0 +1,138 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from conversion import WordBufferedTransformer, convert_in_place
+from conversion.watch import DirectoryWatcher, InotifyBackend, PollingBackend, file_signature, is_hidden
+
+
+def _backends():
+    yield pytest.param(lambda root: PollingBackend(root, interval=0.05), id="polling")
+    if sys.platform.startswith("linux"):
+        yield pytest.param(InotifyBackend, id="inotify")
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.calls = []
+
+    def __call__(self, path: str) -> bool:
+        self.calls.append(path)
+        return convert_in_place(Path(path), WordBufferedTransformer(str.upper))
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not reached")
+        time.sleep(0.02)
+
+
+@pytest.fixture
+def started(tmp_path):
+    watchers = []
+
+    def start(make_backend):
+        handler = _Recorder()
+        watcher = DirectoryWatcher(
+            tmp_path, handler, debounce=0.15, backend=make_backend(str(tmp_path))
+        )
+        thread = threading.Thread(target=watcher.run, daemon=True)
+        thread.start()
+        watchers.append((watcher, thread))
+        return handler
+
+    yield start
+    for watcher, thread in watchers:
+        watcher.stop()
+        thread.join(timeout=5)
+
+
+@pytest.mark.parametrize("make_backend", list(_backends()))
+def test_bursts_are_debounced_and_own_writes_ignored(tmp_path, started, make_backend) -> None:
+    handler = started(make_backend)
+    target = tmp_path / "notes.txt"
+    for text in ("one", "one two", "one two three"):
+        target.write_text(text, encoding="utf-8")
+        time.sleep(0.02)
+
+    _wait_for(lambda: target.read_text(encoding="utf-8") == "ONE TWO THREE")
+    time.sleep(0.5)  # our own rewrite must not trigger another round
+    assert handler.calls == [str(target)]
+
+
+@pytest.mark.parametrize("make_backend", list(_backends()))
+def test_files_in_new_subdirectories_are_converted(tmp_path, started, make_backend) -> None:
+    handler = started(make_backend)
+    nested = tmp_path / "a" / "b"
+    nested.mkdir(parents=True)
+    (nested / "deep.txt").write_text("deep", encoding="utf-8")
+
+    _wait_for(lambda: (nested / "deep.txt").read_text(encoding="utf-8") == "DEEP")
+    assert handler.calls == [str(nested / "deep.txt")]
+
+
+@pytest.mark.parametrize("make_backend", list(_backends()))
+def test_hidden_directories_are_not_converted(tmp_path, started, make_backend) -> None:
+    (tmp_path / ".git").mkdir()
+    handler = started(make_backend)
+    (tmp_path / ".git" / "x").write_text("ref: main", encoding="utf-8")
+    (tmp_path / ".cache" / "deep").mkdir(parents=True)
+    (tmp_path / ".cache" / "deep" / "y.txt").write_text("cached", encoding="utf-8")
+    visible = tmp_path / "visible.txt"
+    visible.write_text("shown", encoding="utf-8")
+
+    _wait_for(lambda: visible.read_text(encoding="utf-8") == "SHOWN")
+    time.sleep(0.3)
+    assert handler.calls == [str(visible)]
+    assert (tmp_path / ".git" / "x").read_text(encoding="utf-8") == "ref: main"
+    assert (tmp_path / ".cache" / "deep" / "y.txt").read_text(encoding="utf-8") == "cached"
+
+
+@pytest.mark.parametrize("make_backend", list(_backends()))
+def test_save_during_conversion_is_not_overwritten(tmp_path, make_backend) -> None:
+    target = tmp_path / "notes.txt"
+    calls = []
+
+    class SavedMeanwhile(WordBufferedTransformer):
+        def feed(self, chunk: str) -> str:
+            if len(calls) == 1:
+                target.write_text("saved again later", encoding="utf-8")
+            return super().feed(chunk)
+
+    def handler(path: str) -> bool:
+        calls.append(path)
+        before = file_signature(path)
+        return convert_in_place(
+            Path(path), SavedMeanwhile(str.upper), precondition=lambda: file_signature(path) == before
+        )
+
+    watcher = DirectoryWatcher(tmp_path, handler, debounce=0.15, backend=make_backend(str(tmp_path)))
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    try:
+        target.write_text("first draft", encoding="utf-8")
+        _wait_for(lambda: target.read_text(encoding="utf-8") == "SAVED AGAIN LATER")
+        time.sleep(0.5)
+        assert len(calls) == 2
+        # The echo of our own rewrite was seen and its entry dropped.
+        assert not watcher._own_writes
+    finally:
+        watcher.stop()
+        thread.join(timeout=5)
+
+
+def test_is_hidden_looks_at_every_component_below_the_root(tmp_path) -> None:
+    root = str(tmp_path / ".config" / "notes")
+    assert not is_hidden(root + "/todo.txt", root)
+    assert is_hidden(root + "/.git/HEAD", root)
+    assert is_hidden(root + "/a/.hidden/b.txt", root)
+    assert is_hidden(root + "/.swp", root)
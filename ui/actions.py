@@ -2,19 +2,76 @@
 
 from __future__ import annotations
 
-from typing import Callable, Dict, Optional, Tuple
+from functools import partial
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
-from main import funky_case, lower_case, title_case, upper_case
+from main import (
+    TRANSFORMS,
+    convert_clipboard,
+    cycle_case,
+    funky_case,
+    lower_case,
+    title_case,
+    transform_clipboard,
+    upper_case,
+)
 
 ActionResult = Tuple[str, str]
 TransformAction = Callable[..., ActionResult]
 
+# Modes the "cycle" action steps through; see :func:`set_cycle_rotation`.
+DEFAULT_CYCLE_ROTATION = ("upper", "lower", "title", "sentence")
+_cycle_rotation: Tuple[str, ...] = DEFAULT_CYCLE_ROTATION
+# Leave URLs, e-mail addresses, paths and code alone; see :func:`set_protection`.
+_protect = True
+
+
+def set_cycle_rotation(modes: Iterable[str]) -> Tuple[str, ...]:
+    """Make the "cycle" action step through *modes*, in order."""
+
+    global _cycle_rotation
+    rotation = tuple(modes)
+    if not rotation:
+        raise ValueError("the cycle rotation needs at least one mode")
+    unknown = [mode for mode in rotation if mode not in TRANSFORMS]
+    if unknown:
+        raise ValueError(f"unknown mode(s) in the cycle rotation: {', '.join(unknown)}")
+    _cycle_rotation = rotation
+    return rotation
+
+
+def set_protection(enabled: bool) -> bool:
+    """Turn protected spans on or off for every action."""
+
+    global _protect
+    _protect = bool(enabled)
+    return _protect
+
+
+def cycle(
+    source_text: Optional[str] = None, *, paste: bool = True, protect: bool = True
+) -> ActionResult:
+    """Detect the selection's style and convert it to the next one in the rotation."""
+
+    return cycle_case(_cycle_rotation, source_text, paste=paste, protect=protect)
+
+
+# Actions with a function of their own; every other mode in TRANSFORMS
+# (identifiers, plugins, user rules) runs through ``convert_clipboard``.
 ACTIONS: Dict[str, TransformAction] = {
     "upper": upper_case,
     "lower": lower_case,
     "title": title_case,
     "sentence": funky_case,
+    "cycle": cycle,
 }
+CYCLE_LABEL = "Cycle case"
+
+
+def action_labels() -> List[Tuple[str, str]]:
+    """``(menu label, mode)`` for every mode in TRANSFORMS, then the cycle action."""
+
+    return [(spec.title, spec.name) for spec in TRANSFORMS.specs()] + [(CYCLE_LABEL, "cycle")]
 
 
 def run(
@@ -25,8 +82,27 @@ def run(
 ) -> Optional[ActionResult]:
     action = ACTIONS.get(mode)
     if action is None:
-        return None
-    return action(source_text=source_text, paste=paste)
+        if mode not in TRANSFORMS:
+            return None
+        action = partial(convert_clipboard, mode)
+    return action(source_text=source_text, paste=paste, protect=_protect)
+
+
+def paste_text(text: str, *, paste: bool = True) -> ActionResult:
+    """Put *text* back on the clipboard and paste it into the previous window."""
+
+    return transform_clipboard(lambda _value: text, text, paste=paste)
 
 
-__all__ = ["ACTIONS", "run", "ActionResult"]
+__all__ = [
+    "ACTIONS",
+    "ActionResult",
+    "CYCLE_LABEL",
+    "DEFAULT_CYCLE_ROTATION",
+    "action_labels",
+    "cycle",
+    "paste_text",
+    "run",
+    "set_cycle_rotation",
+    "set_protection",
+]
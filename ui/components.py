@@ -4,9 +4,10 @@ from __future__ import annotations
 
 from typing import Any
 
+from kivy.core.window import Window
 from kivy.graphics import Color, RoundedRectangle
 from kivy.metrics import dp
-from kivy.properties import ListProperty, NumericProperty
+from kivy.properties import BooleanProperty, ListProperty, NumericProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.button import Button
 from kivy.uix.label import Label
@@ -57,6 +58,7 @@ class AccentButton(Button):
     """Rounded button styled with the accent palette."""
 
     button_color = ListProperty(styles.ACCENT_PRIMARY)
+    hovered = BooleanProperty(False)
 
     def __init__(self, **kwargs: Any) -> None:
         kwargs.setdefault("size_hint", (None, None))
@@ -69,6 +71,22 @@ class AccentButton(Button):
         self._reset_background()
         self.bind(on_press=self._on_press, on_release=self._on_release)
 
+    def on_parent(self, _widget: Any, parent: Any) -> None:
+        # Track the pointer only while in a widget tree: the Window keeps its
+        # bound handlers alive, which would leak every removed button.
+        Window.unbind(mouse_pos=self._on_mouse_pos)
+        if parent is None:
+            self.hovered = False
+        else:
+            Window.bind(mouse_pos=self._on_mouse_pos)
+
+    def _on_mouse_pos(self, _window: Any, pos: Any) -> None:
+        if self.get_root_window() is None:
+            return
+        inside = self.collide_point(*self.to_widget(*pos))
+        if inside != self.hovered:
+            self.hovered = inside
+
     def _reset_background(self) -> None:
         self.background_color = self.button_color
 
@@ -2,7 +2,47 @@
 
 from __future__ import annotations
 
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from .main_frame import format_history_label
+
+
+class HistoryEntry:
+    """A recorded clipboard value together with its memoised display label."""
+
+    __slots__ = ("text", "_label")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._label: Optional[str] = None
+
+    @property
+    def label(self) -> str:
+        """Return the dropdown label, computed once from a bounded prefix."""
+
+        if self._label is None:
+            self._label = format_history_label(self.text)
+        return self._label
+
+    def __repr__(self) -> str:
+        return f"HistoryEntry({self.label!r})"
+
+
+class HistoryChange(NamedTuple):
+    """Incremental change notification emitted by :class:`ClipboardHistory`.
+
+    ``kind`` is ``"insert"``, ``"remove"`` or ``"move"``. ``index`` is the
+    entry's position after the change (before it, for removals) and
+    ``previous_index`` is only set for moves.
+    """
+
+    kind: str
+    index: int
+    entry: HistoryEntry
+    previous_index: Optional[int] = None
+
+
+HistoryListener = Callable[[HistoryChange], None]
 
 
 class ClipboardHistory:
@@ -10,7 +50,9 @@ class ClipboardHistory:
 
     def __init__(self, limit: int = 10) -> None:
         self._limit = max(1, limit)
-        self._items: List[str] = []
+        self._entries: List[HistoryEntry] = []
+        self._by_text: Dict[str, HistoryEntry] = {}
+        self._listeners: List[HistoryListener] = []
 
     @property
     def limit(self) -> int:
@@ -20,27 +62,74 @@ class ClipboardHistory:
     def items(self) -> list[str]:
         """Return a copy of the current clipboard entries."""
 
-        return list(self._items)
+        return [entry.text for entry in self._entries]
+
+    @property
+    def entries(self) -> list[HistoryEntry]:
+        """Return a copy of the entry objects, newest first."""
+
+        return list(self._entries)
+
+    @property
+    def labels(self) -> list[str]:
+        """Return the cached display labels, newest first."""
+
+        return [entry.label for entry in self._entries]
+
+    def recent(self, count: int) -> list[HistoryEntry]:
+        """Return up to *count* newest entries without copying the whole list."""
+
+        return self._entries[: max(0, count)]
+
+    def add_listener(self, listener: HistoryListener) -> None:
+        """Call *listener* with a :class:`HistoryChange` after every mutation."""
+
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: HistoryListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def index_of(self, entry: HistoryEntry) -> int:
+        """Return the position of *entry*, or -1 once it has been evicted."""
+
+        for index, candidate in enumerate(self._entries):
+            if candidate is entry:
+                return index
+        return -1
 
     def update_limit(self, limit: int) -> None:
         """Change the history size while keeping the newest entries."""
 
         self._limit = max(1, limit)
-        if len(self._items) > self._limit:
-            del self._items[self._limit :]
-
-    def record(self, text: str | None) -> None:
-        """Store a clipboard entry if it is non-empty."""
+        self._evict()
 
-        if not text:
-            return
+    def record(self, text: str | None) -> bool:
+        """Store a clipboard entry if it is non-empty.
 
-        if text in self._items:
-            self._items.remove(text)
+        Returns True when the history changed.
+        """
 
-        self._items.insert(0, text)
-        if len(self._items) > self._limit:
-            del self._items[self._limit :]
+        if not text:
+            return False
+
+        entry = self._by_text.get(text)
+        if entry is not None:
+            previous_index = self.index_of(entry)
+            if previous_index == 0:
+                return False
+            del self._entries[previous_index]
+            self._entries.insert(0, entry)
+            self._notify(HistoryChange("move", 0, entry, previous_index))
+            return True
+
+        entry = HistoryEntry(text)
+        self._by_text[text] = entry
+        self._entries.insert(0, entry)
+        self._notify(HistoryChange("insert", 0, entry))
+        self._evict()
+        return True
 
     def extend(self, values: Iterable[str]) -> None:
         """Add multiple clipboard entries preserving their order."""
@@ -48,5 +137,15 @@ class ClipboardHistory:
         for value in values:
             self.record(value)
 
+    def _evict(self) -> None:
+        while len(self._entries) > self._limit:
+            evicted = self._entries.pop()
+            del self._by_text[evicted.text]
+            self._notify(HistoryChange("remove", len(self._entries), evicted))
+
+    def _notify(self, change: HistoryChange) -> None:
+        for listener in list(self._listeners):
+            listener(change)
+
 
-__all__ = ["ClipboardHistory"]
+__all__ = ["ClipboardHistory", "HistoryChange", "HistoryEntry", "HistoryListener"]
@@ -0,0 +1,114 @@
+"""RecycleView-backed clipboard history list."""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Optional
+
+from kivy.properties import BooleanProperty, ObjectProperty
+from kivy.uix.behaviors import ButtonBehavior
+from kivy.uix.label import Label
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+
+from .history import ClipboardHistory, HistoryChange, HistoryEntry
+
+CURRENT_SELECTION_LABEL = "Current selection"
+
+
+def _row(entry: Optional[HistoryEntry], selected: bool) -> dict:
+    label = CURRENT_SELECTION_LABEL if entry is None else entry.label
+    return {"text": label, "entry": entry, "selected": selected}
+
+
+class HistoryRow(RecycleDataViewBehavior, ButtonBehavior, Label):
+    """Single recycled row; only visible rows have a widget instance."""
+
+    entry = ObjectProperty(None, allownone=True)
+    selected = BooleanProperty(False)
+
+    def refresh_view_attrs(self, rv: "HistoryPanel", index: int, data: dict) -> None:
+        self._panel = rv
+        super().refresh_view_attrs(rv, index, data)
+
+    def on_release(self) -> None:
+        panel = getattr(self, "_panel", None)
+        if panel is not None:
+            panel.select(self.entry)
+
+
+class HistoryPanel(RecycleView):
+    """History list that mirrors :class:`ClipboardHistory` change events.
+
+    Rows are addressed by entry identity, so selection survives entries moving
+    to the front of the history. Index 0 is the "Current selection" pseudo row.
+    """
+
+    selected_entry = ObjectProperty(None, allownone=True)
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._history: Optional[ClipboardHistory] = None
+        self._on_select: Optional[Callable[[Optional[HistoryEntry]], None]] = None
+
+    def attach(
+        self,
+        history: ClipboardHistory,
+        on_select: Optional[Callable[[Optional[HistoryEntry]], None]] = None,
+    ) -> None:
+        """Populate the panel from *history* and follow its changes."""
+
+        if self._history is not None:
+            self._history.remove_listener(self._on_history_change)
+        self._history = history
+        self._on_select = on_select
+        self.selected_entry = None
+        self.data = [_row(None, True)] + [_row(entry, False) for entry in history.entries]
+        history.add_listener(self._on_history_change)
+
+    def detach(self) -> None:
+        if self._history is not None:
+            self._history.remove_listener(self._on_history_change)
+            self._history = None
+
+    def select(self, entry: Optional[HistoryEntry]) -> None:
+        """Highlight *entry* (``None`` for the live selection)."""
+
+        if entry is not self.selected_entry:
+            self._set_row_selected(self.selected_entry, False)
+            self._set_row_selected(entry, True)
+            self.selected_entry = entry
+        if self._on_select is not None:
+            self._on_select(entry)
+
+    def _row_index(self, entry: Optional[HistoryEntry]) -> int:
+        if entry is None:
+            return 0
+        if self._history is None:
+            return -1
+        index = self._history.index_of(entry)
+        return -1 if index < 0 else index + 1
+
+    def _set_row_selected(self, entry: Optional[HistoryEntry], selected: bool) -> None:
+        index = self._row_index(entry)
+        if index < 0 or index >= len(self.data):
+            return
+        if self.data[index]["selected"] != selected:
+            self.data[index] = _row(entry, selected)
+
+    def _on_history_change(self, change: HistoryChange) -> None:
+        selected = change.entry is self.selected_entry
+        if change.kind == "insert":
+            self.data.insert(change.index + 1, _row(change.entry, selected))
+        elif change.kind == "move":
+            row = self.data.pop(change.previous_index + 1)
+            self.data.insert(change.index + 1, row)
+        elif change.kind == "remove":
+            del self.data[change.index + 1]
+            if selected:
+                self.selected_entry = None
+                self.data[0] = _row(None, True)
+                if self._on_select is not None:
+                    self._on_select(None)
+
+
+__all__ = ["CURRENT_SELECTION_LABEL", "HistoryPanel", "HistoryRow"]
@@ -8,12 +8,29 @@ from typing import Iterable, List
 CLIPBOARD_POLL_SECONDS = 0.75
 DEFAULT_HISTORY_LIMIT = 10
 MAX_HISTORY_LABEL_LENGTH = 48
+# Characters inspected per label before widening the scan window. Labels only
+# show a short prefix, so most entries never need more than this.
+_LABEL_SCAN_WINDOW = MAX_HISTORY_LABEL_LENGTH * 4
 
 
-def format_history_label(text: str, *, max_length: int = MAX_HISTORY_LABEL_LENGTH) -> str:
-    """Return a human friendly label for the clipboard history dropdown."""
+def _collapse_lines(text: str) -> str:
+    return " ".join(line.strip() for line in text.splitlines()).strip()
+
 
-    collapsed = " ".join(line.strip() for line in text.splitlines()).strip()
+def format_history_label(text: str, *, max_length: int = MAX_HISTORY_LABEL_LENGTH) -> str:
+    """Return a human friendly label for the clipboard history dropdown.
+
+    Only a bounded prefix of *text* is collapsed. The window doubles while the
+    collapsed prefix is still too short to prove truncation, so whitespace-heavy
+    entries stay correct and ordinary multi-megabyte entries stay cheap.
+    """
+
+    window = max(_LABEL_SCAN_WINDOW, max_length * 2)
+    while True:
+        collapsed = _collapse_lines(text[:window])
+        if len(collapsed) > max_length or window >= len(text):
+            break
+        window *= 2
     if not collapsed:
         collapsed = "(whitespace)"
     if len(collapsed) > max_length:
@@ -21,7 +38,7 @@ def format_history_label(text: str, *, max_length: int = MAX_HISTORY_LABEL_LENGT
     return collapsed
 
 
-def ensure_history_limit(value: int, *, minimum: int = 1, maximum: int = 50) -> int:
+def ensure_history_limit(value: int, *, minimum: int = 1, maximum: int = 5000) -> int:
     """Clamp the history limit within a reasonable range."""
 
     return max(minimum, min(maximum, value))
@@ -0,0 +1,118 @@
+"""Background rendering of truncated conversion previews."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from main import convert_text, output_fingerprint
+
+# Only the head of an entry is rendered; the preview panel shows a few lines.
+PREVIEW_CHAR_LIMIT = 4096
+PREVIEW_CACHE_SIZE = 128
+PREVIEW_DEBOUNCE_SECONDS = 0.12
+
+PreviewCallback = Callable[[str], None]
+Dispatcher = Callable[[Callable[[], None]], None]
+
+
+def _run_inline(callback: Callable[[], None]) -> None:
+    callback()
+
+
+class PreviewRenderer:
+    """Render previews on a worker thread and memoise the results.
+
+    *dispatch* hands finished results back to the UI thread; the Kivy app
+    passes a ``Clock.schedule_once`` wrapper. Only the most recent request is
+    delivered, so stale renders never overwrite a newer preview.
+    """
+
+    def __init__(
+        self,
+        dispatch: Dispatcher = _run_inline,
+        *,
+        limit: int = PREVIEW_CHAR_LIMIT,
+        cache_size: int = PREVIEW_CACHE_SIZE,
+        protect: bool = True,
+    ) -> None:
+        self._dispatch = dispatch
+        self.protect = protect
+        self._limit = limit
+        self._cache_size = max(1, cache_size)
+        self._cache: "OrderedDict[Tuple[str, str, bool, str], str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._generation = 0
+
+    def cached(self, text: str, mode: str) -> Optional[str]:
+        """Return a memoised preview without scheduling any work."""
+
+        # An edited user dictionary or rule changes the output of the same text.
+        key = (mode, output_fingerprint(mode), self.protect, text[: self._limit])
+        with self._lock:
+            result = self._cache.get(key)
+            if result is not None:
+                self._cache.move_to_end(key)
+            return result
+
+    def request(self, text: str, mode: str, callback: PreviewCallback) -> None:
+        """Deliver the preview of *text* in *mode* to *callback*.
+
+        Cache hits are delivered synchronously; misses are rendered on the
+        worker thread and dispatched back unless a newer request superseded them.
+        """
+
+        self._generation += 1
+        cached = self.cached(text, mode)
+        if cached is not None:
+            callback(cached)
+            return
+
+        generation = self._generation
+        source = text[: self._limit]
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview")
+        self._executor.submit(self._render, source, mode, generation, callback)
+
+    def cancel(self) -> None:
+        """Drop any pending delivery."""
+
+        self._generation += 1
+
+    def shutdown(self) -> None:
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _render(self, source: str, mode: str, generation: int, callback: PreviewCallback) -> None:
+        if generation != self._generation:
+            return
+        fingerprint = output_fingerprint(mode)
+        protect = self.protect
+        try:
+            result = convert_text(source, mode, protect=protect)
+        except Exception as exc:  # pragma: no cover - surfaced in the panel
+            result = f"(preview unavailable: {exc})"
+        else:
+            with self._lock:
+                self._cache[(mode, fingerprint, protect, source)] = result
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        def deliver() -> None:
+            if generation == self._generation:
+                callback(result)
+
+        self._dispatch(deliver)
+
+
+__all__ = [
+    "PREVIEW_CACHE_SIZE",
+    "PREVIEW_CHAR_LIMIT",
+    "PREVIEW_DEBOUNCE_SECONDS",
+    "PreviewRenderer",
+]
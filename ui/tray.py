@@ -9,6 +9,7 @@ from kivy.clock import Clock
 
 from ui import actions
 from ui.assets import icon_path
+from ui.history import HistoryChange, HistoryEntry
 
 try:  # pragma: no cover - optional dependency guard
     import pystray
@@ -23,12 +24,10 @@ except Exception:  # pragma: no cover - pillow missing in runtime environment
     Image = None
 
 
-_ACTION_LABELS = (
-    ("Upper case", "upper"),
-    ("Lower case", "lower"),
-    ("Title case", "title"),
-    ("Sentence case", "sentence"),
-)
+# Number of history entries offered in the "Recent" submenu and the delay used
+# to coalesce bursts of history changes into a single native menu update.
+RECENT_MENU_SIZE = 10
+RECENT_REFRESH_SECONDS = 0.5
 
 
 class CaseMonsterTray:
@@ -40,6 +39,10 @@ class CaseMonsterTray:
         self._icon_ready = threading.Event()
         self._window_visible = bool(getattr(app, "window_visible", True))
         self._always_on_top = bool(getattr(app, "always_on_top", True))
+        self._history = getattr(app, "history", None)
+        self._recent_trigger = Clock.create_trigger(
+            lambda _dt: self._refresh_menu(), RECENT_REFRESH_SECONDS
+        )
 
     # ------------------------------------------------------------------
     # Public API
@@ -58,11 +61,16 @@ class CaseMonsterTray:
         icon = pystray.Icon("caseMonster", image, "caseMonster", menu)
         icon.run_detached(self._on_icon_ready)
         self._icon = icon
+        if self._history is not None:
+            self._history.add_listener(self._on_history_change)
         return True
 
     def stop(self) -> None:
         if self._icon is None:
             return
+        if self._history is not None:
+            self._history.remove_listener(self._on_history_change)
+        self._recent_trigger.cancel()
         try:
             self._icon.visible = False
         except Exception:  # pragma: no cover - backend specific attribute
@@ -112,17 +120,30 @@ class CaseMonsterTray:
             return None
 
     def _refresh_menu(self) -> None:
+        # Labels and check marks are callables evaluated by pystray, so the
+        # menu structure is built once and only the native menu is refreshed.
         if not self._icon_ready.is_set() or self._icon is None:
             return
-        self._icon.menu = self._build_menu()
         try:
             self._icon.update_menu()
         except Exception:  # pragma: no cover - optional in some backends
             pass
 
+    def _on_history_change(self, change: HistoryChange) -> None:
+        if change.kind == "remove" and change.index >= RECENT_MENU_SIZE:
+            return
+        if change.kind == "move" and change.previous_index == 0:
+            return
+        self._recent_trigger()
+
     def _build_menu(self) -> Menu:
         return Menu(
-            *(self._action_item(label, mode) for label, mode in _ACTION_LABELS),
+            *(self._action_item(label, mode) for label, mode in actions.action_labels()),
+            MenuItem(
+                "Recent",
+                Menu(self._recent_items),
+                visible=lambda _: bool(self._recent_entries()),
+            ),
             Menu.SEPARATOR,
             self._visibility_item(),
             MenuItem(
@@ -137,8 +158,30 @@ class CaseMonsterTray:
         return MenuItem(label, self._run_action(mode))
 
     def _visibility_item(self) -> MenuItem:
-        label = "Hide window" if self._window_visible else "Show window"
-        return MenuItem(label, self._toggle_window_visibility, default=True)
+        return MenuItem(
+            lambda _: "Hide window" if self._window_visible else "Show window",
+            self._toggle_window_visibility,
+            default=True,
+        )
+
+    def _recent_entries(self) -> list[HistoryEntry]:
+        if self._history is None:
+            return []
+        return self._history.recent(RECENT_MENU_SIZE)
+
+    def _recent_items(self):
+        # Evaluated by pystray whenever the submenu is (re)built; entry labels
+        # are memoised on the entries themselves.
+        for entry in self._recent_entries():
+            yield MenuItem(
+                lambda _, entry=entry: entry.label,
+                Menu(
+                    *(
+                        MenuItem(label, self._run_entry_action(mode, entry))
+                        for label, mode in actions.action_labels()
+                    )
+                ),
+            )
 
     def _run_action(self, mode: str) -> Callable[[Optional[pystray.Icon], Optional[pystray.MenuItem]], None]:
         def callback(_icon, _item):
@@ -146,6 +189,14 @@ class CaseMonsterTray:
 
         return callback
 
+    def _run_entry_action(
+        self, mode: str, entry: HistoryEntry
+    ) -> Callable[[Optional[pystray.Icon], Optional[pystray.MenuItem]], None]:
+        def callback(_icon, _item):
+            Clock.schedule_once(lambda _dt: self._app.run_history_action(mode, entry), 0)
+
+        return callback
+
     def _toggle_window_visibility(self, _icon, _item) -> None:
         def toggle(_dt):
             if getattr(self._app, "window_visible", False):
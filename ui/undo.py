@@ -0,0 +1,206 @@
+"""Compact undo/redo bookkeeping for applied case conversions.
+
+Every state in a conversion chain is stored relative to the chain's original
+text. Case-only conversions, which are the common case, are kept as a packed
+bitmask with one bit per character marking the positions whose case flips.
+Anything else falls back to a single replaced span.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import List, Optional, Union
+
+from conversion.affixes import common_prefix_length, common_suffix_length
+
+_ASCII_TO_BITS = bytes.maketrans(b"\x00\x20", b"01")
+_BITS_TO_ASCII = bytes.maketrans(b"01", b"\x00\x20")
+_TOGGLED_RUN = re.compile("1+")
+
+
+class CaseMask:
+    """Per-character case toggles packed into a single integer."""
+
+    __slots__ = ("length", "bits")
+
+    def __init__(self, length: int, bits: int = 0) -> None:
+        self.length = length
+        self.bits = bits
+
+    @classmethod
+    def between(cls, base: str, target: str) -> Optional["CaseMask"]:
+        """Return the mask turning *base* into *target*, or None if not case-only."""
+
+        length = len(base)
+        if length != len(target):
+            return None
+        if base == target:
+            return cls(length)
+        if base.isascii() and target.isascii():
+            return cls._between_ascii(base, target)
+
+        flags = bytearray(b"0" * length)
+        for index, (before, after) in enumerate(zip(base, target)):
+            if before != after:
+                if before.swapcase() != after:
+                    return None
+                flags[index] = 0x31
+        return cls(length, int(flags, 2))
+
+    @classmethod
+    def _between_ascii(cls, base: str, target: str) -> Optional["CaseMask"]:
+        length = len(base)
+        diff = (
+            int.from_bytes(base.encode("ascii"), "big")
+            ^ int.from_bytes(target.encode("ascii"), "big")
+        ).to_bytes(length, "big")
+        # Every differing byte must be a 0x20 flip on a letter; the lower() check
+        # rejects flips such as "@" <-> "`" that are not case changes.
+        if diff.translate(None, b"\x00\x20") or base.lower() != target.lower():
+            return None
+        return cls(length, int(diff.translate(_ASCII_TO_BITS), 2))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size of the packed mask."""
+
+        return (self.bits.bit_length() + 7) // 8
+
+    def apply(self, base: str) -> str:
+        if not self.bits:
+            return base
+        flags = format(self.bits, f"0{self.length}b")
+        if base.isascii():
+            toggles = flags.encode("ascii").translate(_BITS_TO_ASCII)
+            merged = int.from_bytes(base.encode("ascii"), "big") ^ int.from_bytes(toggles, "big")
+            return merged.to_bytes(self.length, "big").decode("ascii")
+
+        pieces: List[str] = []
+        last = 0
+        for run in _TOGGLED_RUN.finditer(flags):
+            start, end = run.span()
+            pieces.append(base[last:start])
+            # Toggle per character: swapcase() on a run would apply
+            # context-sensitive rules (final sigma) that the mask never saw.
+            pieces.append("".join(char.swapcase() for char in base[start:end]))
+            last = end
+        pieces.append(base[last:])
+        return "".join(pieces)
+
+
+class TextDiff:
+    """Single replaced span used when a conversion changed more than case."""
+
+    __slots__ = ("start", "end", "replacement")
+
+    def __init__(self, start: int, end: int, replacement: str) -> None:
+        self.start = start
+        self.end = end
+        self.replacement = replacement
+
+    @classmethod
+    def between(cls, base: str, target: str) -> "TextDiff":
+        prefix = common_prefix_length(base, target)
+        limit = min(len(base), len(target)) - prefix
+        suffix = common_suffix_length(base, target, limit)
+        return cls(prefix, len(base) - suffix, target[prefix : len(target) - suffix])
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.replacement.encode("utf-8"))
+
+    def apply(self, base: str) -> str:
+        return base[: self.start] + self.replacement + base[self.end :]
+
+
+Step = Union[CaseMask, TextDiff]
+
+
+def encode_step(base: str, target: str) -> Step:
+    """Return the most compact representation of *target* relative to *base*."""
+
+    mask = CaseMask.between(base, target)
+    return mask if mask is not None else TextDiff.between(base, target)
+
+
+class ConversionUndoStack:
+    """Undo/redo history for a chain of conversions applied to one text.
+
+    The chain's original text is stored once. Recording a conversion whose
+    source is not the current state starts a new chain.
+    """
+
+    def __init__(self, limit: int = 100) -> None:
+        self._limit = max(1, limit)
+        self._base: Optional[str] = None
+        self._steps: List[Step] = []
+        self._cursor = -1
+        self._current: Optional[str] = None
+
+    @property
+    def can_undo(self) -> bool:
+        return self._cursor > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return 0 <= self._cursor < len(self._steps) - 1
+
+    @property
+    def current(self) -> Optional[str]:
+        return self._current
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def clear(self) -> None:
+        self._base = None
+        self._steps = []
+        self._cursor = -1
+        self._current = None
+
+    def record(self, original: str, transformed: str) -> None:
+        """Append the conversion of *original* into *transformed*."""
+
+        if self._current is None or original != self._current:
+            self._base = original
+            self._steps = [CaseMask(len(original))]
+            self._cursor = 0
+        else:
+            del self._steps[self._cursor + 1 :]
+
+        assert self._base is not None
+        self._steps.append(encode_step(self._base, transformed))
+        if len(self._steps) > self._limit + 1:
+            # Step 0 is the original text; drop the oldest conversion after it.
+            del self._steps[1]
+        self._cursor = len(self._steps) - 1
+        self._current = transformed
+
+    def undo(self) -> Optional[str]:
+        """Move one state back and return its text, if possible."""
+
+        if not self.can_undo:
+            return None
+        return self._move_to(self._cursor - 1)
+
+    def redo(self) -> Optional[str]:
+        """Move one state forward and return its text, if possible."""
+
+        if not self.can_redo:
+            return None
+        return self._move_to(self._cursor + 1)
+
+    def state(self, index: int) -> str:
+        """Reconstruct the text of state *index* without moving the cursor."""
+
+        if self._base is None:
+            raise IndexError("undo stack is empty")
+        return self._steps[index].apply(self._base)
+
+    def _move_to(self, index: int) -> str:
+        self._cursor = index
+        self._current = self.state(index)
+        return self._current
+
+
+__all__ = ["CaseMask", "ConversionUndoStack", "TextDiff", "encode_step"]
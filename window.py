@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
 from typing import Optional
 
 from clipboard import ClipboardUnavailable, paste as clipboard_paste
+from main import TRANSFORMS, prewarm_backends, rule_modes, use_dictionary, use_rules
 from kivy.app import App
 from kivy.clock import Clock
 from kivy.clock import ClockEvent
@@ -13,34 +15,41 @@ from kivy.core.window import Window
 from kivy.lang import Builder
 from kivy.logger import Logger
 from kivy.metrics import dp
-from kivy.properties import (
-    BooleanProperty,
-    ListProperty,
-    NumericProperty,
-    StringProperty,
-)
+from kivy.properties import BooleanProperty, NumericProperty, StringProperty
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.uix.popup import Popup
 
+from conversion.dictionary import DICTIONARY_NAME
 from ui import actions
 from ui.assets import icon_path
 from ui.dialogs import InfoPopup, SettingsPopup, open_help_guide
-from ui.history import ClipboardHistory
+from ui.history import ClipboardHistory, HistoryEntry
 from ui.main_frame import (
     CLIPBOARD_POLL_SECONDS,
     DEFAULT_HISTORY_LIMIT,
-    describe_history,
     ensure_history_limit,
 )
-from ui.styles import BACKGROUND_COLOUR, FOREGROUND_COLOUR
+from ui.styles import (
+    ACCENT_NEUTRAL,
+    ACCENT_PRIMARY,
+    ACCENT_SECONDARY,
+    ACCENT_TERTIARY,
+    BACKGROUND_COLOUR,
+    FOREGROUND_COLOUR,
+)
+from ui.preview import PREVIEW_CHAR_LIMIT, PREVIEW_DEBOUNCE_SECONDS, PreviewRenderer
 from ui.tray import CaseMonsterTray
+from ui.undo import ConversionUndoStack
 
 # Import styled widgets so that the KV language recognises them
 from ui.components import AccentButton, RoundedPanel  # noqa: F401  # pylint: disable=unused-import
+from ui.history_panel import HistoryPanel, HistoryRow  # noqa: F401  # pylint: disable=unused-import
 
 
 _KV_PATH = Path(__file__).resolve().parent / "ui" / "casemonster.kv"
+_BUTTON_COLOURS = (ACCENT_PRIMARY, ACCENT_SECONDARY, ACCENT_NEUTRAL, ACCENT_TERTIARY)
+_BUTTONS_PER_ROW = 5
 
 
 class CaseMonsterRoot(BoxLayout):
@@ -52,14 +61,24 @@ class CaseMonsterApp(App):
 
     always_on_top = BooleanProperty(True)
     history_limit = NumericProperty(DEFAULT_HISTORY_LIMIT)
-    history_labels = ListProperty(["Current selection"])
-    current_history_label = StringProperty("Current selection")
-    history_selection = NumericProperty(0)
+    can_undo = BooleanProperty(False)
+    can_redo = BooleanProperty(False)
+    preview_caption = StringProperty("Preview")
+    preview_text = StringProperty("")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.history = ClipboardHistory(DEFAULT_HISTORY_LIMIT)
-        self._history_entries: list[str] = []
+        self._selected_entry: Optional[HistoryEntry] = None
+        self.undo_stack = ConversionUndoStack()
+        self._preview = PreviewRenderer(
+            lambda deliver: Clock.schedule_once(lambda _dt: deliver(), 0)
+        )
+        self._preview_trigger = Clock.create_trigger(
+            self._update_preview, PREVIEW_DEBOUNCE_SECONDS
+        )
+        self._preview_mode = "sentence"
+        self._hover_mode: Optional[str] = None
         self._clipboard_event: Optional[ClockEvent] = None
         self.use_kivy_settings = False
         self._tray: Optional[CaseMonsterTray] = None
@@ -71,6 +90,8 @@ class CaseMonsterApp(App):
             {
                 "always_on_top": "1",
                 "history_limit": str(DEFAULT_HISTORY_LIMIT),
+                "cycle_rotation": ",".join(actions.DEFAULT_CYCLE_ROTATION),
+                "protect_spans": "1",
             },
         )
 
@@ -91,7 +112,7 @@ class CaseMonsterApp(App):
             Logger.warning("CaseMonster: no icon asset could be located")
 
         Window.clearcolor = BACKGROUND_COLOUR
-        min_width, min_height = 620, 180
+        min_width, min_height = 620, 360
         Window.minimum_width = min_width
         Window.minimum_height = min_height
         # Ensure the initial window footprint matches the compact defaults instead
@@ -104,11 +125,15 @@ class CaseMonsterApp(App):
         )
 
         self._load_preferences()
-        self._refresh_history()
+        self._load_dictionary()
+        self._load_rules()
         self._apply_always_on_top()
         self._bind_window_events()
 
         root = CaseMonsterRoot()
+        root.ids.history_panel.attach(self.history, self.select_history)
+        self._add_mode_buttons(root.ids.mode_rows)
+        self._update_preview()
         Logger.info("CaseMonster: starting clipboard poll every %.2fs", CLIPBOARD_POLL_SECONDS)
         self._clipboard_event = Clock.schedule_interval(
             self._poll_clipboard, CLIPBOARD_POLL_SECONDS
@@ -117,6 +142,11 @@ class CaseMonsterApp(App):
 
     def on_start(self):
         Logger.info("CaseMonster: on_start() invoked")
+        # Import pyautogui and pyperclip off the UI thread so the first click
+        # does not pay for them.
+        threading.Thread(
+            target=prewarm_backends, name="caseMonster-prewarm", daemon=True
+        ).start()
         if self._tray is None:
             tray = CaseMonsterTray(self)
             Logger.info(
@@ -136,6 +166,10 @@ class CaseMonsterApp(App):
         if self._clipboard_event is not None:
             self._clipboard_event.cancel()
             self._clipboard_event = None
+        if self.root:
+            self.root.ids.history_panel.detach()
+        self._preview_trigger.cancel()
+        self._preview.shutdown()
         self._write_preferences()
         if self._tray is not None:
             self._tray.stop()
@@ -181,6 +215,64 @@ class CaseMonsterApp(App):
                 "CaseMonster: history limit defaulted to %s",
                 DEFAULT_HISTORY_LIMIT,
             )
+        if config.has_option(section, "cycle_rotation"):
+            modes = config.get(section, "cycle_rotation").replace(" ", "").split(",")
+            try:
+                rotation = actions.set_cycle_rotation(filter(None, modes))
+            except ValueError as exc:
+                Logger.warning("CaseMonster: invalid cycle rotation in config (%s); using default", exc)
+                actions.set_cycle_rotation(actions.DEFAULT_CYCLE_ROTATION)
+            else:
+                Logger.info("CaseMonster: cycle rotation set to %s (config)", ", ".join(rotation))
+        protect = config.getboolean(section, "protect_spans", fallback=True)
+        self._preview.protect = actions.set_protection(protect)
+        Logger.info("CaseMonster: protected spans %s", "on" if protect else "off")
+
+    def _load_dictionary(self) -> None:
+        # Kept beside the config file; re-read by every conversion once edited.
+        path = Path(self.get_application_config()).with_name(DICTIONARY_NAME)
+        dictionary = use_dictionary(path)
+        dictionary.current()
+        if dictionary.error is not None:
+            Logger.warning("CaseMonster: ignoring dictionary %s: %s", path, dictionary.error)
+        else:
+            Logger.info("CaseMonster: casing dictionary at %s", path)
+
+    def _load_rules(self) -> None:
+        # [rule:NAME] sections of the config; pattern edits apply without a restart.
+        path = Path(self.get_application_config())
+        rules = use_rules(path)
+        if rules.error is not None:
+            Logger.warning("CaseMonster: ignoring rules in %s: %s", path, rules.error)
+        elif rule_modes():
+            Logger.info("CaseMonster: rule modes %s", ", ".join(rule_modes()))
+
+    def _add_mode_buttons(self, container: BoxLayout) -> None:
+        # A row per registry category (case, identifier, plugin, rule); the
+        # case row is full size and ends with the cycle action.
+        for category, specs in TRANSFORMS.categories():
+            buttons = [(spec.label, spec.name) for spec in specs]
+            if category == "case":
+                buttons.append(("Cycle", "cycle"))
+            for start in range(0, len(buttons), _BUTTONS_PER_ROW):
+                row = BoxLayout(
+                    spacing=dp(8),
+                    size_hint_y=None,
+                    height=dp(56) if category == "case" else dp(44),
+                )
+                for index, (label, mode) in enumerate(buttons[start:start + _BUTTONS_PER_ROW]):
+                    row.add_widget(self._mode_button(label, mode, category, index))
+                container.add_widget(row)
+
+    def _mode_button(self, label: str, mode: str, category: str, index: int) -> AccentButton:
+        button = AccentButton(text=label, button_color=_BUTTON_COLOURS[index % len(_BUTTON_COLOURS)])
+        if category != "case":
+            button.size_hint = (1, 1)
+            button.font_size = "12sp"  # the constructor sets its own size
+        button.bind(on_release=lambda _button: self.run_action(mode))
+        if mode in TRANSFORMS:  # "cycle" picks its mode from the text
+            button.bind(hovered=lambda _button, hovered: self.hover_mode(mode, hovered))
+        return button
 
     def _write_preferences(self) -> None:
         section = "preferences"
@@ -238,10 +330,7 @@ class CaseMonsterApp(App):
         text = self._read_clipboard()
         if text is None:
             return
-        previous = list(self._history_entries)
         self.history.record(text)
-        if self.history.items != previous:
-            self._refresh_history()
 
     def _read_clipboard(self) -> Optional[str]:
         try:
@@ -258,24 +347,47 @@ class CaseMonsterApp(App):
         Logger.debug("CaseMonster: clipboard text read (%d chars)", len(value or ""))
         return value or None
 
-    def _refresh_history(self, *, selected_text: Optional[str] = None) -> None:
-        self._history_entries = self.history.items
-        labels = describe_history(self._history_entries)
-        if selected_text and selected_text in self._history_entries:
-            selection_index = self._history_entries.index(selected_text) + 1
-        else:
-            selection_index = self.history_selection if self.history_selection < len(labels) else 0
-
-        self.history_labels = labels
-        if labels:
-            self.history_selection = selection_index
-            self.current_history_label = labels[selection_index]
-
-    def select_history(self, label: str) -> None:
-        if label not in self.history_labels:
+    def select_history(self, entry: Optional[HistoryEntry]) -> None:
+        self._selected_entry = entry
+        self._request_preview()
+
+    def hover_mode(self, mode: str, hovered: bool) -> None:
+        if hovered:
+            self._hover_mode = mode
+        elif self._hover_mode == mode:
+            self._hover_mode = None
+        self._request_preview()
+
+    def _request_preview(self) -> None:
+        # Cached previews are shown straight away; anything else waits for the
+        # selection to settle before the worker thread is asked to render it.
+        entry = self._selected_entry
+        if entry is not None:
+            cached = self._preview.cached(entry.text, self._active_preview_mode())
+            if cached is not None:
+                self._preview_trigger.cancel()
+                self._update_preview()
+                return
+        self._preview_trigger()
+
+    def _active_preview_mode(self) -> str:
+        return self._hover_mode or self._preview_mode
+
+    def _update_preview(self, *_args) -> None:
+        entry = self._selected_entry
+        if entry is None:
+            self._preview.cancel()
+            self.preview_caption = "Preview (select a history entry)"
+            self.preview_text = ""
             return
-        self.history_selection = self.history_labels.index(label)
-        self.current_history_label = label
+        mode = self._active_preview_mode()
+        self.preview_caption = f"Preview: {mode}"
+        truncated = len(entry.text) > PREVIEW_CHAR_LIMIT
+        self._preview.request(
+            entry.text,
+            mode,
+            lambda text: setattr(self, "preview_text", text + ("…" if truncated else "")),
+        )
 
     def set_always_on_top(self, enabled: bool) -> None:
         enabled = bool(enabled)
@@ -301,17 +413,18 @@ class CaseMonsterApp(App):
         if value != self.history_limit:
             self.history_limit = value
             self.history.update_limit(value)
-            self._refresh_history()
         self._write_preferences()
         if self.root:
             self.root.ids.history_limit_input.text = str(int(self.history_limit))
 
     def run_action(self, mode: str) -> None:
+        self.run_history_action(mode, self._selected_entry)
+
+    def run_history_action(self, mode: str, entry: Optional[HistoryEntry]) -> None:
         Logger.info("CaseMonster: running action '%s'", mode)
-        selection = self.history_selection
-        source_text = None
-        if 0 < selection <= len(self._history_entries):
-            source_text = self._history_entries[selection - 1]
+        if mode in TRANSFORMS:  # "cycle" picks its mode from the text
+            self._preview_mode = mode
+        source_text = entry.text if entry is not None else None
         try:
             result = actions.run(mode, source_text=source_text)
         except ClipboardUnavailable as exc:
@@ -348,7 +461,33 @@ class CaseMonsterApp(App):
         original, transformed = result
         self.history.record(original)
         self.history.record(transformed)
-        self._refresh_history(selected_text=source_text)
+        self.undo_stack.record(original, transformed)
+        self._sync_undo_state()
+
+    def undo_action(self) -> None:
+        Logger.info("CaseMonster: undoing last conversion")
+        self._paste_state(self.undo_stack.undo())
+
+    def redo_action(self) -> None:
+        Logger.info("CaseMonster: redoing conversion")
+        self._paste_state(self.undo_stack.redo())
+
+    def _paste_state(self, text: Optional[str]) -> None:
+        self._sync_undo_state()
+        if text is None:
+            return
+        try:
+            actions.paste_text(text)
+        except ClipboardUnavailable as exc:
+            Logger.warning("CaseMonster: automation unavailable: %s", exc)
+            self._show_info(
+                title="Clipboard automation unavailable",
+                message=f"The previous text could not be pasted back.\n\nDetails: {exc}",
+            )
+
+    def _sync_undo_state(self) -> None:
+        self.can_undo = self.undo_stack.can_undo
+        self.can_redo = self.undo_stack.can_redo
 
     def _show_info(self, *, title: str, message: str) -> None:
         popup = InfoPopup(title=title, message=message)